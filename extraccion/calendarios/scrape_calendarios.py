@@ -5,25 +5,30 @@ import asyncio
 import time
 import sys
 
-from typing import List
+from typing import Callable, List
 from pathlib import Path
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from calendarios.utiles_calendarios import *
+from utiles.utiles_argumentos import argumentos
+from utiles.utiles_checkpoint import DiarioProgreso
 from utiles.utiles_modelos import PartidoCalendario, TargetURL
+from utiles.utiles_parser import crear_soup
+from utiles.utiles_codec import decodificar
+from utiles.utiles_ndjson import EscritorNDJSON
+from utiles.utiles_parseo import parsear_en_pool
 from utiles.utiles_salida import print_cabecera
 from utiles.utiles_scraping import (
-    CHUNK_SIZE,
     ScrapedURL,
-    chunked_iterable,
-    guardar_datos_json,
-    scrape_urls,
+    scrape_urls_stream,
     URLFailReason,
     URLFail,
     MAX_REINTENTOS,
+    reintentables,
     SEMAPHORE_VALUE,
+    NUM_WORKERS,
+    finalizar_scraping,
 )
 from utiles.utiles_links import *
 
@@ -37,6 +42,8 @@ logging.basicConfig(
     filename=f"{ruta_archivo}.log", level=logging.INFO, format="%(message)s"
 )
 
+diario = DiarioProgreso("calendarios")
+
 
 async def scrapear_links_calendarios(
     ligas_a_scrapear: List[str] = None, intentos=1
@@ -45,12 +52,6 @@ async def scrapear_links_calendarios(
         ligas_a_scrapear = list(LinksLigas.values())
 
     global paginas_fallidas, paginas_scrapeadas
-    if intentos > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para la liga."
-        )
-        logging.info(f"Ligas fallidas: {[liga for liga in ligas_a_scrapear]}")
-        return []
     TargetURLs: List[TargetURL] = []
     links_calendarios: List[str] = []
     calendarios_a_reintentar: List[str] = []
@@ -62,71 +63,52 @@ async def scrapear_links_calendarios(
     )
 
     for liga_url in ligas_a_scrapear:
-        TargetURLs.append(TargetURL(url=liga_url))
-
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(TargetURLs, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scrapedURLs: List[ScrapedURL] = await scrape_urls(target_url_batch)
-        if not scrapedURLs:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        TargetURLs.append(TargetURL(url=liga_url, selector="td.hauptlink"))
+
+    async for scrapedURL in scrape_urls_stream(TargetURLs):
+        url = scrapedURL.url
+        html = scrapedURL.content
+        paginas_fallidas.extend(scrapedURL.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            calendarios_a_reintentar.extend(
-                ligas_a_scrapear[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
+            calendarios_a_reintentar.append(url)
+            logging.info(f"Fallida {url}. A reintentar...")
             continue
-        for index_scraped, scrapedURL in enumerate(scrapedURLs):
-            url = scrapedURL.url
-            html = scrapedURL.content
-            paginas_fallidas.extend(scrapedURL.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                calendarios_a_reintentar.append(url)
-                logging.info(f"Fallida {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            enlace_calendario = soup.find("a", string="Calendario")
-            if not enlace_calendario:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el enlace al calendario.",
-                    )
-                )
-                calendarios_a_reintentar.append(url)
-                logging.info(f"Fallida {url}. A reintentar...")
-                continue
-
-            href = enlace_calendario["href"]
-            if "/gesamtspielplan/" in href:
-                links_calendarios.append(
-                    "https://www.transfermarkt.es" + href.rsplit("/", 2)[0]
+
+        soup = crear_soup(html, "enlace_calendario")
+        enlace_calendario = soup.find("a", string="Calendario")
+        if not enlace_calendario:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el enlace al calendario.",
                 )
-            logging.info(
-                f"Scrapeado enlace de calendario de la liga {next((liga for liga,url in LinksLigas.items() if url==scrapedURL.url),scrapedURL.url)}."
             )
-            num_ligas += 1
-            paginas_scrapeadas.add(url)
-    if len(calendarios_a_reintentar) > 0 and intentos < MAX_REINTENTOS:
+            calendarios_a_reintentar.append(url)
+            logging.info(f"Fallida {url}. A reintentar...")
+            continue
+
+        href = enlace_calendario["href"]
+        if "/gesamtspielplan/" in href:
+            links_calendarios.append(
+                "https://www.transfermarkt.es" + href.rsplit("/", 2)[0]
+            )
+        logging.info(
+            f"Scrapeado enlace de calendario de la liga {next((liga for liga,url in LinksLigas.items() if url==scrapedURL.url),scrapedURL.url)}."
+        )
+        num_ligas += 1
+        paginas_scrapeadas.add(url)
+    calendarios_a_reintentar = reintentables(calendarios_a_reintentar)
+    if len(calendarios_a_reintentar) > 0:
         links_calendarios_reintentados, num_ligas_reintentadas = (
             await scrapear_links_calendarios(calendarios_a_reintentar, intentos + 1)
         )
@@ -142,12 +124,6 @@ async def scrapear_links_partidos(
 ) -> tuple[List[str], int, int]:
 
     global paginas_fallidas, paginas_scrapeadas
-    if intentos > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los partidos."
-        )
-        logging.info(f"Partidos fallidos: {[link for link in links_calendarios]}")
-        return []
     target_urls: List[TargetURL] = []
     paginas_a_reintentar: list[str] = {}
     links_partidos: List[str] = []
@@ -163,80 +139,59 @@ async def scrapear_links_partidos(
     for link in links_calendarios:
         target_urls.append(TargetURL(url=link))
 
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            paginas_a_reintentar.extend(
-                links_calendarios[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            paginas_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                paginas_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-
-            partidos = get_enlaces_partidos(soup)
-            if num_calendarios == 0 and intentos == 1:
-                temporada = soup.find("a", class_="chzn-single").get_text(strip=True)
-                temporada = (
-                    f"20{temporada.split('/')[0]}/20{temporada.split('/')[1]}"
-                    if temporada
-                    else None
-                )
-            if not partidos:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        soup = crear_soup(html, "calendario")
+
+        partidos = get_enlaces_partidos(soup)
+        if num_calendarios == 0 and intentos == 1:
+            temporada = soup.find("a", class_="chzn-single").get_text(strip=True)
+            temporada = (
+                f"20{temporada.split('/')[0]}/20{temporada.split('/')[1]}"
+                if temporada
+                else None
+            )
+        if not partidos:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el HTML.",
                 )
-                paginas_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
+            )
+            paginas_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
 
-            for partido in partidos:
-                if "/spielbericht/" in partido:
-                    links_partidos.append("https://www.transfermarkt.es" + partido)
+        for partido in partidos:
+            if "/spielbericht/" in partido:
+                links_partidos.append("https://www.transfermarkt.es" + partido)
 
-            logging.info(
-                f"Scrapeados {len(links_partidos)-num_partidos} enlaces de partidos del calendario {scraped_url.url}."
-            )
-            num_partidos = len(links_partidos)
-            num_calendarios += 1
-            paginas_scrapeadas.add(url)
-    if len(paginas_a_reintentar) > 0 and intentos < MAX_REINTENTOS:
+        logging.info(
+            f"Scrapeados {len(links_partidos)-num_partidos} enlaces de partidos del calendario {scraped_url.url}."
+        )
+        num_partidos = len(links_partidos)
+        num_calendarios += 1
+        paginas_scrapeadas.add(url)
+    paginas_a_reintentar = reintentables(paginas_a_reintentar)
+    if len(paginas_a_reintentar) > 0:
         (
             links_partidos_reintentados,
             num_partidos_reintentados,
@@ -252,109 +207,87 @@ async def scrapear_links_partidos(
 
 
 async def scrapear_partidos(
-    links_partidos: List[str], temporada, intento=1
-) -> tuple[List[PartidoCalendario], int]:
+    links_partidos: List[str],
+    temporada,
+    emitir: Callable[[PartidoCalendario], None],
+    intento=1,
+) -> int:
     global paginas_fallidas, paginas_scrapeadas
     target_urls: List[TargetURL] = []
     partidos_a_reintentar: List[str] = []
-    datos_partidos: List[PartidoCalendario] = []
     partidos = 0
-    if intento > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los partidos del calendario."
-        )
-        logging.info(f"Partidos fallidos: {[link for link in links_partidos]}")
-        return []
     logging.info(
         print_cabecera(
             f"Calendarios intento {intento}. Partidos restantes: {len(links_partidos)}"
         )
     )
 
+    reanudados = diario.completados("partidos", links_partidos)
+    for url, registro in reanudados.items():
+        emitir(decodificar(PartidoCalendario, registro))
+        paginas_scrapeadas.add(url)
+        partidos += 1
+    if reanudados:
+        logging.info(f"Reanudados {len(reanudados)} partidos del diario de progreso.")
     for link in links_partidos:
-        target_urls.append(TargetURL(url=link))
-
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
+        if link not in reanudados:
+            target_urls.append(TargetURL(url=link, selector="div.sb-team"))
+
+    async for scraped_url, partido in parsear_en_pool(
+        scrape_urls_stream(target_urls),
+        lambda scraped_url: (
+            parsear_partido_calendario,
+            scraped_url.url,
+            scraped_url.content,
+            temporada,
+        ),
     ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            partidos_a_reintentar.extend(
-                links_partidos[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            partidos_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                partidos_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            partido = PartidoCalendario(
-                cod_local=get_cod_local(soup),
-                cod_visitante=get_cod_visitante(soup),
-                campo=get_cod_estadio_club(soup),
-                jornada=get_jornada(soup),
-                enlace=scraped_url.url,
-                liga=get_nombre_liga(soup),
-                cod_partido=url.rsplit("/", 1)[-1],
-                temporada=temporada,
-            )
-
-            if (
-                not partido.cod_partido
-                or not partido.cod_local
-                or not partido.cod_visitante
-            ):
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el partido.",
-                    )
+        if (
+            partido is None
+            or not partido.cod_partido
+            or not partido.cod_local
+            or not partido.cod_visitante
+        ):
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el partido.",
                 )
-                partidos_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-            paginas_scrapeadas.add(url)
-            logging.info(
-                f"Scrapeado partido del calendario: {partido.cod_partido}, {partido.liga} jornada {partido.jornada}"
             )
-            datos_partidos.append(partido)
-            partidos += 1
-    if len(partidos_a_reintentar) > 0 and intento < MAX_REINTENTOS:
-        datos_partidos_reintentados, num_partidos_reintentados = (
-            await scrapear_partidos(partidos_a_reintentar, temporada, intento + 1)
+            partidos_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
+        diario.registrar("partidos", url, partido)
+        paginas_scrapeadas.add(url)
+        logging.info(
+            f"Scrapeado partido del calendario: {partido.cod_partido}, {partido.liga} jornada {partido.jornada}"
         )
-        datos_partidos.extend(datos_partidos_reintentados)
-        partidos += num_partidos_reintentados
-    return datos_partidos, partidos
+        emitir(partido)
+        partidos += 1
+    partidos_a_reintentar = reintentables(partidos_a_reintentar)
+    if len(partidos_a_reintentar) > 0:
+        partidos += await scrapear_partidos(
+            partidos_a_reintentar, temporada, emitir, intento + 1
+        )
+    return partidos
 
 
 async def procesar_calendarios():
@@ -382,8 +315,14 @@ async def procesar_calendarios():
         )
     )
     logging.info(print_cabecera("Scraping de partidos"))
-    datos_partidos, partidos = await scrapear_partidos(links_partidos, temporada)
-    if not datos_partidos:
+    salida = EscritorNDJSON(
+        f"{ruta_archivo_datos}datos_partidos_calendario",
+        f"{ruta_archivo}datos_partidos_calendario",
+        instantanea=True,
+    )
+    partidos = await scrapear_partidos(links_partidos, temporada, salida.escribir)
+    if not partidos:
+        salida.abandonar()
         logging.error("No se han podido obtener los datos de los partidos.")
         return
     logging.info(
@@ -391,16 +330,19 @@ async def procesar_calendarios():
     )
     logging.info(print_cabecera("Estadísticas de scraping"))
     logging.info(f"\nPáginas únicas scrapeadas: {len(paginas_scrapeadas)}")
-    logging.info(f"\nAsyncio semaphore: {SEMAPHORE_VALUE}")
-    logging.info(f"\nTamaño del chunk: {CHUNK_SIZE}")
+    logging.info(f"\nConcurrencia inicial: {SEMAPHORE_VALUE}")
+    logging.info(f"\nWorkers de descarga: {NUM_WORKERS}")
     logging.info(f"\nPáginas fallidas: {len(paginas_fallidas)}")
+    for linea in diario.estadisticas():
+        logging.info(linea)
     for i in range(1, MAX_REINTENTOS + 1):
         logging.info(print_cabecera(f"Reintento {i}"))
         for pagina in paginas_fallidas:
             if pagina.attempt == i:
                 logging.info(f"· {pagina.reason} | {pagina.url} | {pagina.message}")
-    guardar_datos_json(datos_partidos, f"{ruta_archivo_datos}datos_partidos_calendario")
-    guardar_datos_json(datos_partidos, f"{ruta_archivo}datos_partidos_calendario")
+    logging.info(print_cabecera("Fichero NDJSON"))
+    salida.cerrar()
+    diario.finalizar()
 
 
 async def main():
@@ -408,10 +350,12 @@ async def main():
     start_time = time.time()
 
     try:
+        diario.iniciar(argumentos.reanudar)
         await procesar_calendarios()
     except Exception as e:
         logging.error(f"Error en la ejecución: {e}")
     finally:
+        await finalizar_scraping()
         end_time = time.time()
         minutes, seconds = divmod(end_time - start_time, 60)
         logging.info(
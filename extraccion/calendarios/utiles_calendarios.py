@@ -1,3 +1,7 @@
+from utiles.utiles_modelos import PartidoCalendario
+from utiles.utiles_parser import crear_soup
+
+
 def get_cod_local(soup):
     try:
         div_heim = soup.find("div", class_="sb-team sb-heim")
@@ -90,3 +94,19 @@ def get_enlaces_partidos(soup):
         return enlaces
     except:
         return enlaces
+
+
+def parsear_partido_calendario(
+    url: str, html: str, temporada: str = None
+) -> PartidoCalendario:
+    soup = crear_soup(html, "partido_calendario")
+    return PartidoCalendario(
+        cod_local=get_cod_local(soup),
+        cod_visitante=get_cod_visitante(soup),
+        campo=get_cod_estadio_club(soup),
+        jornada=get_jornada(soup),
+        enlace=url,
+        liga=get_nombre_liga(soup),
+        cod_partido=url.rsplit("/", 1)[-1],
+        temporada=temporada,
+    )
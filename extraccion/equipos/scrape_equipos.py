@@ -7,22 +7,23 @@ import sys
 
 from typing import Dict, List
 from pathlib import Path
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from utiles.utiles_modelos import Campo, Club_Equipo, TargetURL
+from utiles.utiles_parser import crear_soup
 from utiles.utiles_salida import print_cabecera
 from utiles.utiles_scraping import (
-    CHUNK_SIZE,
     ScrapedURL,
-    chunked_iterable,
     guardar_datos_json,
-    scrape_urls,
+    scrape_urls_stream,
     URLFailReason,
     URLFail,
     MAX_REINTENTOS,
+    reintentables,
     SEMAPHORE_VALUE,
+    NUM_WORKERS,
+    finalizar_scraping,
 )
 from equipos.utiles_equipos import *
 from utiles.utiles_links import *
@@ -48,12 +49,6 @@ async def scrapear_equipos(
     equipos_a_reintentar: List[str] = []
     links_campos: List[str] = []
     equipos = 0
-    if intento > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los equipos."
-        )
-        logging.info(f"Equipos fallidos: {[equipo for equipo in links_equipos]}")
-        return [], []
     logging.info(
         print_cabecera(
             f"Equipos intento {intento}. Equipos restantes: {len(links_equipos)}"
@@ -63,90 +58,69 @@ async def scrapear_equipos(
     for link in links_equipos:
         target_urls.append(TargetURL(url=link.replace("startseite", "datenfakten")))
 
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            equipos_a_reintentar.extend(
-                links_equipos[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            equipos_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                equipos_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            link_estadio = get_enlace_estadio(soup)
-            if link_estadio != "-":
-                links_campos.append("https://www.transfermarkt.es" + link_estadio)
-            nombre = get_nombre(soup)
-            primer_equipo_nombre, primer_equipo_link = obtener_primer_equipo(
-                soup, nombre
-            )
-            cod_equipo = (url.split("/")[6],)
-            club_equipo: Club_Equipo = Club_Equipo(
-                cod_equipo=cod_equipo[0],
-                nombre=nombre,
-                liga=get_liga(soup),
-                localidad=get_localidad(soup),
-                primer_equipo=(
-                    primer_equipo_nombre if primer_equipo_nombre != "-" else nombre
-                ),
-                cod_club=(
-                    primer_equipo_link.split("/")[-1]
-                    if primer_equipo_link != "-"
-                    else cod_equipo[0]
-                ),
-            )
+        soup = crear_soup(html)
+        link_estadio = get_enlace_estadio(soup)
+        if link_estadio != "-":
+            links_campos.append("https://www.transfermarkt.es" + link_estadio)
+        nombre = get_nombre(soup)
+        primer_equipo_nombre, primer_equipo_link = obtener_primer_equipo(
+            soup, nombre
+        )
+        cod_equipo = (url.split("/")[6],)
+        club_equipo: Club_Equipo = Club_Equipo(
+            cod_equipo=cod_equipo[0],
+            nombre=nombre,
+            liga=get_liga(soup),
+            localidad=get_localidad(soup),
+            primer_equipo=(
+                primer_equipo_nombre if primer_equipo_nombre != "-" else nombre
+            ),
+            cod_club=(
+                primer_equipo_link.split("/")[-1]
+                if primer_equipo_link != "-"
+                else cod_equipo[0]
+            ),
+        )
 
-            if (
-                not club_equipo.cod_club
-                or club_equipo.nombre == "-"
-                or club_equipo.liga == "-"
-            ):
-                logging.info(f"Fallido {url}. A reintentar...")
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el equipo.",
-                    )
+        if (
+            not club_equipo.cod_club
+            or club_equipo.nombre == "-"
+            or club_equipo.liga == "-"
+        ):
+            logging.info(f"Fallido {url}. A reintentar...")
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el equipo.",
                 )
-                equipos_a_reintentar.append(url)
-                continue
-            paginas_scrapeadas.add(url)
-            logging.info(f"Scrapeado equipo: {club_equipo.nombre}")
-            datos_equipos.append(club_equipo)
-            equipos += 1
-    if len(equipos_a_reintentar) > 0 and intento < MAX_REINTENTOS:
+            )
+            equipos_a_reintentar.append(url)
+            continue
+        paginas_scrapeadas.add(url)
+        logging.info(f"Scrapeado equipo: {club_equipo.nombre}")
+        datos_equipos.append(club_equipo)
+        equipos += 1
+    equipos_a_reintentar = reintentables(equipos_a_reintentar)
+    if len(equipos_a_reintentar) > 0:
         datos_equipos_reintentados, links_equipos_reintentados, equipos_reintentados = (
             await scrapear_equipos(equipos_a_reintentar, intento + 1)
         )
@@ -166,12 +140,6 @@ async def scrapear_campos(
     campos_a_reintentar: List[str] = []
     datos_campos: List[Campo] = []
     num_campos = 0
-    if intento > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los campos."
-        )
-        logging.info(f"Campos fallidos: {[campo for campo in links_campos]}")
-        return []
     logging.info(
         print_cabecera(f"Campos {intento}. Campos restantes: {len(links_campos)}")
     )
@@ -179,75 +147,53 @@ async def scrapear_campos(
     for link in links_campos:
         target_urls.append(TargetURL(url=link))
 
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            campos_a_reintentar.extend(
-                links_campos[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            campos_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                campos_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            direccion, localidad = get_direccion_y_localidad(soup)
-            campo: Campo = Campo(
-                nombre=get_nombre_estadio(soup),
-                cod_equipo=url.split("/verein/")[1],
-                superficie=get_superficie_estadio(soup),
-                dimensiones=get_dimensiones_estadio(soup),
-                aforo=get_aforo_estadio(soup),
-                direccion=direccion,
-                localidad=localidad,
-            )
+        soup = crear_soup(html)
+        direccion, localidad = get_direccion_y_localidad(soup)
+        campo: Campo = Campo(
+            nombre=get_nombre_estadio(soup),
+            cod_equipo=url.split("/verein/")[1],
+            superficie=get_superficie_estadio(soup),
+            dimensiones=get_dimensiones_estadio(soup),
+            aforo=get_aforo_estadio(soup),
+            direccion=direccion,
+            localidad=localidad,
+        )
 
-            if campo.nombre == "-" or campo.cod_equipo == "-":
-                logging.info(f"Fallido {url}. A reintentar...")
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el campo.",
-                    )
+        if campo.nombre == "-" or campo.cod_equipo == "-":
+            logging.info(f"Fallido {url}. A reintentar...")
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el campo.",
                 )
-                campos_a_reintentar.append(url)
-                continue
-            paginas_scrapeadas.add(url)
-            logging.info(f"Scrapeado campo: {campo.nombre}, {campo.cod_equipo}")
-            datos_campos.append(campo)
-            num_campos += 1
-    if len(campos_a_reintentar) > 0 and intento < MAX_REINTENTOS:
+            )
+            campos_a_reintentar.append(url)
+            continue
+        paginas_scrapeadas.add(url)
+        logging.info(f"Scrapeado campo: {campo.nombre}, {campo.cod_equipo}")
+        datos_campos.append(campo)
+        num_campos += 1
+    campos_a_reintentar = reintentables(campos_a_reintentar)
+    if len(campos_a_reintentar) > 0:
         datos_campos_reintentados, num_campos_reintentados = await scrapear_campos(
             campos_a_reintentar, intento + 1
         )
@@ -284,18 +230,26 @@ async def procesar_equipos():
     )
     logging.info(print_cabecera("Estadísticas de scraping"))
     logging.info(f"\nPáginas únicas scrapeadas: {len(paginas_scrapeadas)}")
-    logging.info(f"\nAsyncio semaphore: {SEMAPHORE_VALUE}")
-    logging.info(f"\nTamaño del chunk: {CHUNK_SIZE}")
+    logging.info(f"\nConcurrencia inicial: {SEMAPHORE_VALUE}")
+    logging.info(f"\nWorkers de descarga: {NUM_WORKERS}")
     logging.info(f"\nPáginas fallidas: {len(paginas_fallidas)}")
     for i in range(1, MAX_REINTENTOS + 1):
         logging.info(print_cabecera(f"Reintento {i}"))
         for pagina in paginas_fallidas:
             if pagina.attempt == i:
                 logging.info(f"· {pagina.reason} | {pagina.url} | {pagina.message}")
-    guardar_datos_json(datos_equipos, f"{ruta_archivo}datos_equipos")
-    guardar_datos_json(datos_equipos, f"{ruta_archivo_datos}datos_equipos")
-    guardar_datos_json(datos_campos, f"{ruta_archivo}datos_campos")
-    guardar_datos_json(datos_campos, f"{ruta_archivo_datos}datos_campos")
+    guardar_datos_json(
+        datos_equipos,
+        f"{ruta_archivo}datos_equipos",
+        f"{ruta_archivo_datos}datos_equipos",
+        instantanea=True,
+    )
+    guardar_datos_json(
+        datos_campos,
+        f"{ruta_archivo}datos_campos",
+        f"{ruta_archivo_datos}datos_campos",
+        instantanea=True,
+    )
 
 
 async def main():
@@ -307,6 +261,7 @@ async def main():
     except Exception as e:
         logging.error(f"Error en la ejecución: {e}")
     finally:
+        await finalizar_scraping()
         end_time = time.time()
         minutes, seconds = divmod(end_time - start_time, 60)
         logging.info(
@@ -2,11 +2,9 @@ import json
 from utiles.utiles_modelos import Fichaje
 
 
-def extraer_fichajes_desde_pre(soup):
+def extraer_fichajes_desde_pre(contenido: str):
     try:
-        pre = soup.find("pre")
-
-        data = json.loads(pre.get_text())
+        data = json.loads(contenido)
         fichajes: list[Fichaje] = []
         for transfer in data.get("transfers", []):
             temporada = transfer.get("season", None)
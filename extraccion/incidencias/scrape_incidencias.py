@@ -7,7 +7,6 @@ import sys
 
 from typing import List
 from pathlib import Path
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 
@@ -19,17 +18,19 @@ from utiles.utiles_modelos import (
     JugadorValorMercado,
     TargetURL,
 )
+from utiles.utiles_parser import crear_soup
 from utiles.utiles_salida import print_cabecera
 from utiles.utiles_scraping import (
-    CHUNK_SIZE,
     ScrapedURL,
-    chunked_iterable,
     guardar_datos_json,
-    scrape_urls,
+    scrape_urls_stream,
     URLFailReason,
     URLFail,
     MAX_REINTENTOS,
+    reintentables,
     SEMAPHORE_VALUE,
+    NUM_WORKERS,
+    finalizar_scraping,
 )
 from utiles.utiles_links import *
 
@@ -49,12 +50,6 @@ async def scrapear_incidencias_links_jugadores(
     links_equipos: List[str], intentos=1
 ) -> tuple[List[Incidencia], list[str], int, int]:
     global paginas_fallidas, paginas_scrapeadas
-    if intentos > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los jugadores e incidencias."
-        )
-        logging.info(f"Jugadores fallidos: {[link for link in links_equipos]}")
-        return []
     target_urls: List[TargetURL] = []
     paginas_a_reintentar: List[str] = []
     incidencias: List[Incidencia] = []
@@ -68,72 +63,51 @@ async def scrapear_incidencias_links_jugadores(
     )
 
     for link in links_equipos:
-        target_urls.append(TargetURL(url=link))
-
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        target_urls.append(TargetURL(url=link, selector="td.hauptlink"))
+
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            paginas_a_reintentar.extend(
-                links_equipos[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            paginas_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                paginas_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
+        soup = crear_soup(html, "plantilla")
 
-            links_jugadores_equipo, incidencias_equipo = get_incidencias_y_links(soup)
-            if not links_jugadores_equipo:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se han encontrado jugadores o incidencias.",
-                    )
+        links_jugadores_equipo, incidencias_equipo = get_incidencias_y_links(soup)
+        if not links_jugadores_equipo:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se han encontrado jugadores o incidencias.",
                 )
-                paginas_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-            incidencias.extend(incidencias_equipo)
-            links_jugadores.extend(links_jugadores_equipo)
-            logging.info(
-                f"Scrapeadas {len(incidencias_equipo)} incidencias de jugadores y {len(links_jugadores_equipo)} jugadores del equipo {scraped_url.url}."
             )
-            num_incidencias += len(incidencias_equipo)
-            num_jugadores += len(links_jugadores_equipo)
-            paginas_scrapeadas.add(url)
-    if len(paginas_a_reintentar) > 0 and intentos < MAX_REINTENTOS:
+            paginas_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
+        incidencias.extend(incidencias_equipo)
+        links_jugadores.extend(links_jugadores_equipo)
+        logging.info(
+            f"Scrapeadas {len(incidencias_equipo)} incidencias de jugadores y {len(links_jugadores_equipo)} jugadores del equipo {scraped_url.url}."
+        )
+        num_incidencias += len(incidencias_equipo)
+        num_jugadores += len(links_jugadores_equipo)
+        paginas_scrapeadas.add(url)
+    paginas_a_reintentar = reintentables(paginas_a_reintentar)
+    if len(paginas_a_reintentar) > 0:
         (
             incidencias_reintentadas,
             links_jugadores_reintentados,
@@ -159,12 +133,6 @@ async def scrapear_valores_mercado_jugadores(
     jugadores_a_reintentar: List[str] = []
     datos_valores_mercado_jugadores: List[JugadorValorMercado] = []
     jugadores = 0
-    if intento > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los valores de mercado de los jugadores."
-        )
-        logging.info(f"Jugadores fallidos: {[link for link in links_jugadores]}")
-        return []
     logging.info(
         print_cabecera(
             f"Valor mercado jugadores intento {intento}. Jugadores restantes: {len(links_jugadores)}"
@@ -176,74 +144,50 @@ async def scrapear_valores_mercado_jugadores(
         ruta = f"https://www.transfermarkt.es/ceapi/marketValueDevelopment/graph/{cod}"
         target_urls.append(TargetURL(url=ruta, json=True))
 
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            jugadores_a_reintentar.extend(
-                links_jugadores[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            jugadores_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                jugadores_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-
-            valor_actual, valor_maximo = get_valores_mercado(soup)
-            valores_jugador: JugadorValorMercado = JugadorValorMercado(
-                cod_jugador=url.split("/")[-1],
-                valor_mercado_actual=valor_actual,
-                valor_mercado_maximo=valor_maximo,
-            )
+        valor_actual, valor_maximo = get_valores_mercado(html)
+        valores_jugador: JugadorValorMercado = JugadorValorMercado(
+            cod_jugador=url.split("/")[-1],
+            valor_mercado_actual=valor_actual,
+            valor_mercado_maximo=valor_maximo,
+        )
 
-            if not valores_jugador.cod_jugador:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el gráfico del jugador.",
-                    )
+        if not valores_jugador.cod_jugador:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el gráfico del jugador.",
                 )
-                jugadores_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-            paginas_scrapeadas.add(url)
-            logging.info(
-                f"Scrapeado grafico valores jugador: {valores_jugador.cod_jugador}"
             )
-            datos_valores_mercado_jugadores.append(valores_jugador)
-            jugadores += 1
-    if len(jugadores_a_reintentar) > 0 and intento < MAX_REINTENTOS:
+            jugadores_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
+        paginas_scrapeadas.add(url)
+        logging.info(
+            f"Scrapeado grafico valores jugador: {valores_jugador.cod_jugador}"
+        )
+        datos_valores_mercado_jugadores.append(valores_jugador)
+        jugadores += 1
+    jugadores_a_reintentar = reintentables(jugadores_a_reintentar)
+    if len(jugadores_a_reintentar) > 0:
         datos_valores_mercado_jugadores_reintentados, num_jugadores_reintentados = (
             await scrapear_valores_mercado_jugadores(
                 jugadores_a_reintentar, intento + 1
@@ -298,23 +242,25 @@ async def procesar_incidencias_jugadores():
     )
     logging.info(print_cabecera("Estadísticas de scraping"))
     logging.info(f"\nPáginas únicas scrapeadas: {len(paginas_scrapeadas)}")
-    logging.info(f"\nAsyncio semaphore: {SEMAPHORE_VALUE}")
-    logging.info(f"\nTamaño del chunk: {CHUNK_SIZE}")
+    logging.info(f"\nConcurrencia inicial: {SEMAPHORE_VALUE}")
+    logging.info(f"\nWorkers de descarga: {NUM_WORKERS}")
     logging.info(f"\nPáginas fallidas: {len(paginas_fallidas)}")
     for i in range(1, MAX_REINTENTOS + 1):
         logging.info(print_cabecera(f"Reintento {i}"))
         for pagina in paginas_fallidas:
             if pagina.attempt == i:
                 logging.info(f"· {pagina.reason} | {pagina.url} | {pagina.message}")
-    guardar_datos_json(incidencias, f"{ruta_archivo_datos}datos_incidencias_jugadores")
     guardar_datos_json(
-        datos_valores_mercado_jugadores,
-        f"{ruta_archivo_datos}datos_valores_mercado_jugadores",
+        incidencias,
+        f"{ruta_archivo_datos}datos_incidencias_jugadores",
+        f"{ruta_archivo}datos_incidencias_jugadores",
+        instantanea=True,
     )
-    guardar_datos_json(incidencias, f"{ruta_archivo}datos_incidencias_jugadores")
     guardar_datos_json(
         datos_valores_mercado_jugadores,
+        f"{ruta_archivo_datos}datos_valores_mercado_jugadores",
         f"{ruta_archivo}datos_valores_mercado_jugadores",
+        instantanea=True,
     )
 
 
@@ -326,6 +272,7 @@ async def main():
     except Exception as e:
         logging.error(f"Error en la ejecución: {e}")
     finally:
+        await finalizar_scraping()
         end_time = time.time()
         minutes, seconds = divmod(end_time - start_time, 60)
         logging.info(
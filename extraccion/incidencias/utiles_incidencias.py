@@ -1,4 +1,5 @@
 from utiles.utiles_modelos import Incidencia
+from utiles.utiles_parser import seleccionar
 
 
 def get_incidencias_y_links(soup):
@@ -6,7 +7,7 @@ def get_incidencias_y_links(soup):
     links_jugadores = []
     incidencias: list[Incidencia] = []
 
-    for td in soup.select("td.hauptlink"):
+    for td in seleccionar(soup, "plantilla", "celdas_enlace"):
         try:
             a_tag = td.find("a", href=True)
             if a_tag and "/profil/spieler/" in a_tag["href"]:
@@ -0,0 +1,98 @@
+# coding=utf-8
+import argparse
+import sys
+import time
+
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utiles.utiles_instantaneas import (
+    MODELOS_POR_ETAPA,
+    PYARROW_DISPONIBLE,
+    EscritorInstantanea,
+    consultar,
+    etapa_de_ruta,
+    etapas_disponibles,
+    fecha_de_ruta,
+)
+from utiles.utiles_ndjson import leer_registros
+from utiles.utiles_salida import print_cabecera
+
+DIRECTORIO_EXTRACCION = Path(__file__).resolve().parent.parent
+
+
+def resultados_con_fecha() -> list[Path]:
+    rutas = {}
+    for ruta in DIRECTORIO_EXTRACCION.glob("*/resultados/*"):
+        if ruta.suffix in (".json", ".ndjson") and fecha_de_ruta(ruta):
+            rutas.setdefault(ruta.with_suffix(".ndjson"), ruta)
+    return sorted(rutas)
+
+
+def importar():
+    print(print_cabecera("Importando resultados anteriores como instantáneas"))
+    for ruta in resultados_con_fecha():
+        etapa = etapa_de_ruta(ruta)
+        modelo = MODELOS_POR_ETAPA.get(etapa)
+        if modelo is None:
+            continue
+        escritor = EscritorInstantanea(etapa, modelo, fecha_de_ruta(ruta))
+        if escritor.ruta.exists():
+            continue
+        try:
+            for registro in leer_registros(ruta):
+                escritor.escribir(registro)
+            escritor.cerrar()
+            print(f"{ruta.name}: {escritor.registros} registros -> {escritor.ruta}")
+        except Exception as e:
+            escritor.abandonar()
+            print(f"{ruta.name}: error importando ({e})")
+
+
+def fecha(texto: str):
+    return datetime.strptime(texto, "%Y-%m-%d").date() if texto else None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Consulta las instantáneas Parquet de las etapas de scraping leyendo solo las columnas pedidas."
+    )
+    subparsers = parser.add_subparsers(dest="orden", required=True)
+    subparsers.add_parser(
+        "importar",
+        help="Convierte los resultados con fecha de extraccion/*/resultados en instantáneas.",
+    )
+    subparsers.add_parser("etapas", help="Lista las etapas con instantáneas.")
+    parser_consulta = subparsers.add_parser("consultar")
+    parser_consulta.add_argument("etapa")
+    parser_consulta.add_argument("--columnas", nargs="+")
+    parser_consulta.add_argument("--desde", help="Primera fecha de ejecución (AAAA-MM-DD).")
+    parser_consulta.add_argument("--hasta", help="Última fecha de ejecución (AAAA-MM-DD).")
+    parser_consulta.add_argument("--filas", type=int, default=20)
+    args = parser.parse_args()
+
+    if not PYARROW_DISPONIBLE:
+        print("Las instantáneas necesitan pyarrow instalado.")
+        return
+    if args.orden == "importar":
+        importar()
+        return
+    if args.orden == "etapas":
+        for etapa in etapas_disponibles():
+            print(etapa)
+        return
+
+    inicio = time.perf_counter()
+    tabla = consultar(args.etapa, args.columnas, fecha(args.desde), fecha(args.hasta))
+    print(
+        print_cabecera(
+            f"{args.etapa}: {tabla.num_rows} filas, {tabla.num_columns} columnas en {time.perf_counter() - inicio:.2f}s"
+        )
+    )
+    for fila in tabla.slice(0, args.filas).to_pylist():
+        print(fila)
+
+
+if __name__ == "__main__":
+    main()
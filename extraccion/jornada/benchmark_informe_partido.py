@@ -0,0 +1,103 @@
+# coding=utf-8
+import argparse
+import statistics
+import time
+import sys
+
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from jornada.utiles_jornada import (
+    SELECTORES_INFORME_PARTIDO,
+    cargar_diccionario_posicion_a_minuto,
+    extraer_partido_jugado,
+    parsear_partido_jugado,
+)
+from utiles.utiles_archivo import ArchivoPaginas
+from utiles.utiles_parser import BACKEND_HTML, crear_soup, extraer_fragmentos
+from utiles.utiles_salida import print_cabecera
+
+
+def cargar_paginas(directorio: str = None, limite: int = None) -> list[tuple[str, str]]:
+    if directorio:
+        paginas = [
+            (ruta.stem, ruta.read_text(encoding="utf-8"))
+            for ruta in sorted(Path(directorio).glob("*.html"))
+        ]
+    else:
+        archivo = ArchivoPaginas()
+        entradas = archivo.entradas(tipos=["partido"])
+        paginas = [(entrada.url, contenido) for entrada, contenido in archivo.leer(entradas)]
+        archivo.cerrar()
+    return paginas[:limite] if limite else paginas
+
+
+def medir(funcion, paginas, repeticiones: int) -> list[float]:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for url, html in paginas:
+            funcion(url, html)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mide el extractor de informes de partido en una pasada frente al coste de construir el soup."
+    )
+    parser.add_argument(
+        "--directorio",
+        help="Carpeta con informes de partido guardados (*.html). Por defecto se usa el archivo de páginas.",
+    )
+    parser.add_argument("--limite", type=int, help="Número máximo de páginas.")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    pos_a_minuto = cargar_diccionario_posicion_a_minuto()
+    paginas = cargar_paginas(args.directorio, args.limite)
+    if not paginas:
+        print("No hay informes de partido guardados.")
+        return
+    soups = [(url, crear_soup(html)) for url, html in paginas]
+    fragmentos = [
+        (url, extraer_fragmentos(html, tuple(SELECTORES_INFORME_PARTIDO)) or html)
+        for url, html in paginas
+    ]
+
+    print(
+        print_cabecera(
+            f"{len(paginas)} informes, {args.repeticiones} repeticiones, parser {BACKEND_HTML}"
+        )
+    )
+    resultados = {
+        "Una pasada (HTML)": medir(
+            lambda url, html: parsear_partido_jugado(url, html, pos_a_minuto),
+            paginas,
+            args.repeticiones,
+        ),
+        "Una pasada (fragmentos)": medir(
+            lambda url, html: parsear_partido_jugado(url, html, pos_a_minuto),
+            fragmentos,
+            args.repeticiones,
+        ),
+        "Solo soup": medir(
+            lambda url, html: crear_soup(html), paginas, args.repeticiones
+        ),
+        "Una pasada (soup ya creado)": medir(
+            lambda url, soup: extraer_partido_jugado(
+                soup, url.rsplit("/", 1)[-1], pos_a_minuto
+            ),
+            soups,
+            args.repeticiones,
+        ),
+    }
+    for nombre, tiempos in resultados.items():
+        mediana = statistics.median(tiempos)
+        print(
+            f"{nombre}: {mediana:.3f}s mediana, {mediana / len(paginas) * 1000:.2f} ms/página"
+        )
+
+
+if __name__ == "__main__":
+    main()
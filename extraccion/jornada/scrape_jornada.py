@@ -5,9 +5,8 @@ import asyncio
 import time
 import sys
 
-from typing import Dict, List
+from typing import Callable, Dict, List
 from pathlib import Path
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
@@ -21,18 +20,20 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from calendarios.utiles_calendarios import *
 from jornada.utiles_jornada import *
-from utiles.utiles_modelos import PartidoJugado, TargetURL
+from utiles.utiles_modelos import PartidoJugado, Prioridad, TargetURL
+from utiles.utiles_ndjson import EscritorNDJSON
+from utiles.utiles_parseo import parsear_en_pool
 from utiles.utiles_salida import print_cabecera
 from utiles.utiles_scraping import (
-    CHUNK_SIZE,
     ScrapedURL,
-    chunked_iterable,
-    guardar_datos_json,
-    scrape_urls,
+    scrape_urls_stream,
     URLFailReason,
     URLFail,
     MAX_REINTENTOS,
+    reintentables,
     SEMAPHORE_VALUE,
+    NUM_WORKERS,
+    finalizar_scraping,
 )
 from utiles.utiles_links import *
 
@@ -43,6 +44,8 @@ PASSWORD = os.getenv("MYSQL_PASSWORD")
 if PASSWORD is None:
     raise ValueError("MYSQL_PASSWORD environment variable is not set.")
 
+PLAZO_JORNADA = 15 * 60
+
 
 nombre_carpeta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
 ruta_archivo = f"{nombre_carpeta}/{datetime.now().strftime('%d-%m-%y_%H-%M')}"
@@ -56,130 +59,87 @@ logging.basicConfig(
 
 
 async def scrapear_partidos(
-    links_partidos: List[str], pos_a_minuto: Dict[str, int], intento=1
-) -> tuple[List[PartidoJugado], int]:
+    links_partidos: List[str],
+    pos_a_minuto: Dict[str, int],
+    emitir: Callable[[PartidoJugado], None],
+    intento=1,
+) -> int:
     global paginas_fallidas, paginas_scrapeadas
     target_urls: List[TargetURL] = []
     partidos_a_reintentar: List[str] = []
-    datos_partidos: List[PartidoJugado] = []
     partidos = 0
-    if intento > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para la jornada."
-        )
-        logging.info(f"Partidos fallidos: {[link for link in links_partidos]}")
-        return []
     logging.info(
         print_cabecera(
             f"Partidos de la jornada intento {intento}. Partidos restantes: {len(links_partidos)}"
         )
     )
 
+    plazo = time.time() + PLAZO_JORNADA
     for link in links_partidos:
-        target_urls.append(TargetURL(url=link))
+        target_urls.append(
+            TargetURL(
+                url=link,
+                selector="div.sb-team",
+                fragmentos=SELECTORES_INFORME_PARTIDO,
+                prioridad=Prioridad.ALTA,
+                plazo=plazo,
+            )
+        )
 
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
+    async for scraped_url, partido in parsear_en_pool(
+        scrape_urls_stream(target_urls),
+        lambda scraped_url: (
+            parsear_partido_jugado,
+            scraped_url.url,
+            scraped_url.content,
+            pos_a_minuto,
+        ),
     ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            partidos_a_reintentar.extend(
-                links_partidos[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            partidos_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        if (
+            partido is None
+            or not partido.cod_partido
+            or partido.goles_local is None
+            or partido.goles_visitante is None
+        ):
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el partido.",
                 )
-                partidos_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            goles_local, goles_visitante = get_resultado_final(soup)
-            (
-                cod_titulares_local,
-                cod_suplentes_local,
-                cod_titulares_visitante,
-                cod_suplentes_visitante,
-            ) = get_codigos_jugadores_local_y_visitante(soup)
-            goles_local_desc, goles_visitante_desc = get_goles_local_y_visitante(
-                soup, pos_a_minuto
-            )
-            amonestaciones_local, amonestaciones_visitante = (
-                get_amonestaciones_local_visitante(soup, pos_a_minuto)
-            )
-            cambios_local, cambios_visitante = get_cambios(soup, pos_a_minuto)
-            partido = PartidoJugado(
-                cod_partido=url.rsplit("/", 1)[-1],
-                goles_local=goles_local,
-                goles_visitante=goles_visitante,
-                cod_titulares_local=cod_titulares_local,
-                cod_titulares_visitante=cod_titulares_visitante,
-                cod_suplentes_local=cod_suplentes_local,
-                cod_suplentes_visitante=cod_suplentes_visitante,
-                goles_local_desc=goles_local_desc,
-                goles_visitante_desc=goles_visitante_desc,
-                amonestaciones_local=amonestaciones_local,
-                amonestaciones_visitante=amonestaciones_visitante,
-                cambios_local=cambios_local,
-                cambios_visitante=cambios_visitante,
-                fecha=get_fecha_y_hora(soup),
-                penaltis_fallados=get_penaltis_fallados(soup, pos_a_minuto),
             )
-
-            if (
-                not partido.cod_partido
-                or partido.goles_local is None
-                or partido.goles_visitante is None
-            ):
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el partido.",
-                    )
-                )
-                partidos_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-            paginas_scrapeadas.add(url)
-            logging.info(
-                f"Scrapeados datos de partido jugado: {partido.cod_partido}, {partido.goles_local}-{partido.goles_visitante}"
-            )
-            datos_partidos.append(partido)
-            partidos += 1
-    if len(partidos_a_reintentar) > 0 and intento < MAX_REINTENTOS:
-        datos_partidos_reintentados, num_partidos_reintentados = (
-            await scrapear_partidos(partidos_a_reintentar, pos_a_minuto, intento + 1)
+            partidos_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
+        paginas_scrapeadas.add(url)
+        logging.info(
+            f"Scrapeados datos de partido jugado: {partido.cod_partido}, {partido.goles_local}-{partido.goles_visitante}"
         )
-        datos_partidos.extend(datos_partidos_reintentados)
-        partidos += num_partidos_reintentados
-    return datos_partidos, partidos
+        emitir(partido)
+        partidos += 1
+    partidos_a_reintentar = reintentables(partidos_a_reintentar)
+    if len(partidos_a_reintentar) > 0:
+        partidos += await scrapear_partidos(
+            partidos_a_reintentar, pos_a_minuto, emitir, intento + 1
+        )
+    return partidos
 
 
 async def obtener_links_partidos():
@@ -222,10 +182,18 @@ async def procesar_calendarios():
         logging.error("No se han podido obtener los enlaces de los partidos.")
         return
     logging.info(print_cabecera("Scraping de partidos de la jornada"))
-    datos_partidos, partidos = await scrapear_partidos(
-        links_partidos, pos_a_minuto=cargar_diccionario_posicion_a_minuto()
+    salida = EscritorNDJSON(
+        f"{ruta_archivo_datos}datos_partidos_jornada",
+        f"{ruta_archivo}datos_partidos_jornada",
+        instantanea=True,
+    )
+    partidos = await scrapear_partidos(
+        links_partidos,
+        pos_a_minuto=cargar_diccionario_posicion_a_minuto(),
+        emitir=salida.escribir,
     )
-    if not datos_partidos:
+    if not partidos:
+        salida.abandonar()
         logging.error("No se han podido obtener los datos de los partidos.")
         return
     logging.info(
@@ -235,16 +203,16 @@ async def procesar_calendarios():
     )
     logging.info(print_cabecera("Estadísticas de scraping"))
     logging.info(f"\nPáginas únicas scrapeadas: {len(paginas_scrapeadas)}")
-    logging.info(f"\nAsyncio semaphore: {SEMAPHORE_VALUE}")
-    logging.info(f"\nTamaño del chunk: {CHUNK_SIZE}")
+    logging.info(f"\nConcurrencia inicial: {SEMAPHORE_VALUE}")
+    logging.info(f"\nWorkers de descarga: {NUM_WORKERS}")
     logging.info(f"\nPáginas fallidas: {len(paginas_fallidas)}")
     for i in range(1, MAX_REINTENTOS + 1):
         logging.info(print_cabecera(f"Reintento {i}"))
         for pagina in paginas_fallidas:
             if pagina.attempt == i:
                 logging.info(f"· {pagina.reason} | {pagina.url} | {pagina.message}")
-    guardar_datos_json(datos_partidos, f"{ruta_archivo_datos}datos_partidos_jornada")
-    guardar_datos_json(datos_partidos, f"{ruta_archivo}datos_partidos_jornada")
+    logging.info(print_cabecera("Fichero NDJSON"))
+    salida.cerrar()
 
 
 async def main():
@@ -255,6 +223,7 @@ async def main():
     except Exception as e:
         logging.error(f"Error en la ejecución: {e}")
     finally:
+        await finalizar_scraping()
         end_time = time.time()
         minutes, seconds = divmod(end_time - start_time, 60)
         logging.info(
@@ -1,6 +1,25 @@
 import os
 import pickle
-from utiles.utiles_modelos import Amonestacion, Cambio, Gol, PenaltiFallado
+from utiles.utiles_modelos import (
+    Amonestacion,
+    Cambio,
+    Gol,
+    PartidoJugado,
+    PartidoPrevia,
+    PenaltiFallado,
+)
+from utiles.utiles_parser import crear_soup
+
+SELECTORES_INFORME_PARTIDO = [
+    "div.sb-spieldaten",
+    "div.sb-endstand",
+    "div.aufstellung-vereinsseite",
+    "#sb-tore",
+    "#sb-wechsel",
+    "#sb-karten",
+    "#sb-verschossene",
+]
+SELECTORES_PREVIA = ["div.sb-spieldaten"]
 
 
 def cargar_diccionario_posicion_a_minuto():
@@ -14,39 +33,173 @@ def cargar_diccionario_posicion_a_minuto():
     return diccionario
 
 
-def get_fecha_y_hora(soup):
-    try:
-        div_datos = soup.find("div", class_="sb-spieldaten")
-        if div_datos:
-            p_datum = div_datos.find("p", class_="sb-datum hide-for-small")
-            if p_datum:
-                texto_completo = p_datum.get_text(strip=True)
-                partes = texto_completo.split(", ")
-                if len(partes) > 1:
-                    fecha_hora = partes[1].replace("H", "").strip()
-                    fecha_hora = fecha_hora.replace("|", "").strip()
-                    return fecha_hora
+SECCIONES_EVENTOS = {
+    "sb-tore": "goles",
+    "sb-wechsel": "cambios",
+    "sb-karten": "amonestaciones",
+    "sb-verschossene": "penaltis",
+}
+CLASES_CONTENEDOR = {"sb-spieldaten", "sb-endstand", "aufstellung-vereinsseite"}
+CLASES_EVENTO = ["sb-aktion-heim", "sb-aktion-gast"]
+
+
+def cod_jugador_de_enlace(a_tag):
+    if a_tag is None:
         return None
-    except:
+    href = a_tag.get("href", "")
+    if "/spieler/" not in href:
         return None
+    return href.split("/spieler/")[1].split("/")[0]
 
 
-def get_resultado_final(soup):
-    try:
+def decodificar_minuto(evento, pos_a_minuto):
+    div_uhr = evento.find("div", class_="sb-aktion-uhr")
+    if not div_uhr:
+        return None
+    span_uhr = div_uhr.find("span", class_="sb-sprite-uhr-klein")
+    if not span_uhr or "style" not in span_uhr.attrs:
+        return None
+    posicion = (
+        span_uhr["style"].replace("background-position:", "").replace(";", "").strip()
+    )
+    return pos_a_minuto.get(posicion, None)
+
 
-        div_resultado = soup.find("div", class_="sb-endstand")
-        if div_resultado:
-            resultado = div_resultado.get_text(strip=True)
+def es_local(evento) -> bool:
+    return "sb-aktion-heim" in evento.get("class", [])
 
-            if "(" in resultado:
-                resultado = resultado.split("(")[0].strip()
 
-            goles = resultado.split(":")
-            if len(goles) == 2 and goles[0].isdigit() and goles[1].isdigit():
-                return int(goles[0]), int(goles[1])
+def eventos_de(contenedor):
+    if not contenedor:
+        return []
+    return contenedor.find_all("li", class_=CLASES_EVENTO)
+
+
+def leer_fecha(div_datos):
+    if not div_datos:
+        return None
+    p_datum = div_datos.find("p", class_="sb-datum hide-for-small")
+    if not p_datum:
+        return None
+    partes = p_datum.get_text(strip=True).split(", ")
+    if len(partes) > 1:
+        return partes[1].replace("H", "").strip().replace("|", "").strip()
+    return None
+
+
+def leer_resultado(div_resultado):
+    if not div_resultado:
         return None, None
+    resultado = div_resultado.get_text(strip=True)
+    if "(" in resultado:
+        resultado = resultado.split("(")[0].strip()
+    goles = resultado.split(":")
+    if len(goles) == 2 and goles[0].isdigit() and goles[1].isdigit():
+        return int(goles[0]), int(goles[1])
+    return None, None
+
+
+def leer_gol(evento, pos_a_minuto) -> Gol:
+    gol = Gol()
+
+    res_tag = evento.find("div", class_="sb-aktion-spielstand")
+    if res_tag:
+        b_tag = res_tag.find("b")
+        gol.resultado_gol = b_tag.text.strip() if b_tag else None
+
+    gol.minuto = decodificar_minuto(evento, pos_a_minuto)
+
+    div_accion = evento.find("div", class_="sb-aktion-aktion")
+    if div_accion:
+        partes = div_accion.get_text(separator=" ", strip=True).split("asistente:")
+
+        trozos_gol = [t.strip() for t in partes[0].strip().split(",")]
+        gol.desc = trozos_gol[1] if len(trozos_gol) > 1 else None
+
+        if len(partes) > 1:
+            trozos_asist = [t.strip() for t in partes[1].strip().split(",")]
+            asist_desc = trozos_asist[1] if len(trozos_asist) > 1 else None
+            if asist_desc and asist_desc.lower() != "sin asistencia":
+                gol.desc_asist = asist_desc
+
+        enlaces = div_accion.find_all("a")
+        if len(enlaces) >= 1:
+            gol.cod_goleador = cod_jugador_de_enlace(enlaces[0])
+        if len(enlaces) >= 2:
+            gol.cod_asistente = cod_jugador_de_enlace(enlaces[1])
+    return gol
+
+
+def leer_cambio(evento, pos_a_minuto) -> Cambio:
+    cambio = Cambio()
+    cambio.minuto = decodificar_minuto(evento, pos_a_minuto)
+
+    div_accion = evento.find("div", class_="sb-aktion-aktion")
+    if div_accion:
+        ein_span = div_accion.find("span", class_="sb-aktion-wechsel-ein")
+        if ein_span:
+            cambio.cod_entra = cod_jugador_de_enlace(ein_span.find("a"))
+
+        aus_span = div_accion.find("span", class_="sb-aktion-wechsel-aus")
+        if aus_span:
+            cambio.cod_fuera = cod_jugador_de_enlace(aus_span.find("a"))
+            span_desc = aus_span.find("span", class_="hide-for-small")
+            cambio.desc = (
+                span_desc.get_text().lstrip(", ").strip() if span_desc else None
+            )
+    return cambio
+
+
+def leer_amonestacion(evento, pos_a_minuto) -> Amonestacion:
+    am = Amonestacion()
+
+    div_bild = evento.find("div", class_="sb-aktion-spielerbild")
+    a_jugador = div_bild.find("a") if div_bild else None
+    if a_jugador and "/spieler/" in a_jugador.get("href", ""):
+        am.cod_amonestado = a_jugador["href"].rsplit("/", 1)[-1]
+
+    div_stand = evento.find("div", class_="sb-aktion-spielstand")
+    span_stand = div_stand.find("span") if div_stand else None
+    am.amarilla = False
+    am.roja = False
+    if span_stand:
+        clases = span_stand.get("class", [])
+        if "sb-gelb" in clases:
+            am.amarilla = True
+        elif "sb-rot" in clases:
+            am.roja = True
+        elif "sb-gelbrot" in clases:
+            am.amarilla = True
+            am.roja = True
+
+    am.minuto = decodificar_minuto(evento, pos_a_minuto)
+    return am
+
+
+def leer_penalti(evento, pos_a_minuto) -> PenaltiFallado:
+    pf = PenaltiFallado()
+    pf.minuto = decodificar_minuto(evento, pos_a_minuto)
+
+    div_aus = evento.find("span", class_="sb-aktion-wechsel-aus")
+    if div_aus:
+        pf.cod_portero = cod_jugador_de_enlace(div_aus.find("a", href=True))
+        texto = div_aus.get_text(strip=True).lower()
+        pf.parado = "parad" in texto or "despej" in texto or "bloq" in texto
+    return pf
+
+
+def leer_eventos_por_equipo(contenedor, lector, pos_a_minuto):
+    local, visitante = [], []
+    for evento in eventos_de(contenedor):
+        (local if es_local(evento) else visitante).append(lector(evento, pos_a_minuto))
+    return local, visitante
+
+
+def get_fecha_y_hora(soup):
+    try:
+        return leer_fecha(soup.find("div", class_="sb-spieldaten"))
     except:
-        return None, None
+        return None
 
 
 def get_codigos_jugadores_de_bloque(alineacion_div) -> list[int]:
@@ -72,227 +225,90 @@ def get_codigos_suplentes_de_bloque(suplentes_div) -> list[int]:
     return codigos
 
 
-def get_codigos_jugadores_local_y_visitante(soup):
-    alineaciones = soup.find_all("div", class_="aufstellung-vereinsseite")
-
+def leer_alineaciones(alineaciones):
     if len(alineaciones) < 8:
         return [], [], [], []
-
-    codigos_local_titulares = get_codigos_jugadores_de_bloque(alineaciones[2])
-    codigos_local_suplentes = get_codigos_suplentes_de_bloque(alineaciones[3])
-    codigos_visitante_titulares = get_codigos_jugadores_de_bloque(alineaciones[6])
-    codigos_visitante_suplentes = get_codigos_suplentes_de_bloque(alineaciones[7])
-
     return (
-        codigos_local_titulares,
-        codigos_local_suplentes,
-        codigos_visitante_titulares,
-        codigos_visitante_suplentes,
+        get_codigos_jugadores_de_bloque(alineaciones[2]),
+        get_codigos_suplentes_de_bloque(alineaciones[3]),
+        get_codigos_jugadores_de_bloque(alineaciones[6]),
+        get_codigos_suplentes_de_bloque(alineaciones[7]),
     )
 
 
-def get_goles_local_y_visitante(soup, pos_a_minuto):
-    goles_local = []
-    goles_visitante = []
-
-    contenedor_goles = soup.find("div", id="sb-tore")
-    if not contenedor_goles:
-        return goles_local, goles_visitante
-
-    eventos = contenedor_goles.find_all(
-        "li", class_=["sb-aktion-heim", "sb-aktion-gast"]
+def es_contenedor_informe(tag) -> bool:
+    if tag.name != "div":
+        return False
+    if tag.get("id") in SECCIONES_EVENTOS:
+        return True
+    return not CLASES_CONTENEDOR.isdisjoint(tag.get("class") or ())
+
+
+def localizar_secciones_informe(soup) -> dict:
+    secciones = {"alineaciones": []}
+    for tag in soup.find_all(es_contenedor_informe):
+        seccion = SECCIONES_EVENTOS.get(tag.get("id"))
+        if seccion:
+            secciones.setdefault(seccion, tag)
+        clases = tag.get("class") or ()
+        if "aufstellung-vereinsseite" in clases:
+            secciones["alineaciones"].append(tag)
+        if "sb-endstand" in clases:
+            secciones.setdefault("resultado", tag)
+        if "sb-spieldaten" in clases:
+            secciones.setdefault("datos", tag)
+    return secciones
+
+
+def extraer_partido_jugado(soup, cod_partido: str, pos_a_minuto) -> PartidoJugado:
+    secciones = localizar_secciones_informe(soup)
+    goles_local, goles_visitante = leer_resultado(secciones.get("resultado"))
+    (
+        cod_titulares_local,
+        cod_suplentes_local,
+        cod_titulares_visitante,
+        cod_suplentes_visitante,
+    ) = leer_alineaciones(secciones["alineaciones"])
+    goles_local_desc, goles_visitante_desc = leer_eventos_por_equipo(
+        secciones.get("goles"), leer_gol, pos_a_minuto
+    )
+    amonestaciones_local, amonestaciones_visitante = leer_eventos_por_equipo(
+        secciones.get("amonestaciones"), leer_amonestacion, pos_a_minuto
+    )
+    cambios_local, cambios_visitante = leer_eventos_por_equipo(
+        secciones.get("cambios"), leer_cambio, pos_a_minuto
+    )
+    return PartidoJugado(
+        cod_partido=cod_partido,
+        goles_local=goles_local,
+        goles_visitante=goles_visitante,
+        cod_titulares_local=cod_titulares_local,
+        cod_titulares_visitante=cod_titulares_visitante,
+        cod_suplentes_local=cod_suplentes_local,
+        cod_suplentes_visitante=cod_suplentes_visitante,
+        goles_local_desc=goles_local_desc,
+        goles_visitante_desc=goles_visitante_desc,
+        amonestaciones_local=amonestaciones_local,
+        amonestaciones_visitante=amonestaciones_visitante,
+        cambios_local=cambios_local,
+        cambios_visitante=cambios_visitante,
+        fecha=leer_fecha(secciones.get("datos")),
+        penaltis_fallados=[
+            leer_penalti(evento, pos_a_minuto)
+            for evento in eventos_de(secciones.get("penaltis"))
+        ],
     )
 
-    for evento in eventos:
-        gol = Gol()
-
-        res_tag = evento.find("div", class_="sb-aktion-spielstand")
-        if res_tag:
-            b_tag = res_tag.find("b")
-            gol.resultado_gol = b_tag.text.strip() if b_tag else None
-
-        div_uhr = evento.find("div", class_="sb-aktion-uhr")
-        gol.minuto = None
-        if div_uhr:
-            span_uhr = div_uhr.find("span", class_="sb-sprite-uhr-klein")
-            if span_uhr and "style" in span_uhr.attrs:
-                style = span_uhr["style"]
-                minuto = (
-                    style.replace("background-position:", "").replace(";", "").strip()
-                )
-                gol.minuto = pos_a_minuto.get(minuto, None)
-
-        div_accion = evento.find("div", class_="sb-aktion-aktion")
-        if div_accion:
-
-            texto_limpio = div_accion.get_text(separator=" ", strip=True)
-            partes = texto_limpio.split("asistente:")
-
-            texto_gol = partes[0].strip()
-            trozos_gol = [t.strip() for t in texto_gol.split(",")]
-            gol_desc = trozos_gol[1] if len(trozos_gol) > 1 else None
-            gol.desc = gol_desc
-
-            if len(partes) > 1:
-                texto_asist = partes[1].strip()
-                trozos_asist = [t.strip() for t in texto_asist.split(",")]
-                asist_desc = trozos_asist[1] if len(trozos_asist) > 1 else None
-                if asist_desc and asist_desc.lower() != "sin asistencia":
-                    gol.desc_asist = asist_desc
-
-            enlaces = div_accion.find_all("a")
-            if len(enlaces) >= 1:
-                href = enlaces[0].get("href", "")
-                if "/spieler/" in href:
-                    gol.cod_goleador = href.split("/spieler/")[1].split("/")[0]
-
-            if len(enlaces) >= 2:
-                href_asist = enlaces[1].get("href", "")
-                if "/spieler/" in href_asist:
-                    gol.cod_asistente = href_asist.split("/spieler/")[1].split("/")[0]
-            else:
-                gol.cod_asistente = None
-        if "sb-aktion-heim" in evento["class"]:
-            goles_local.append(gol)
-        else:
-            goles_visitante.append(gol)
-
-    return goles_local, goles_visitante
-
-
-def get_cambios(soup, pos_a_minuto):
-    contenedor_cambios = soup.find("div", id="sb-wechsel")
-    cambios_local, cambios_visitante = [], []
-
-    if contenedor_cambios:
-        eventos = contenedor_cambios.find_all(
-            "li", class_=["sb-aktion-heim", "sb-aktion-gast"]
-        )
-        for evento in eventos:
-            cambio = Cambio()
-
-            div_uhr = evento.find("div", class_="sb-aktion-uhr")
-            cambio.minuto = None
-            if div_uhr:
-                span_uhr = div_uhr.find("span", class_="sb-sprite-uhr-klein")
-                if span_uhr and "style" in span_uhr.attrs:
-                    style = span_uhr["style"]
-                    minuto = (
-                        style.replace("background-position:", "")
-                        .replace(";", "")
-                        .strip()
-                    )
-                    cambio.minuto = pos_a_minuto.get(minuto, None)
-
-            div_accion = evento.find("div", class_="sb-aktion-aktion")
-            if div_accion:
-
-                ein_span = div_accion.find("span", class_="sb-aktion-wechsel-ein")
-                if ein_span:
-                    a_entrada = ein_span.find("a")
-                    if a_entrada and "href" in a_entrada.attrs:
-                        href = a_entrada["href"]
-                        if "/spieler/" in href:
-                            cambio.cod_entra = href.split("/spieler/")[1].split("/")[0]
-
-                aus_span = div_accion.find("span", class_="sb-aktion-wechsel-aus")
-                if aus_span:
-                    a_salida = aus_span.find("a")
-                    if a_salida and "href" in a_salida.attrs:
-                        href = a_salida["href"]
-                        if "/spieler/" in href:
-                            cambio.cod_fuera = href.split("/spieler/")[1].split("/")[0]
-
-                    span_desc = aus_span.find("span", class_="hide-for-small")
-                    cambio.desc = (
-                        span_desc.get_text().lstrip(", ").strip() if span_desc else None
-                    )
-
-            es_local = "sb-aktion-heim" in evento.get("class", [])
-            if es_local:
-                cambios_local.append(cambio)
-            else:
-                cambios_visitante.append(cambio)
-
-    return cambios_local, cambios_visitante
-
-
-def get_amonestaciones_local_visitante(soup, pos_a_minuto):
-    div_karten = soup.find("div", id="sb-karten")
-    if not div_karten:
-        return [], []
-
-    amonestaciones_local = []
-    amonestaciones_visitante = []
-
-    for li in div_karten.find_all("li", class_=["sb-aktion-heim", "sb-aktion-gast"]):
-        am = Amonestacion()
-
-        a_jugador = li.find("div", class_="sb-aktion-spielerbild").find("a")
-        if a_jugador and "href" in a_jugador.attrs:
-            href = a_jugador["href"]
-            if "/spieler/" in href:
-                am.cod_amonestado = href.rsplit("/", 1)[-1]
-
-        span_stand = li.find("div", class_="sb-aktion-spielstand").find("span")
-        am.amarilla = False
-        am.roja = False
-        if span_stand:
-            clases = span_stand.get("class", [])
-            if "sb-gelb" in clases:
-                am.amarilla = True
-            elif "sb-rot" in clases:
-                am.roja = True
-            elif "sb-gelbrot" in clases:
-                am.amarilla = True
-                am.roja = True
-
-        div_uhr = li.find("div", class_="sb-aktion-uhr")
-        am.minuto = None
-        if div_uhr:
-            span_uhr = div_uhr.find("span", class_="sb-sprite-uhr-klein")
-            if span_uhr and "style" in span_uhr.attrs:
-                style = span_uhr["style"]
-                minuto = (
-                    style.replace("background-position:", "").replace(";", "").strip()
-                )
-                am.minuto = pos_a_minuto.get(minuto, None)
-
-        if "sb-aktion-heim" in li.get("class", []):
-            amonestaciones_local.append(am)
-        else:
-            amonestaciones_visitante.append(am)
-
-    return amonestaciones_local, amonestaciones_visitante
-
-
-def get_penaltis_fallados(soup, pos_a_minuto):
-    div_penaltis = soup.find("div", id="sb-verschossene")
-    if not div_penaltis:
-        return []
-
-    penaltis = []
-
-    for li in div_penaltis.find_all("li", class_=["sb-aktion-heim", "sb-aktion-gast"]):
-        pf = PenaltiFallado()
-
-        div_uhr = li.find("div", class_="sb-aktion-uhr")
-        if div_uhr:
-            span_uhr = div_uhr.find("span", class_="sb-sprite-uhr-klein")
-            if span_uhr and "style" in span_uhr.attrs:
-                style = span_uhr["style"]
-                pos = style.replace("background-position:", "").replace(";", "").strip()
-                pf.minuto = pos_a_minuto.get(pos, None)
-
-        div_aus = li.find("span", class_="sb-aktion-wechsel-aus")
-        if div_aus:
-            a_portero = div_aus.find("a", href=True)
-            if a_portero and "/spieler/" in a_portero["href"]:
-                pf.cod_portero = a_portero["href"].split("spieler/", 1)[1].split("/")[0]
 
-            texto = div_aus.get_text(strip=True).lower()
-            pf.parado = "parad" in texto or "despej" in texto or "bloq" in texto
+def parsear_partido_jugado(url: str, html: str, pos_a_minuto) -> PartidoJugado:
+    return extraer_partido_jugado(
+        crear_soup(html), url.rsplit("/", 1)[-1], pos_a_minuto
+    )
 
-        penaltis.append(pf)
 
-    return penaltis
+def parsear_partido_previa(url: str, html: str) -> PartidoPrevia:
+    soup = crear_soup(html, "previa")
+    return PartidoPrevia(
+        cod_partido=url.rsplit("/", 1)[-1],
+        horario=get_fecha_y_hora(soup),
+    )
@@ -5,9 +5,9 @@ import asyncio
 import time
 import sys
 
-from typing import List
+from functools import partial
+from typing import Callable, List
 from pathlib import Path
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
@@ -16,17 +16,26 @@ from utiles.utiles_modelos import (
     Jugador,
     TargetURL,
 )
+from utiles.utiles_argumentos import argumentos
+from utiles.utiles_checkpoint import DiarioProgreso
+from utiles.utiles_parser import crear_soup, seleccionar
+from utiles.utiles_codec import decodificar
+from utiles.utiles_ndjson import EscritorNDJSON
+from utiles.utiles_parseo import parsear_en_pool
 from utiles.utiles_salida import print_cabecera
+from utiles.utiles_shards import ejecutar_en_shards
 from utiles.utiles_scraping import (
-    CHUNK_SIZE,
     ScrapedURL,
-    chunked_iterable,
     guardar_datos_json,
-    scrape_urls,
+    scrape_urls_stream,
     URLFailReason,
     URLFail,
     MAX_REINTENTOS,
+    reintentables,
     SEMAPHORE_VALUE,
+    NUM_WORKERS,
+    finalizar_scraping,
+    prioridad_por_novedad,
 )
 from jugadores.utiles_jugadores import *
 from utiles.utiles_links import *
@@ -42,17 +51,13 @@ logging.basicConfig(
     filename=f"{ruta_archivo}_jugadores.log", level=logging.INFO, format="%(message)s"
 )
 
+diario = DiarioProgreso("jugadores")
+
 
 async def scrapear_links_jugadores_t(
     links_equipos: List[str], intentos=1
 ) -> tuple[list[tuple[str, str, str]], int, int]:
     global paginas_fallidas, paginas_scrapeadas
-    if intentos > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los jugadores."
-        )
-        logging.info(f"Jugadores fallidos: {[link for link in links_equipos]}")
-        return []
     target_urls: List[TargetURL] = []
     paginas_a_reintentar: List[str] = []
     links_jugadores: List[tuple[str, str, str]] = []
@@ -65,80 +70,62 @@ async def scrapear_links_jugadores_t(
     )
 
     for link in links_equipos:
-        target_urls.append(TargetURL(url=link.replace("startseite", "kader")))
+        target_urls.append(
+            TargetURL(url=link.replace("startseite", "kader"), selector="td.hauptlink")
+        )
 
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            paginas_a_reintentar.extend(
-                links_equipos[index_chunk * CHUNK_SIZE + i] for i in range(CHUNK_SIZE)
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            paginas_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        soup = crear_soup(html, "plantilla_con_liga")
+        jugadores = seleccionar(soup, "plantilla", "enlaces")
+        if not jugadores:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener los enlaces de los jugadores.",
                 )
-                paginas_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            jugadores = soup.select("td.hauptlink a")
-            if not jugadores:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener los enlaces de los jugadores.",
+            )
+            paginas_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
+
+        for jugador in jugadores:
+            href = jugador["href"]
+            if "/profil/spieler/" in href:
+                links_jugadores.append(
+                    (
+                        "https://www.transfermarkt.es" + href,
+                        url.split("/verein/")[1].split("/")[0],
+                        get_liga(soup),
                     )
                 )
-                paginas_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            for jugador in jugadores:
-                href = jugador["href"]
-                if "/profil/spieler/" in href:
-                    links_jugadores.append(
-                        (
-                            "https://www.transfermarkt.es" + href,
-                            url.split("/verein/")[1].split("/")[0],
-                            get_liga(soup),
-                        )
-                    )
 
-            logging.info(
-                f"Scrapeados {len(links_jugadores)-num_jugadores} enlaces de jugadores del equipo {scraped_url.url}."
-            )
-            num_jugadores = len(links_jugadores)
-            num_equipos += 1
-            paginas_scrapeadas.add(url)
-    if len(paginas_a_reintentar) > 0 and intentos < MAX_REINTENTOS:
+        logging.info(
+            f"Scrapeados {len(links_jugadores)-num_jugadores} enlaces de jugadores del equipo {scraped_url.url}."
+        )
+        num_jugadores = len(links_jugadores)
+        num_equipos += 1
+        paginas_scrapeadas.add(url)
+    paginas_a_reintentar = reintentables(paginas_a_reintentar)
+    if len(paginas_a_reintentar) > 0:
         (
             links_jugadores_reintentados,
             num_jugadores_reintentados,
@@ -151,134 +138,153 @@ async def scrapear_links_jugadores_t(
 
 
 async def scrapear_jugadores(
-    links_jugadores: List[tuple[str, str, str]], intento=1
-) -> tuple[List[Jugador], List[str], int]:
+    links_jugadores: List[tuple[str, str, str]],
+    emitir: Callable[[Jugador], None],
+    intento=1,
+) -> tuple[List[str], int]:
     global paginas_fallidas, paginas_scrapeadas
     target_urls: List[TargetURL] = []
     jugadores_a_reintentar: List[tuple[str, str, str]] = []
     links_agentes: List[str] = []
-    datos_jugadores: List[Jugador] = []
     jugadores = 0
-    if intento > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los jugadores."
-        )
-        logging.info(f"Jugadores fallidos: {[link for link in links_jugadores]}")
-        return []
     logging.info(
         print_cabecera(
             f"Jugadores intento {intento}. Jugadores restantes: {len(links_jugadores)}"
         )
     )
 
+    datos_links = {link[0]: link for link in links_jugadores}
+    reanudados = diario.completados("jugadores", list(datos_links))
+    for url, registro in reanudados.items():
+        emitir(decodificar(Jugador, registro["jugador"]))
+        if registro["link_agente"]:
+            links_agentes.append(registro["link_agente"])
+        paginas_scrapeadas.add(url)
+        jugadores += 1
+    if reanudados:
+        logging.info(f"Reanudados {len(reanudados)} jugadores del diario de progreso.")
     for link in links_jugadores:
-        target_urls.append(TargetURL(url=link[0]))
+        if link[0] not in reanudados:
+            target_urls.append(
+                TargetURL(url=link[0], prioridad=prioridad_por_novedad(link[0]))
+            )
 
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
+    def trabajo(scraped_url: ScrapedURL) -> tuple:
+        _, cod_club, liga_club = datos_links[scraped_url.url]
+        return parsear_jugador, scraped_url.url, scraped_url.content, cod_club, liga_club
+
+    async for scraped_url, parseado in parsear_en_pool(
+        scrape_urls_stream(target_urls), trabajo
     ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        url = scraped_url.url
+        html = scraped_url.content
+        _, cod_club, liga_club = datos_links[url]
+
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            jugadores_a_reintentar.extend(
-                links_jugadores[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            jugadores_a_reintentar.append((url, cod_club, liga_club))
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            index = index_chunk * CHUNK_SIZE + index_scraped
-            _, cod_club, liga_club = links_jugadores[index]
-
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        jugador, link_agente = parseado or (Jugador(), "-")
+        if link_agente != "-":
+            links_agentes.append("https://www.transfermarkt.es" + link_agente)
+
+        if (
+            not jugador.cod_jugador
+            or jugador.nombre == "-"
+            or jugador.cod_club_actual == "-"
+        ):
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el jugador.",
                 )
-                jugadores_a_reintentar.append((url, cod_club, liga_club))
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            fecha_nacimiento, anho_nacimiento = get_fecha_nacimiento(soup)
-            agente, link_agente = get_agente(soup)
-            if link_agente != "-":
-                links_agentes.append("https://www.transfermarkt.es" + link_agente)
-
-            jugador: Jugador = Jugador(
-                cod_jugador=url.split("/")[-1],
-                dorsal=get_dorsal(soup),
-                apodo=get_apodo_negrita(soup, get_dorsal(soup)),
-                capitan=get_capitan(soup),
-                nombre=get_nombre(soup, get_dorsal(soup)),
-                fecha_nacimiento=fecha_nacimiento,
-                anho_nacimiento=anho_nacimiento,
-                lugar_nacimiento=get_lugar_nacimiento(soup),
-                nacionalidad=get_nacionalidades(soup),
-                altura=get_altura(soup),
-                pie=get_pie_dominante(soup),
-                posicion=get_posicion(soup),
-                posiciones_secundarias=get_posiciones_secundarias(soup),
-                cod_club_actual=cod_club,
-                liga_club_actual=liga_club,
-                agente=agente,
-                fecha_fichado=get_fecha_fichaje(soup),
-                contrato_hasta=get_contrato_hasta(soup),
-                ultima_renovacion=get_ultima_renovacion(soup),
-                club_cedente=get_club_cedente(soup),
-                contrato_hasta_cedente=get_contrato_hasta_cedente(soup),
-                opcion_cedente=get_opcion_cedente(soup),
             )
-            if (
-                not jugador.cod_jugador
-                or jugador.nombre == "-"
-                or jugador.cod_club_actual == "-"
-            ):
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el jugador.",
-                    )
-                )
-                jugadores_a_reintentar.append((url, cod_club, liga_club))
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-            paginas_scrapeadas.add(url)
-            logging.info(f"Scrapeado jugador: {jugador.nombre}")
-            datos_jugadores.append(jugador)
-            jugadores += 1
-    if len(jugadores_a_reintentar) > 0 and intento < MAX_REINTENTOS:
-        (
-            datos_jugadores_reintentados,
-            links_agentes_reintentados,
-            num_jugadores_reintentados,
-        ) = await scrapear_jugadores(jugadores_a_reintentar, intento + 1)
-        datos_jugadores.extend(datos_jugadores_reintentados)
+            jugadores_a_reintentar.append((url, cod_club, liga_club))
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
+        diario.registrar(
+            "jugadores",
+            url,
+            {
+                "jugador": jugador,
+                "link_agente": (
+                    "https://www.transfermarkt.es" + link_agente
+                    if link_agente != "-"
+                    else None
+                ),
+            },
+        )
+        paginas_scrapeadas.add(url)
+        logging.info(f"Scrapeado jugador: {jugador.nombre}")
+        emitir(jugador)
+        jugadores += 1
+    jugadores_a_reintentar = reintentables(
+        jugadores_a_reintentar, lambda jugador: jugador[0]
+    )
+    if len(jugadores_a_reintentar) > 0:
+        links_agentes_reintentados, num_jugadores_reintentados = (
+            await scrapear_jugadores(jugadores_a_reintentar, emitir, intento + 1)
+        )
         links_agentes.extend(links_agentes_reintentados)
         jugadores += num_jugadores_reintentados
     if intento == 1:
         links_agentes = list(dict.fromkeys(links_agentes))
-    return datos_jugadores, links_agentes, jugadores
+    return links_agentes, jugadores
+
+
+async def scrapear_jugadores_shard(
+    links_jugadores: List[tuple[str, str, str]], diario_activo: bool = False
+) -> tuple[List[Jugador], List[str], int, List[URLFail], set]:
+    datos_jugadores: List[Jugador] = []
+    if diario_activo:
+        diario.iniciar(reanudar=True)
+    try:
+        links_agentes, jugadores = await scrapear_jugadores(
+            links_jugadores, datos_jugadores.append
+        )
+    finally:
+        await finalizar_scraping()
+    return datos_jugadores, links_agentes, jugadores, paginas_fallidas, paginas_scrapeadas
+
+
+async def scrapear_jugadores_en_shards(
+    links_jugadores: List[tuple[str, str, str]],
+    num_shards: int,
+    emitir: Callable[[Jugador], None],
+) -> tuple[List[str], int]:
+    global paginas_fallidas, paginas_scrapeadas
+    links_agentes: List[str] = []
+    jugadores = 0
+    for (
+        datos_shard,
+        links_agentes_shard,
+        jugadores_shard,
+        fallidas_shard,
+        scrapeadas_shard,
+    ) in await ejecutar_en_shards(
+        partial(scrapear_jugadores_shard, diario_activo=diario.activo),
+        links_jugadores,
+        num_shards,
+    ):
+        for jugador in datos_shard:
+            emitir(jugador)
+        links_agentes.extend(links_agentes_shard)
+        jugadores += jugadores_shard
+        paginas_fallidas.extend(fallidas_shard)
+        paginas_scrapeadas.update(scrapeadas_shard)
+    return list(dict.fromkeys(links_agentes)), jugadores
 
 
 async def procesar_jugadores():
@@ -305,10 +311,21 @@ async def procesar_jugadores():
         )
     )
     logging.info(print_cabecera("Scraping de jugadores"))
-    datos_jugadores, links_agentes, jugadores = await scrapear_jugadores(
-        links_jugadores
+    salida = EscritorNDJSON(
+        f"{ruta_archivo_datos}datos_jugadores",
+        f"{ruta_archivo}datos_jugadores",
+        instantanea=True,
     )
-    if not datos_jugadores:
+    if argumentos.shards > 1:
+        links_agentes, jugadores = await scrapear_jugadores_en_shards(
+            links_jugadores, argumentos.shards, salida.escribir
+        )
+    else:
+        links_agentes, jugadores = await scrapear_jugadores(
+            links_jugadores, salida.escribir
+        )
+    if not jugadores:
+        salida.abandonar()
         logging.error("No se han podido obtener los datos de los jugadores.")
         return
     logging.info(
@@ -319,28 +336,35 @@ async def procesar_jugadores():
 
     logging.info(print_cabecera("Estadísticas de scraping"))
     logging.info(f"\nPáginas únicas scrapeadas: {len(paginas_scrapeadas)}")
-    logging.info(f"\nAsyncio semaphore: {SEMAPHORE_VALUE}")
-    logging.info(f"\nTamaño del chunk: {CHUNK_SIZE}")
+    logging.info(f"\nConcurrencia inicial: {SEMAPHORE_VALUE}")
+    logging.info(f"\nWorkers de descarga: {NUM_WORKERS}")
     logging.info(f"\nPáginas fallidas: {len(paginas_fallidas)}")
+    for linea in diario.estadisticas():
+        logging.info(linea)
     for i in range(1, MAX_REINTENTOS + 1):
         logging.info(print_cabecera(f"Reintento {i}"))
         for pagina in paginas_fallidas:
             if pagina.attempt == i:
                 logging.info(f"· {pagina.reason} | {pagina.url} | {pagina.message}")
-    guardar_datos_json(datos_jugadores, f"{ruta_archivo_datos}datos_jugadores")
-    guardar_datos_json(links_agentes, f"{ruta_archivo_datos}links_representantes")
-    guardar_datos_json(datos_jugadores, f"{ruta_archivo}datos_jugadores")
-    guardar_datos_json(links_agentes, f"{ruta_archivo}links_representantes")
+    salida.cerrar()
+    guardar_datos_json(
+        links_agentes,
+        f"{ruta_archivo_datos}links_representantes",
+        f"{ruta_archivo}links_representantes",
+    )
+    diario.finalizar()
 
 
 async def main():
     start_time = time.time()
 
     try:
+        diario.iniciar(argumentos.reanudar)
         await procesar_jugadores()
     except Exception as e:
         logging.error(f"Error en la ejecución: {e}")
     finally:
+        await finalizar_scraping()
         end_time = time.time()
         minutes, seconds = divmod(end_time - start_time, 60)
         logging.info(
@@ -1,80 +1,114 @@
 import json
 import re
-from utiles.utiles_modelos import Fichaje, Incidencia, ValorMercado
-
-
-def safe_find_text(soup, selector, default="-"):
-    try:
-        return soup.select_one(selector).text.strip()
-    except:
-        return default
-
-
-def safe_find_attr(soup, selector, attr, default="-"):
-    try:
-        return soup.select_one(selector)[attr].strip()
-    except:
-        return default
-
-
-def get_dorsal(soup):
-    return safe_find_text(soup, "span.data-header__shirt-number").replace("#", "")
-
-
-def get_apodo(soup, dorsal):
-    texto = safe_find_text(soup, "h1.data-header__headline-wrapper")
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from bs4 import Tag
+from utiles.utiles_modelos import Fichaje, Incidencia, Jugador, ValorMercado
+from utiles.utiles_parser import crear_soup
+
+
+@dataclass
+class IndicePerfil:
+    etiquetas: Dict[str, Tag] = field(default_factory=dict)
+    cabecera: Dict[str, Tag] = field(default_factory=dict)
+
+    def etiqueta(self, texto: str, parcial: bool = False) -> Optional[Tag]:
+        if not parcial:
+            return self.etiquetas.get(texto)
+        for clave, span in self.etiquetas.items():
+            if texto in clave:
+                return span
+        return None
+
+    def valor(self, texto: str, parcial: bool = False) -> Optional[Tag]:
+        label = self.etiqueta(texto, parcial)
+        return label.find_next_sibling("span") if label else None
+
+    def texto_cabecera(self, nombre: str, default="-") -> str:
+        tag = self.cabecera.get(nombre)
+        return tag.text.strip() if tag else default
+
+
+def indexar_perfil(soup) -> IndicePerfil:
+    indice = IndicePerfil()
+    for tag in soup.find_all(True):
+        clases = tag.get("class") or ()
+        if tag.name == "span":
+            if "data-header__shirt-number" in clases:
+                indice.cabecera.setdefault("dorsal", tag)
+            texto = tag.string
+            if texto and texto.strip():
+                indice.etiquetas.setdefault(texto.strip(), tag)
+        elif tag.name == "h1" and "data-header__headline-wrapper" in clases:
+            indice.cabecera.setdefault("titulo", tag)
+            apodo = tag.find("strong")
+            if apodo:
+                indice.cabecera.setdefault("apodo", apodo)
+        elif tag.name == "img" and "Capitán" in (tag.get("alt"), tag.get("title")):
+            indice.cabecera.setdefault("capitan", tag)
+        elif tag.name == "a" and "data-header__market-value-wrapper" in clases:
+            indice.cabecera.setdefault("valor_mercado", tag)
+        elif tag.name == "div" and "detail-position__position" in clases:
+            indice.cabecera.setdefault("posiciones", tag)
+    return indice
+
+
+def get_dorsal(indice: IndicePerfil):
+    return indice.texto_cabecera("dorsal").replace("#", "")
+
+
+def get_apodo(indice: IndicePerfil, dorsal):
+    texto = indice.texto_cabecera("titulo")
     return texto.replace(f"#{dorsal}", "").strip() if dorsal in texto else texto
 
 
-def get_apodo_negrita(soup, dorsal):
-    apodo_bold = safe_find_text(soup, "h1.data-header__headline-wrapper strong")
-    return apodo_bold if apodo_bold != "-" else get_apodo(soup, dorsal)
+def get_apodo_negrita(indice: IndicePerfil, dorsal):
+    apodo_bold = indice.texto_cabecera("apodo")
+    return apodo_bold if apodo_bold != "-" else get_apodo(indice, dorsal)
 
 
-def get_capitan(soup):
-    return 1 if soup.select_one("img[alt='Capitán'], img[title='Capitán']") else 0
+def get_capitan(indice: IndicePerfil):
+    return 1 if "capitan" in indice.cabecera else 0
 
 
-def get_nombre(soup, dorsal):
+def get_nombre(indice: IndicePerfil, dorsal):
     try:
-        opciones = {"Nombre en país de origen:", "Nombre completo:" "Nombre:"}
-        label = soup.find("span", string=lambda s: s in opciones)
+        opciones = {"Nombre en país de origen:", "Nombre completo:", "Nombre:"}
+        label = next(
+            span for texto, span in indice.etiquetas.items() if texto in opciones
+        )
         nombre_tag = label.find_next_sibling(
             "span", class_="info-table__content info-table__content--bold"
         )
         if nombre_tag:
             nombre = nombre_tag.text.strip()
             if re.search(r"[^\u0000-\u00FF]", nombre):
-                apodo = get_apodo(soup, dorsal)
-                return apodo
+                return get_apodo(indice, dorsal)
             return nombre
         else:
-            return get_apodo(soup, dorsal)
+            return get_apodo(indice, dorsal)
     except:
-        return get_apodo(soup, dorsal)
+        return get_apodo(indice, dorsal)
 
 
-def get_fecha_nacimiento(soup):
+def get_fecha_nacimiento(indice: IndicePerfil):
     try:
-        label = soup.find("span", string=lambda t: "F. Nacim./Edad:" in t)
-        fecha_tag = label.find_next_sibling("span").find("a")
+        valor = indice.valor("F. Nacim./Edad:", parcial=True)
+        fecha_tag = valor.find("a")
         if fecha_tag:
             fecha = fecha_tag.text.strip().split(" ")[0]
             anho = fecha.split("/")[-1]
         else:
-            fecha_span = label.find_next_sibling("span")
-            texto = fecha_span.get_text(strip=True)
             fecha = "-"
-            anho = texto.split("(")[0].strip()
+            anho = valor.get_text(strip=True).split("(")[0].strip()
         return fecha, anho
     except:
         return "-", "-"
 
 
-def get_lugar_nacimiento(soup):
+def get_lugar_nacimiento(indice: IndicePerfil):
     try:
-        label = soup.find("span", string="Lugar de nac.:")
-        lugar_span = label.find_next_sibling("span").find("span")
+        lugar_span = indice.valor("Lugar de nac.:").find("span")
         img = lugar_span.find("img")
         ciudad = lugar_span.get_text(strip=True)
         pais = img["title"].strip()
@@ -83,68 +117,44 @@ def get_lugar_nacimiento(soup):
         return "-"
 
 
-def get_nacionalidades(soup):
+def get_nacionalidades(indice: IndicePerfil):
     try:
-        label = soup.find("span", string="Nacionalidad:")
-        span = label.find_next_sibling("span")
+        span = indice.valor("Nacionalidad:")
         return [img["title"] for img in span.find_all("img")]
     except:
         return []
 
 
-def get_altura(soup):
+def get_texto_valor(indice: IndicePerfil, texto: str, parcial: bool = False):
     try:
-        label = soup.find("span", string="Altura:")
-        altura_span = label.find_next_sibling("span")
-        return altura_span.text.strip()
+        return indice.valor(texto, parcial).text.strip()
     except:
         return "-"
 
 
-def get_pie_dominante(soup):
+def get_posiciones_secundarias(indice: IndicePerfil):
     try:
-        label = soup.find("span", string="Pie:")
-        pie_span = label.find_next_sibling("span")
-        return pie_span.text.strip()
-    except:
-        return "-"
-
-
-def get_posicion(soup):
-    try:
-        label = soup.find("span", string="Posición:")
-        pos_span = label.find_next_sibling("span")
-        return pos_span.text.strip()
-    except:
-        return "-"
-
-
-def get_posiciones_secundarias(soup):
-    try:
-        contenedor = soup.find("div", class_="detail-position__position")
-        elementos = contenedor.find_all("dd", class_="detail-position__position")
+        elementos = indice.cabecera["posiciones"].find_all(
+            "dd", class_="detail-position__position"
+        )
         return [e.get_text(strip=True) for e in elementos]
     except:
         return []
 
 
-def get_valor_mercado(soup):
-    try:
-        valor = safe_find_text(soup, "a.data-header__market-value-wrapper")
-        return valor.split("\n")[0]
-    except:
-        return "-"
+def get_valor_mercado(indice: IndicePerfil):
+    return indice.texto_cabecera("valor_mercado").split("\n")[0]
 
 
-def get_agente(soup):
+def get_agente(indice: IndicePerfil):
     try:
-        label = soup.find("span", string=lambda t: "Agente:" in t)
-        span = label.find_next_sibling("span")
+        span = indice.valor("Agente:", parcial=True)
         a = span.find("a")
         if a:
+            span_titulo = a.find("span")
             title = (
-                a.find("span").get("title")
-                if a.find("span") and a.find("span").get("title")
+                span_titulo.get("title")
+                if span_titulo and span_titulo.get("title")
                 else a.get("title") if a.get("title") else a.text.strip()
             )
             href = a.get("href", "-")
@@ -155,64 +165,21 @@ def get_agente(soup):
         return "-", "-"
 
 
-def get_fecha_fichaje(soup):
+def get_club_cedente(indice: IndicePerfil):
     try:
-        label = soup.find("span", string=lambda t: "Fichado:" in t)
-        fichado = label.find_next_sibling("span").text.strip() if label else "-"
-        return fichado
+        return indice.valor("Prestado de:", parcial=True).find("a").text.strip()
     except:
         return "-"
 
 
-def get_contrato_hasta(soup):
-    try:
-        label = soup.find("span", string=lambda t: "Contrato hasta:" in t)
-        contrato = label.find_next_sibling("span").text.strip() if label else "-"
-        return contrato
-    except:
-        return "-"
-
-
-def get_ultima_renovacion(soup):
-    try:
-        label = soup.find("span", string=lambda t: "Última renovación:" in t)
-        renovacion = label.find_next_sibling("span").text.strip() if label else "-"
-        return renovacion
-    except:
-        return "-"
-
-
-def get_club_cedente(soup):
-    try:
-        label = soup.find("span", string=lambda t: "Prestado de:" in t)
-        club = label.find_next_sibling("span").find("a").text.strip() if label else "-"
-        return club
-    except:
-        return "-"
+def get_opcion_cedente(indice: IndicePerfil):
+    label = indice.etiqueta("Opción de compra", parcial=True)
+    return label.text.strip() if label else "-"
 
 
-def get_contrato_hasta_cedente(soup):
+def get_valores_mercado(contenido: str):
     try:
-        label = soup.find("span", string=lambda t: "Contrato allí hasta:" in t)
-        contrato_alli = label.find_next_sibling("span").text.strip() if label else "-"
-        return contrato_alli
-    except:
-        return "-"
-
-
-def get_opcion_cedente(soup):
-    try:
-        label = soup.find("span", string=lambda t: "Opción de compra" in t)
-        return label.text.strip() if label else "-"
-    except:
-        return "-"
-
-
-def get_valores_mercado(soup):
-    try:
-        pre = soup.find("pre")
-
-        data = json.loads(pre.get_text())
+        data = json.loads(contenido)
         valor_mercado_actual = ValorMercado(
             valor=data.get("current", "-"), fecha=data.get("last_change", "-")
         )
@@ -222,3 +189,39 @@ def get_valores_mercado(soup):
         return valor_mercado_actual, valor_mercado_maximo
     except:
         return []
+
+
+def parsear_jugador(
+    url: str, html: str, cod_club: str = "-", liga_club: str = "-"
+) -> tuple[Jugador, str]:
+    indice = indexar_perfil(crear_soup(html, "perfil"))
+    dorsal = get_dorsal(indice)
+    fecha_nacimiento, anho_nacimiento = get_fecha_nacimiento(indice)
+    agente, link_agente = get_agente(indice)
+    jugador: Jugador = Jugador(
+        cod_jugador=url.split("/")[-1],
+        dorsal=dorsal,
+        apodo=get_apodo_negrita(indice, dorsal),
+        capitan=get_capitan(indice),
+        nombre=get_nombre(indice, dorsal),
+        fecha_nacimiento=fecha_nacimiento,
+        anho_nacimiento=anho_nacimiento,
+        lugar_nacimiento=get_lugar_nacimiento(indice),
+        nacionalidad=get_nacionalidades(indice),
+        altura=get_texto_valor(indice, "Altura:"),
+        pie=get_texto_valor(indice, "Pie:"),
+        posicion=get_texto_valor(indice, "Posición:"),
+        posiciones_secundarias=get_posiciones_secundarias(indice),
+        cod_club_actual=cod_club,
+        liga_club_actual=liga_club,
+        agente=agente,
+        fecha_fichado=get_texto_valor(indice, "Fichado:", parcial=True),
+        contrato_hasta=get_texto_valor(indice, "Contrato hasta:", parcial=True),
+        ultima_renovacion=get_texto_valor(indice, "Última renovación:", parcial=True),
+        club_cedente=get_club_cedente(indice),
+        contrato_hasta_cedente=get_texto_valor(
+            indice, "Contrato allí hasta:", parcial=True
+        ),
+        opcion_cedente=get_opcion_cedente(indice),
+    )
+    return jugador, link_agente
@@ -7,21 +7,23 @@ import sys
 
 from typing import List
 from pathlib import Path
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from utiles.utiles_modelos import TargetURL, Liga
+from utiles.utiles_parser import crear_soup
 from utiles.utiles_salida import print_cabecera
 from utiles.utiles_scraping import (
     ScrapedURL,
-    chunked_iterable,
     guardar_datos_json,
-    scrape_urls,
+    scrape_urls_stream,
     URLFailReason,
     URLFail,
     MAX_REINTENTOS,
+    reintentables,
     SEMAPHORE_VALUE,
+    NUM_WORKERS,
+    finalizar_scraping,
 )
 from utiles_liga import *
 from utiles.utiles_links import LinksLigas
@@ -30,9 +32,6 @@ from utiles.utiles_links import LinksLigas
 paginas_fallidas: List[URLFail] = []
 paginas_scrapeadas = set()
 
-CHUNK_SIZE_LIGA = 7
-
-
 nombre_carpeta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
 ruta_archivo = f"{nombre_carpeta}/{datetime.now().strftime('%d-%m-%y_%H-%M')}"
 ruta_archivo_datos = f"{nombre_carpeta}/"
@@ -52,12 +51,6 @@ async def scrapear_ligas(ligas_a_scrapear=None, intento=1) -> tuple[List[Liga],
     target_urls: List[TargetURL] = []
     ligas_a_reintentar: List[str] = []
     num_ligas = 0
-    if intento > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para las ligas."
-        )
-        logging.info(f"Ligas fallidas: {[liga for liga in ligas_a_scrapear]}")
-        return []
     logging.info(
         print_cabecera(
             f"Ligas intento {intento}. Ligas restantes: {len(ligas_a_scrapear)}"
@@ -67,80 +60,58 @@ async def scrapear_ligas(ligas_a_scrapear=None, intento=1) -> tuple[List[Liga],
     for link in ligas_a_scrapear:
         target_urls.append(TargetURL(url=link))
 
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE_LIGA), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            ligas_a_reintentar.extend(
-                ligas_a_scrapear[index_chunk * CHUNK_SIZE_LIGA + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            ligas_a_reintentar.append(url)
+            logging.info(f"Fallida {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                ligas_a_reintentar.append(url)
-                logging.info(f"Fallida {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            division, grupo = get_division_grupo(soup)
-
-            liga = Liga(
-                cod_grupo=url.split("/")[-1],
-                temporada=get_temporada(soup),
-                division=division,
-                grupo=grupo,
-            )
+        soup = crear_soup(html)
+        division, grupo = get_division_grupo(soup)
 
-            if (
-                not liga.cod_grupo
-                or liga.division == "-"
-                or liga.temporada == "-"
-                or liga.grupo == "-"
-            ):
-                logging.info(f"Fallida {url}. A reintentar...")
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener la liga.",
-                    )
+        liga = Liga(
+            cod_grupo=url.split("/")[-1],
+            temporada=get_temporada(soup),
+            division=division,
+            grupo=grupo,
+        )
+
+        if (
+            not liga.cod_grupo
+            or liga.division == "-"
+            or liga.temporada == "-"
+            or liga.grupo == "-"
+        ):
+            logging.info(f"Fallida {url}. A reintentar...")
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener la liga.",
                 )
-                ligas_a_reintentar.append(url)
-                continue
-            paginas_scrapeadas.add(url)
-            logging.info(
-                f"Scrapeada liga: {liga.division}, {liga.grupo}, temporada {liga.temporada}"
             )
-            datos_ligas.append(liga)
-            num_ligas += 1
-    if len(ligas_a_reintentar) > 0 and intento < MAX_REINTENTOS:
+            ligas_a_reintentar.append(url)
+            continue
+        paginas_scrapeadas.add(url)
+        logging.info(
+            f"Scrapeada liga: {liga.division}, {liga.grupo}, temporada {liga.temporada}"
+        )
+        datos_ligas.append(liga)
+        num_ligas += 1
+    ligas_a_reintentar = reintentables(ligas_a_reintentar)
+    if len(ligas_a_reintentar) > 0:
         datos_ligas_reintentadas, num_ligas_reintentadas = await scrapear_ligas(
             ligas_a_reintentar, intento + 1
         )
@@ -159,16 +130,20 @@ async def procesar_ligas():
     logging.info(f"Scrapeadas ligas: {num_ligas}")
     logging.info(print_cabecera("Estadísticas de scraping"))
     logging.info(f"\nPáginas únicas scrapeadas: {len(paginas_scrapeadas)}")
-    logging.info(f"\nAsyncio semaphore: {SEMAPHORE_VALUE}")
-    logging.info(f"\nTamaño del chunk: {CHUNK_SIZE_LIGA}")
+    logging.info(f"\nConcurrencia inicial: {SEMAPHORE_VALUE}")
+    logging.info(f"\nWorkers de descarga: {NUM_WORKERS}")
     logging.info(f"\nPáginas fallidas: {len(paginas_fallidas)}")
     for i in range(1, MAX_REINTENTOS + 1):
         logging.info(print_cabecera(f"Reintento {i}"))
         for pagina in paginas_fallidas:
             if pagina.attempt == i:
                 logging.info(f"· {pagina.reason} | {pagina.url} | {pagina.message}")
-    guardar_datos_json(datos_ligas, f"{ruta_archivo_datos}datos_ligas")
-    guardar_datos_json(datos_ligas, f"{ruta_archivo}datos_ligas")
+    guardar_datos_json(
+        datos_ligas,
+        f"{ruta_archivo_datos}datos_ligas",
+        f"{ruta_archivo}datos_ligas",
+        instantanea=True,
+    )
 
 
 async def main():
@@ -179,6 +154,7 @@ async def main():
     except Exception as e:
         logging.error(f"Error en la ejecución: {e}")
     finally:
+        await finalizar_scraping()
         end_time = time.time()
         minutes, seconds = divmod(end_time - start_time, 60)
         logging.info(
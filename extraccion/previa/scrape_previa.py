@@ -7,7 +7,6 @@ import sys
 
 from typing import List
 from pathlib import Path
-from bs4 import BeautifulSoup
 from datetime import datetime
 
 
@@ -21,19 +20,20 @@ from insercion.utiles.utiles_db import (
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from jornada.utiles_jornada import get_fecha_y_hora
+from jornada.utiles_jornada import SELECTORES_PREVIA, parsear_partido_previa
 from utiles.utiles_modelos import PartidoJugado, PartidoPrevia, TargetURL
 from utiles.utiles_salida import print_cabecera
 from utiles.utiles_scraping import (
-    CHUNK_SIZE,
     ScrapedURL,
-    chunked_iterable,
     guardar_datos_json,
-    scrape_urls,
+    scrape_urls_stream,
     URLFailReason,
     URLFail,
     MAX_REINTENTOS,
+    reintentables,
     SEMAPHORE_VALUE,
+    NUM_WORKERS,
+    finalizar_scraping,
 )
 from utiles.utiles_links import paginas_fallidas, paginas_scrapeadas
 
@@ -64,12 +64,6 @@ async def scrapear_partidos(
     partidos_a_reintentar: List[str] = []
     datos_partidos: List[PartidoPrevia] = []
     partidos = 0
-    if intento > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para la jornada."
-        )
-        logging.info(f"Partidos fallidos: {[link for link in links_partidos]}")
-        return []
     logging.info(
         print_cabecera(
             f"Horarios de la proxima jornada intento {intento}. Partidos restantes: {len(links_partidos)}"
@@ -77,71 +71,49 @@ async def scrapear_partidos(
     )
 
     for link in links_partidos:
-        target_urls.append(TargetURL(url=link))
-
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-            partidos_a_reintentar.extend(
-                links_partidos[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
+        target_urls.append(
+            TargetURL(
+                url=link, selector="div.sb-team", fragmentos=SELECTORES_PREVIA
             )
-            logging.info(f"Batch {index_chunk} fallido")
-            continue
+        )
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-                partidos_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            partido = PartidoPrevia(
-                cod_partido=url.rsplit("/", 1)[-1],
-                horario=get_fecha_y_hora(soup),
             )
+            partidos_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
+
+        partido = parsear_partido_previa(url, html)
 
-            if not partido.cod_partido or not partido.horario:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intento,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el partido.",
-                    )
+        if not partido.cod_partido or not partido.horario:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intento,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el partido.",
                 )
-                partidos_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-            paginas_scrapeadas.add(url)
-            logging.info(f"Scrapeados horario de partido: {partido.cod_partido}")
-            datos_partidos.append(partido)
-            partidos += 1
-    if len(partidos_a_reintentar) > 0 and intento < MAX_REINTENTOS:
+            )
+            partidos_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
+        paginas_scrapeadas.add(url)
+        logging.info(f"Scrapeados horario de partido: {partido.cod_partido}")
+        datos_partidos.append(partido)
+        partidos += 1
+    partidos_a_reintentar = reintentables(partidos_a_reintentar)
+    if len(partidos_a_reintentar) > 0:
         datos_partidos_reintentados, num_partidos_reintentados = (
             await scrapear_partidos(partidos_a_reintentar, intento + 1)
         )
@@ -201,16 +173,20 @@ async def procesar_calendarios():
     )
     logging.info(print_cabecera("Estadísticas de scraping"))
     logging.info(f"\nPáginas únicas scrapeadas: {len(paginas_scrapeadas)}")
-    logging.info(f"\nAsyncio semaphore: {SEMAPHORE_VALUE}")
-    logging.info(f"\nTamaño del chunk: {CHUNK_SIZE}")
+    logging.info(f"\nConcurrencia inicial: {SEMAPHORE_VALUE}")
+    logging.info(f"\nWorkers de descarga: {NUM_WORKERS}")
     logging.info(f"\nPáginas fallidas: {len(paginas_fallidas)}")
     for i in range(1, MAX_REINTENTOS + 1):
         logging.info(print_cabecera(f"Reintento {i}"))
         for pagina in paginas_fallidas:
             if pagina.attempt == i:
                 logging.info(f"· {pagina.reason} | {pagina.url} | {pagina.message}")
-    guardar_datos_json(datos_partidos, f"{ruta_archivo_datos}datos_horarios_jornada")
-    guardar_datos_json(datos_partidos, f"{ruta_archivo}datos_horarios_jornada")
+    guardar_datos_json(
+        datos_partidos,
+        f"{ruta_archivo_datos}datos_horarios_jornada",
+        f"{ruta_archivo}datos_horarios_jornada",
+        instantanea=True,
+    )
 
 
 async def main():
@@ -221,6 +197,7 @@ async def main():
     except Exception as e:
         logging.error(f"Error en la ejecución: {e}")
     finally:
+        await finalizar_scraping()
         end_time = time.time()
         minutes, seconds = divmod(end_time - start_time, 60)
         logging.info(
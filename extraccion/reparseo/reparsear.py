@@ -0,0 +1,116 @@
+# coding=utf-8
+import argparse
+import os
+import logging
+import time
+import sys
+
+from pathlib import Path
+from datetime import datetime
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from calendarios.utiles_calendarios import parsear_partido_calendario
+from historico.utiles_historico import extraer_fichajes_desde_pre
+from jornada.utiles_jornada import (
+    cargar_diccionario_posicion_a_minuto,
+    parsear_partido_jugado,
+    parsear_partido_previa,
+)
+from jugadores.utiles_jugadores import get_valores_mercado, parsear_jugador
+from representantes.utiles_representantes import parsear_agente
+from utiles.utiles_archivo import ArchivoPaginas
+from utiles.utiles_modelos import HistoricoFichajes, JugadorValorMercado
+from utiles.utiles_ndjson import EscritorNDJSON
+from utiles.utiles_salida import print_cabecera
+
+nombre_carpeta = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+ruta_archivo = f"{nombre_carpeta}/{datetime.now().strftime('%d-%m-%y_%H-%M')}"
+os.makedirs(nombre_carpeta, exist_ok=True)
+
+
+logging.basicConfig(
+    filename=f"{ruta_archivo}_reparseo.log", level=logging.INFO, format="%(message)s"
+)
+
+
+def parsear_valores_mercado(url: str, html: str) -> JugadorValorMercado:
+    valor_actual, valor_maximo = get_valores_mercado(html)
+    return JugadorValorMercado(
+        cod_jugador=url.split("/")[-1],
+        valor_mercado_actual=valor_actual,
+        valor_mercado_maximo=valor_maximo,
+    )
+
+
+def parsear_historico(url: str, html: str) -> HistoricoFichajes:
+    return HistoricoFichajes(
+        cod_jugador=url.split("/")[-1], fichajes=extraer_fichajes_desde_pre(html)
+    )
+
+
+def parsear_jornada(url: str, html: str):
+    return parsear_partido_jugado(url, html, cargar_diccionario_posicion_a_minuto())
+
+
+PARSERS_POR_ETAPA = {
+    "jugadores": (["perfil"], lambda url, html: parsear_jugador(url, html)[0]),
+    "calendarios": (["partido"], parsear_partido_calendario),
+    "jornada": (["partido"], parsear_jornada),
+    "previa": (["partido"], parsear_partido_previa),
+    "representantes": (["agente"], parsear_agente),
+    "historico": (["historico"], parsear_historico),
+    "valores_mercado": (["valor_mercado"], parsear_valores_mercado),
+}
+
+
+def reparsear(etapa: str, desde: float = None, todas: bool = False):
+    tipos, parser = PARSERS_POR_ETAPA[etapa]
+    archivo = ArchivoPaginas()
+    entradas = (
+        archivo.iterar_entradas(tipos=tipos, desde=desde)
+        if todas
+        else archivo.entradas(tipos=tipos, desde=desde)
+    )
+    logging.info(print_cabecera(f"Reparseando páginas archivadas ({etapa})"))
+    fallidas = 0
+    with EscritorNDJSON(f"{ruta_archivo}reparseo_{etapa}") as salida:
+        for entrada, contenido in archivo.leer(entradas):
+            try:
+                salida.escribir(parser(entrada.url, contenido))
+            except Exception as e:
+                fallidas += 1
+                logging.error(f"Error reparseando {entrada.url}: {e}")
+    logging.info(f"\nRegistros obtenidos: {salida.registros}")
+    logging.info(f"\nPáginas con error: {fallidas}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Vuelve a ejecutar el parser de una etapa sobre las páginas archivadas, sin acceder a la red."
+    )
+    parser.add_argument("etapa", choices=sorted(PARSERS_POR_ETAPA))
+    parser.add_argument(
+        "--desde", help="Solo páginas descargadas a partir de esta fecha (AAAA-MM-DD)."
+    )
+    parser.add_argument(
+        "--todas",
+        action="store_true",
+        help="Reparsea todas las versiones archivadas de cada URL, no solo la última.",
+    )
+    args = parser.parse_args()
+    desde = datetime.strptime(args.desde, "%Y-%m-%d").timestamp() if args.desde else None
+
+    start_time = time.time()
+    try:
+        reparsear(args.etapa, desde, args.todas)
+    except Exception as e:
+        logging.error(f"Error en la ejecución: {e}")
+    finally:
+        minutes, seconds = divmod(time.time() - start_time, 60)
+        logging.info(
+            f"\nTiempo total de ejecución: {int(minutes)} minutos y {seconds:.2f} segundos"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import re
+from utiles.utiles_modelos import Agente
+from utiles.utiles_parser import crear_soup
 
 
 def get_nombre_agencia(soup) -> str:
@@ -124,3 +126,15 @@ def get_direccion_agencia(soup) -> tuple[str, str, str, str]:
         return calle, codigo_postal, ubicacion, pais
     except:
         return "-", "-", "-", "-"
+
+
+def parsear_agente(url: str, html: str) -> Agente:
+    soup = crear_soup(html)
+    calle, codigo_postal, localidad, pais = get_direccion_agencia(soup)
+    return Agente(
+        nombre=get_nombre_agencia(soup),
+        telefono=get_telefono_agencia(soup),
+        email=get_email_agencia(soup),
+        web=get_pagina_web_agencia(soup),
+        direccion=calle + " " + codigo_postal + " " + localidad + " " + pais,
+    )
@@ -0,0 +1,133 @@
+# coding=utf-8
+import argparse
+import gc
+import sys
+import tracemalloc
+
+from dataclasses import field, fields, is_dataclass, make_dataclass
+from pathlib import Path
+from typing import get_args, get_origin, get_type_hints
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utiles.utiles_codec import cargar, codificar, decodificador
+from utiles.utiles_modelos import (
+    HistoricoFichajes,
+    Jugador,
+    PartidoCalendario,
+    PartidoJugado,
+)
+from utiles.utiles_ndjson import leer_registros
+from utiles.utiles_salida import print_cabecera
+
+DIRECTORIO_EXTRACCION = Path(__file__).resolve().parent.parent
+
+CONJUNTOS = {
+    "jugadores": ("jugadores/resultados/datos_jugadores.ndjson", Jugador),
+    "historico": (
+        "historico/resultados/datos_historico_jugadores.ndjson",
+        HistoricoFichajes,
+    ),
+    "partidos": ("jornada/resultados/datos_partidos_jornada.ndjson", PartidoJugado),
+    "calendario": (
+        "calendarios/resultados/datos_partidos_calendario.ndjson",
+        PartidoCalendario,
+    ),
+}
+
+
+def variante_con_dict(tipo, variantes: dict):
+    if tipo not in variantes:
+        anotaciones = get_type_hints(tipo)
+        variantes[tipo] = make_dataclass(
+            tipo.__name__,
+            [
+                (
+                    campo.name,
+                    sustituir_anotacion(anotaciones[campo.name], variantes),
+                    field(default=campo.default),
+                )
+                for campo in fields(tipo)
+            ],
+        )
+    return variantes[tipo]
+
+
+def sustituir_anotacion(anotacion, variantes: dict):
+    if isinstance(anotacion, type) and is_dataclass(anotacion):
+        return variante_con_dict(anotacion, variantes)
+    origen = get_origin(anotacion)
+    argumentos = get_args(anotacion)
+    if origen in (list, tuple) and argumentos:
+        return origen[
+            tuple(sustituir_anotacion(argumento, variantes) for argumento in argumentos)
+        ]
+    return anotacion
+
+
+def cargar_lineas(ruta: Path, limite: int = None) -> list[bytes]:
+    lineas = []
+    for registro in leer_registros(ruta):
+        lineas.append(codificar(registro))
+        if limite and len(lineas) >= limite:
+            break
+    return lineas
+
+
+def medir(lineas: list[bytes], convertir) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    registros = [convertir(cargar(linea)) for linea in lineas]
+    actual, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registros
+    gc.collect()
+    return actual, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compara la memoria por registro de los modelos con __dict__, con slots y con cadenas internadas."
+    )
+    parser.add_argument(
+        "--conjuntos",
+        nargs="+",
+        choices=list(CONJUNTOS),
+        default=list(CONJUNTOS),
+    )
+    parser.add_argument("--limite", type=int, help="Número máximo de registros.")
+    args = parser.parse_args()
+
+    variantes = {}
+    for nombre in args.conjuntos:
+        ruta, tipo = CONJUNTOS[nombre]
+        ruta = DIRECTORIO_EXTRACCION / ruta
+        try:
+            lineas = cargar_lineas(ruta, args.limite)
+        except FileNotFoundError:
+            print(f"\nSin datos para {nombre}: {ruta}")
+            continue
+        if not lineas:
+            continue
+
+        configuraciones = {
+            "Dataclass con __dict__": decodificador(
+                variante_con_dict(tipo, variantes), False
+            ),
+            "Diccionarios": lambda registro: registro,
+            "Slots": decodificador(tipo, False),
+            "Slots + cadenas internadas": decodificador(tipo),
+        }
+        print(print_cabecera(f"{nombre}: {len(lineas)} registros de {tipo.__name__}"))
+        base = None
+        for configuracion, convertir in configuraciones.items():
+            actual, pico = medir(lineas, convertir)
+            por_registro = actual / len(lineas)
+            base = base or por_registro
+            print(
+                f"{configuracion}: {actual / 1024 / 1024:.2f} MiB, {por_registro:.0f} B/registro "
+                f"({(1 - por_registro / base) * 100:.1f}% menos que con __dict__), pico {pico / 1024 / 1024:.2f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import json
+import logging
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import groupby
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from utiles.utiles_cache import tipo_pagina
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DIRECTORIO_ARCHIVO = Path(__file__).resolve().parent.parent / "archivo_paginas"
+NOMBRE_INDICE = "indice.jsonl"
+TAMANO_SEGMENTO = 256 * 1024 * 1024
+NIVEL_COMPRESION = 3
+
+
+@dataclass(slots=True)
+class EntradaArchivo:
+    url: str
+    fecha: float
+    tipo: str
+    segmento: str
+    offset: int
+    longitud: int
+
+
+class ArchivoPaginas:
+    def __init__(self, directorio: Path = DIRECTORIO_ARCHIVO):
+        self.directorio = directorio
+        self.paginas = 0
+        self.bytes_originales = 0
+        self.bytes_comprimidos = 0
+        self.activo = zstandard is not None
+        self._compresor = (
+            zstandard.ZstdCompressor(level=NIVEL_COMPRESION) if self.activo else None
+        )
+        self._escritor: Optional[ThreadPoolExecutor] = None
+        self._indice = None
+        self._segmento = None
+        self._nombre_segmento: Optional[str] = None
+        self._num_segmento = 0
+
+    def _abrir_segmento(self):
+        if self._segmento is not None:
+            self._segmento.close()
+        os.makedirs(self.directorio, exist_ok=True)
+        self._num_segmento += 1
+        self._nombre_segmento = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self._num_segmento:04d}.zst"
+        self._segmento = open(self.directorio / self._nombre_segmento, "ab")
+        if self._indice is None:
+            self._indice = open(self.directorio / NOMBRE_INDICE, "a", encoding="utf-8")
+
+    def archivar(self, url: str, contenido: str):
+        if not self.activo:
+            return
+        if self._escritor is None:
+            self._escritor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="archivo_paginas"
+            )
+        self._escritor.submit(self.guardar, url, contenido)
+
+    def guardar(self, url: str, contenido: str):
+        if not self.activo:
+            return
+        try:
+            if self._segmento is None or self._segmento.tell() >= TAMANO_SEGMENTO:
+                self._abrir_segmento()
+            original = contenido.encode("utf-8")
+            comprimido = self._compresor.compress(original)
+            offset = self._segmento.tell()
+            self._segmento.write(comprimido)
+            self._segmento.flush()
+            self._indice.write(
+                json.dumps(
+                    {
+                        "url": url,
+                        "fecha": time.time(),
+                        "tipo": tipo_pagina(url),
+                        "segmento": self._nombre_segmento,
+                        "offset": offset,
+                        "longitud": len(comprimido),
+                    }
+                )
+                + "\n"
+            )
+            self._indice.flush()
+            self.paginas += 1
+            self.bytes_originales += len(original)
+            self.bytes_comprimidos += len(comprimido)
+        except OSError as e:
+            logging.error(f"No se pudo archivar {url}: {e}")
+
+    def iterar_entradas(
+        self, tipos: Optional[List[str]] = None, desde: Optional[float] = None
+    ) -> Iterator[EntradaArchivo]:
+        try:
+            with open(self.directorio / NOMBRE_INDICE, "r", encoding="utf-8") as f:
+                for linea in f:
+                    try:
+                        entrada = EntradaArchivo(**json.loads(linea))
+                    except (ValueError, TypeError):
+                        continue
+                    if tipos is not None and entrada.tipo not in tipos:
+                        continue
+                    if desde is not None and entrada.fecha < desde:
+                        continue
+                    yield entrada
+        except OSError:
+            return
+
+    def entradas(
+        self,
+        tipos: Optional[List[str]] = None,
+        desde: Optional[float] = None,
+        ultimas: bool = True,
+    ) -> List[EntradaArchivo]:
+        if not ultimas:
+            return list(self.iterar_entradas(tipos, desde))
+        seleccionadas = {}
+        for entrada in self.iterar_entradas(tipos, desde):
+            seleccionadas[entrada.url] = entrada
+        return sorted(seleccionadas.values(), key=lambda e: (e.segmento, e.offset))
+
+    def leer(
+        self, entradas: Iterable[EntradaArchivo]
+    ) -> Iterator[tuple[EntradaArchivo, str]]:
+        if not self.activo:
+            logging.error("No se puede leer el archivo de páginas sin zstandard.")
+            return
+        descompresor = zstandard.ZstdDecompressor()
+        for segmento, grupo in groupby(entradas, key=lambda e: e.segmento):
+            try:
+                with open(self.directorio / segmento, "rb") as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                ) as datos:
+                    for entrada in grupo:
+                        trozo = datos[entrada.offset : entrada.offset + entrada.longitud]
+                        yield entrada, descompresor.decompress(trozo).decode("utf-8")
+            except (OSError, ValueError, zstandard.ZstdError) as e:
+                logging.error(f"No se pudo leer el segmento {segmento}: {e}")
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.shutdown(wait=True)
+            self._escritor = None
+        if self._segmento is not None:
+            self._segmento.close()
+            self._segmento = None
+        if self._indice is not None:
+            self._indice.close()
+            self._indice = None
+
+    def estadisticas(self) -> List[str]:
+        if not self.activo:
+            return ["\nArchivo de páginas desactivado: zstandard no está instalado"]
+        return [
+            f"\nPáginas archivadas: {self.paginas} ({self.bytes_originales / 1_048_576:.1f} MB -> {self.bytes_comprimidos / 1_048_576:.1f} MB comprimidos)"
+        ]
@@ -0,0 +1,27 @@
+import argparse
+
+parser = argparse.ArgumentParser(add_help=False)
+parser.add_argument(
+    "--replay",
+    action="store_true",
+    help="Sirve todas las páginas desde la caché local sin acceder a la red.",
+)
+parser.add_argument(
+    "--dead-letter",
+    choices=["drenar", "omitir"],
+    default=None,
+    help="drenar: descarga primero las URLs del dead-letter; omitir: no las intenta.",
+)
+parser.add_argument(
+    "--shards",
+    type=int,
+    default=1,
+    help="Número de procesos entre los que se reparten las URLs de las etapas grandes.",
+)
+parser.add_argument(
+    "--reanudar",
+    action="store_true",
+    help="Continúa la última ejecución interrumpida omitiendo las URLs ya completadas.",
+)
+
+argumentos, _ = parser.parse_known_args()
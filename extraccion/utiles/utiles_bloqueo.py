@@ -0,0 +1,166 @@
+import weakref
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+DOMINIOS_PUBLICIDAD = (
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "google-analytics.com",
+    "adnxs.com",
+    "amazon-adsystem.com",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "outbrain.com",
+    "scorecardresearch.com",
+    "pubmatic.com",
+    "rubiconproject.com",
+    "casalemedia.com",
+    "hotjar.com",
+    "facebook.net",
+)
+PATRONES_PUBLICIDAD = ("/ads/", "prebid", "/gpt.js", "analytics", "/pixel", "tracking")
+
+BYTES_ESTIMADOS_POR_TIPO = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 60_000,
+    "stylesheet": 50_000,
+    "script": 80_000,
+    "document": 30_000,
+    "xhr": 10_000,
+    "fetch": 10_000,
+}
+BYTES_ESTIMADOS_OTROS = 5_000
+
+
+@dataclass
+class PerfilBloqueo:
+    nombre: str
+    tipos_recurso: Tuple[str, ...] = ()
+    patrones_url: Tuple[str, ...] = ()
+    dominios: Tuple[str, ...] = ()
+    bloquear_externos: bool = False
+
+
+PERFILES_BLOQUEO: Dict[str, PerfilBloqueo] = {
+    perfil.nombre: perfil
+    for perfil in [
+        PerfilBloqueo(nombre="minimo", tipos_recurso=("stylesheet", "font")),
+        PerfilBloqueo(
+            nombre="estatico",
+            tipos_recurso=("stylesheet", "font", "image", "media", "manifest"),
+            patrones_url=PATRONES_PUBLICIDAD,
+            dominios=DOMINIOS_PUBLICIDAD,
+            bloquear_externos=True,
+        ),
+        PerfilBloqueo(
+            nombre="interactivo",
+            tipos_recurso=("font", "image", "media", "manifest"),
+            patrones_url=PATRONES_PUBLICIDAD,
+            dominios=DOMINIOS_PUBLICIDAD,
+        ),
+        PerfilBloqueo(
+            nombre="json",
+            tipos_recurso=(
+                "stylesheet",
+                "font",
+                "image",
+                "media",
+                "manifest",
+                "script",
+                "xhr",
+                "fetch",
+                "other",
+            ),
+            bloquear_externos=True,
+        ),
+    ]
+}
+PERFIL_POR_DEFECTO = "minimo"
+
+
+def mismo_dominio(host: str, host_pagina: str) -> bool:
+    raiz = ".".join(host_pagina.split(".")[-2:])
+    return host == raiz or host.endswith(f".{raiz}")
+
+
+def motivo_bloqueo(
+    perfil: PerfilBloqueo, url: str, tipo: str, url_pagina: str
+) -> Optional[str]:
+    if tipo in perfil.tipos_recurso:
+        return tipo
+    host = urlparse(url).netloc
+    if any(host == d or host.endswith(f".{d}") for d in perfil.dominios):
+        return "dominio"
+    if any(patron in url for patron in perfil.patrones_url):
+        return "patron"
+    host_pagina = urlparse(url_pagina).netloc
+    if (
+        perfil.bloquear_externos
+        and host_pagina
+        and tipo in ("script", "document")
+        and not mismo_dominio(host, host_pagina)
+    ):
+        return "externo"
+    return None
+
+
+class BloqueadorRecursos:
+    def __init__(self):
+        self.bloqueadas: Counter = Counter()
+        self.bloqueadas_por_perfil: Counter = Counter()
+        self.bytes_evitados = 0
+        self.permitidas = 0
+        self._perfiles = weakref.WeakKeyDictionary()
+
+    def asignar(self, page, nombre_perfil: str):
+        self._perfiles[page] = PERFILES_BLOQUEO.get(
+            nombre_perfil, PERFILES_BLOQUEO[PERFIL_POR_DEFECTO]
+        )
+
+    def _perfil(self, request) -> Tuple[PerfilBloqueo, str]:
+        try:
+            page = request.frame.page
+            return (
+                self._perfiles.get(page, PERFILES_BLOQUEO[PERFIL_POR_DEFECTO]),
+                page.url,
+            )
+        except Exception:
+            return PERFILES_BLOQUEO[PERFIL_POR_DEFECTO], ""
+
+    async def manejar(self, route):
+        request = route.request
+        try:
+            principal = (
+                request.is_navigation_request() and request.frame.parent_frame is None
+            )
+        except Exception:
+            principal = False
+        if not principal:
+            perfil, url_pagina = self._perfil(request)
+            motivo = motivo_bloqueo(
+                perfil, request.url, request.resource_type, url_pagina
+            )
+            if motivo is not None:
+                self.bloqueadas[motivo] += 1
+                self.bloqueadas_por_perfil[perfil.nombre] += 1
+                self.bytes_evitados += BYTES_ESTIMADOS_POR_TIPO.get(
+                    request.resource_type, BYTES_ESTIMADOS_OTROS
+                )
+                await route.abort()
+                return
+        self.permitidas += 1
+        await route.continue_()
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nPeticiones bloqueadas: {sum(self.bloqueadas.values())} de {sum(self.bloqueadas.values()) + self.permitidas}",
+            f"\nBloqueos por motivo: {dict(self.bloqueadas)}",
+            f"\nBloqueos por perfil: {dict(self.bloqueadas_por_perfil)}",
+            f"\nBytes de proxy evitados (estimados): {self.bytes_evitados / 1_048_576:.1f} MB",
+        ]
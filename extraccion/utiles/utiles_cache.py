@@ -0,0 +1,122 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DIRECTORIO_CACHE = Path(__file__).resolve().parent.parent / "cache"
+
+HORA = 3600
+DIA = 24 * HORA
+
+TTL_POR_TIPO: Dict[str, Optional[int]] = {
+    "liga": 3 * DIA,
+    "calendario": DIA,
+    "partido": HORA,
+    "partido_jugado": None,
+    "plantilla": DIA,
+    "equipo": 7 * DIA,
+    "estadio": 30 * DIA,
+    "perfil": DIA,
+    "historico": DIA,
+    "valor_mercado": DIA,
+    "agente": 7 * DIA,
+    "portada_equipo": 6 * HORA,
+    "otro": 12 * HORA,
+}
+
+TIPOS_POR_PATRON = [
+    ("/spielbericht/", "partido"),
+    ("/ceapi/transferHistory/", "historico"),
+    ("/ceapi/marketValueDevelopment/", "valor_mercado"),
+    ("/profil/spieler/", "perfil"),
+    ("/kader/", "plantilla"),
+    ("/gesamtspielplan/", "calendario"),
+    ("/startseite/wettbewerb/", "liga"),
+    ("/datenfakten/", "equipo"),
+    ("/stadion/", "estadio"),
+    ("/beraterfirma/", "agente"),
+    ("/startseite/verein/", "portada_equipo"),
+]
+
+PATRON_RESULTADO = re.compile(r'class="sb-endstand"[^>]*>(?:\s|<[^>]+>)*\d+:\d+')
+
+
+def tipo_pagina(url: str) -> str:
+    for patron, tipo in TIPOS_POR_PATRON:
+        if patron in url:
+            return tipo
+    return "otro"
+
+
+def tipo_contenido(url: str, contenido: str) -> str:
+    tipo = tipo_pagina(url)
+    if tipo == "partido" and PATRON_RESULTADO.search(contenido):
+        return "partido_jugado"
+    return tipo
+
+
+class CacheRespuestas:
+    def __init__(self, directorio: Path = DIRECTORIO_CACHE, replay: bool = False):
+        self.directorio = directorio
+        self.replay = replay
+        self.aciertos = 0
+        self.fallos = 0
+        self.guardados = 0
+
+    def _ruta(self, url: str) -> Path:
+        clave = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directorio / clave[:2] / f"{clave}.json.gz"
+
+    def _vigente(self, entrada: dict) -> bool:
+        if self.replay:
+            return True
+        ttl = TTL_POR_TIPO.get(entrada["tipo"], TTL_POR_TIPO["otro"])
+        return ttl is None or time.time() - entrada["fecha"] < ttl
+
+    def contiene(self, url: str) -> bool:
+        return self._ruta(url).exists()
+
+    def obtener(self, url: str) -> Optional[str]:
+        ruta = self._ruta(url)
+        try:
+            with gzip.open(ruta, "rt", encoding="utf-8") as f:
+                entrada = json.load(f)
+        except (OSError, ValueError):
+            self.fallos += 1
+            return None
+        if entrada.get("url") != url or not self._vigente(entrada):
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return entrada["contenido"]
+
+    def guardar(self, url: str, contenido: str):
+        ruta = self._ruta(url)
+        try:
+            os.makedirs(ruta.parent, exist_ok=True)
+            temporal = ruta.with_suffix(".tmp")
+            with gzip.open(temporal, "wt", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "url": url,
+                        "fecha": time.time(),
+                        "tipo": tipo_contenido(url, contenido),
+                        "contenido": contenido,
+                    },
+                    f,
+                    ensure_ascii=False,
+                )
+            os.replace(temporal, ruta)
+            self.guardados += 1
+        except OSError as e:
+            logging.error(f"No se pudo guardar en caché {url}: {e}")
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nCaché de respuestas{' (modo replay)' if self.replay else ''}: {self.aciertos} aciertos, {self.fallos} fallos, {self.guardados} guardadas"
+        ]
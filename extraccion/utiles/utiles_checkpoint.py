@@ -0,0 +1,82 @@
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utiles.utiles_codec import cargar, codificar
+
+DIRECTORIO_CHECKPOINTS = Path(__file__).resolve().parent.parent / "checkpoints"
+
+
+class DiarioProgreso:
+    def __init__(self, nombre: Optional[str] = None):
+        nombre = nombre or Path(sys.argv[0]).stem or "interactivo"
+        self.ruta = DIRECTORIO_CHECKPOINTS / f"{nombre}.jsonl"
+        self.reanudados = 0
+        self.registrados = 0
+        self.activo = False
+        self._completados: Optional[Dict[Tuple[str, str], Any]] = None
+
+    def _cargar(self) -> Dict[Tuple[str, str], Any]:
+        if self._completados is None:
+            self._completados = {}
+            try:
+                with open(self.ruta, "rb") as f:
+                    for linea in f:
+                        try:
+                            entrada = cargar(linea)
+                        except ValueError:
+                            continue
+                        self._completados[(entrada["etapa"], entrada["url"])] = (
+                            entrada["registro"]
+                        )
+            except OSError:
+                None
+        return self._completados
+
+    def iniciar(self, reanudar: bool):
+        os.makedirs(self.ruta.parent, exist_ok=True)
+        self.activo = True
+        if reanudar:
+            logging.info(
+                f"Reanudando desde {self.ruta}: {len(self._cargar())} URLs ya completadas"
+            )
+        else:
+            open(self.ruta, "w", encoding="utf-8").close()
+            self._completados = {}
+
+    def completados(self, etapa: str, urls: List[str]) -> Dict[str, Any]:
+        if not self.activo:
+            return {}
+        completados = self._cargar()
+        reanudados = {
+            url: completados[(etapa, url)] for url in urls if (etapa, url) in completados
+        }
+        self.reanudados += len(reanudados)
+        return reanudados
+
+    def registrar(self, etapa: str, url: str, registro: Any):
+        if not self.activo:
+            return
+        os.makedirs(self.ruta.parent, exist_ok=True)
+        with open(self.ruta, "ab") as f:
+            f.write(
+                codificar({"etapa": etapa, "url": url, "registro": registro}) + b"\n"
+            )
+        self._cargar()[(etapa, url)] = registro
+        self.registrados += 1
+
+    def finalizar(self):
+        if not self.activo:
+            return
+        self.activo = False
+        try:
+            os.remove(self.ruta)
+        except OSError:
+            None
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nDiario de progreso {self.ruta.name}: {self.reanudados} URLs reanudadas, {self.registrados} registradas"
+        ]
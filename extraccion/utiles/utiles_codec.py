@@ -0,0 +1,180 @@
+import json
+import sys
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from utiles.utiles_modelos import CAMPOS_INTERNADOS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+T = TypeVar("T")
+
+
+def a_primitivo(obj: Any) -> Any:
+    if isinstance(obj, Enum):
+        return obj.value
+    if is_dataclass(obj):
+        return {campo.name: getattr(obj, campo.name) for campo in fields(obj)}
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
+
+def codificar(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=a_primitivo)
+    return json.dumps(
+        obj, ensure_ascii=False, separators=(",", ":"), default=a_primitivo
+    ).encode("utf-8")
+
+
+def cargar(datos: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(datos)
+    return json.loads(datos)
+
+
+def identidad(valor: Any) -> Any:
+    return valor
+
+
+def internar(valor: Any) -> Any:
+    if isinstance(valor, str):
+        return sys.intern(valor)
+    if isinstance(valor, list):
+        return [internar(elemento) for elemento in valor]
+    if isinstance(valor, tuple):
+        return tuple([internar(elemento) for elemento in valor])
+    return valor
+
+
+def internador(conversor: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    if conversor is identidad:
+        return internar
+
+    def convertir_e_internar(valor):
+        return internar(conversor(valor))
+
+    return convertir_e_internar
+
+
+def decodificador_enum(tipo: Type[Enum]) -> Callable[[Any], Any]:
+    def decodificar_enum(valor):
+        if valor is None or isinstance(valor, tipo):
+            return valor
+        return tipo(valor)
+
+    return decodificar_enum
+
+
+def decodificador_clase(tipo: Type[T], internar_cadenas: bool) -> Callable[[Any], T]:
+    anotaciones = get_type_hints(tipo)
+    anidados = []
+    for campo in fields(tipo):
+        conversor = decodificador(anotaciones.get(campo.name, Any), internar_cadenas)
+        if internar_cadenas and campo.name in CAMPOS_INTERNADOS:
+            conversor = internador(conversor)
+        if campo.init and conversor is not identidad:
+            anidados.append((campo.name, conversor))
+
+    def decodificar_clase(valor):
+        if valor is None or isinstance(valor, tipo):
+            return valor
+        if anidados:
+            valor = dict(valor)
+            for nombre, conversor in anidados:
+                if nombre in valor:
+                    valor[nombre] = conversor(valor[nombre])
+        return tipo(**valor)
+
+    return decodificar_clase
+
+
+def decodificador_secuencia(
+    contenedor: type, conversor: Callable[[Any], Any]
+) -> Callable[[Any], Any]:
+    def decodificar_secuencia(valor):
+        if valor is None:
+            return valor
+        elementos = [conversor(elemento) for elemento in valor]
+        return elementos if contenedor is list else contenedor(elementos)
+
+    return decodificar_secuencia
+
+
+def decodificador_tupla(conversores: tuple) -> Callable[[Any], Any]:
+    def decodificar_tupla(valor):
+        if valor is None:
+            return valor
+        return tuple(
+            [conversor(elemento) for conversor, elemento in zip(conversores, valor)]
+        )
+
+    return decodificar_tupla
+
+
+def decodificador_diccionario(conversor: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def decodificar_diccionario(valor):
+        if valor is None:
+            return valor
+        return {clave: conversor(elemento) for clave, elemento in valor.items()}
+
+    return decodificar_diccionario
+
+
+@lru_cache(maxsize=None)
+def decodificador(tipo: Any, internar_cadenas: bool = True) -> Callable[[Any], Any]:
+    if isinstance(tipo, type) and issubclass(tipo, Enum):
+        return decodificador_enum(tipo)
+    if isinstance(tipo, type) and is_dataclass(tipo):
+        return decodificador_clase(tipo, internar_cadenas)
+    origen = get_origin(tipo)
+    argumentos = get_args(tipo)
+    if origen is Union:
+        opciones = [
+            argumento for argumento in argumentos if argumento is not type(None)
+        ]
+        if len(opciones) != 1:
+            return identidad
+        return decodificador(opciones[0], internar_cadenas)
+    if origen in (list, set, frozenset):
+        conversor = (
+            decodificador(argumentos[0], internar_cadenas) if argumentos else identidad
+        )
+        if origen is list and conversor is identidad:
+            return identidad
+        return decodificador_secuencia(origen, conversor)
+    if origen is tuple:
+        if len(argumentos) == 2 and argumentos[1] is Ellipsis:
+            return decodificador_secuencia(
+                tuple, decodificador(argumentos[0], internar_cadenas)
+            )
+        return decodificador_tupla(
+            tuple(
+                decodificador(argumento, internar_cadenas) for argumento in argumentos
+            )
+        )
+    if origen is dict and len(argumentos) == 2:
+        conversor = decodificador(argumentos[1], internar_cadenas)
+        if conversor is identidad:
+            return identidad
+        return decodificador_diccionario(conversor)
+    return identidad
+
+
+def decodificar(tipo: Type[T], valor: Any) -> T:
+    return decodificador(tipo)(valor)
@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from collections import Counter, deque
+from typing import List, Optional
+
+from utiles.utiles_modelos import URLFailReason
+
+CONCURRENCIA_INICIAL = 10
+CONCURRENCIA_MINIMA = 1
+CONCURRENCIA_MAXIMA = 30
+VENTANA_RESULTADOS = 20
+LATENCIA_OBJETIVO = 20.0
+TASA_FALLO_MAXIMA = 0.1
+FACTOR_REDUCCION = 0.5
+INTERVALO_REDUCCION = 5.0
+
+MOTIVOS_REDUCCION = {
+    URLFailReason.REDIRECTED.value,
+    URLFailReason.EMPTY.value,
+    URLFailReason.TIMEOUT.value,
+    URLFailReason.THROTTLED.value,
+}
+
+
+class ControladorConcurrencia:
+    def __init__(
+        self,
+        inicial: int = CONCURRENCIA_INICIAL,
+        minimo: int = CONCURRENCIA_MINIMA,
+        maximo: int = CONCURRENCIA_MAXIMA,
+    ):
+        self.minimo = minimo
+        self.maximo = maximo
+        self.limite = float(inicial)
+        self.en_vuelo = 0
+        self.fallos_por_motivo: Counter = Counter()
+        self.trayectoria: List[tuple[float, int]] = []
+        self._resultados: deque = deque(maxlen=VENTANA_RESULTADOS)
+        self._ultima_reduccion = 0.0
+        self._inicio: Optional[float] = None
+        self._condicion: Optional[asyncio.Condition] = None
+
+    def _obtener_condicion(self) -> asyncio.Condition:
+        if self._condicion is None:
+            self._condicion = asyncio.Condition()
+        return self._condicion
+
+    async def __aenter__(self):
+        if self._inicio is None:
+            self._inicio = time.monotonic()
+            self.trayectoria.append((0.0, int(self.limite)))
+        condicion = self._obtener_condicion()
+        async with condicion:
+            await condicion.wait_for(lambda: self.en_vuelo < int(self.limite))
+            self.en_vuelo += 1
+        return self
+
+    async def __aexit__(self, *_):
+        condicion = self._obtener_condicion()
+        async with condicion:
+            self.en_vuelo -= 1
+            condicion.notify_all()
+
+    def _sano(self) -> bool:
+        if not self._resultados:
+            return True
+        fallos = sum(1 for ok, _ in self._resultados if not ok)
+        latencias = [latencia for ok, latencia in self._resultados if ok]
+        latencia_media = sum(latencias) / len(latencias) if latencias else 0.0
+        return (
+            fallos / len(self._resultados) <= TASA_FALLO_MAXIMA
+            and latencia_media <= LATENCIA_OBJETIVO
+        )
+
+    def _actualizar_limite(self, nuevo: float, motivo: str):
+        anterior = int(self.limite)
+        self.limite = min(float(self.maximo), max(float(self.minimo), nuevo))
+        if int(self.limite) != anterior:
+            instante = time.monotonic() - (self._inicio or time.monotonic())
+            self.trayectoria.append((instante, int(self.limite)))
+            logging.info(
+                f"Concurrencia {anterior} -> {int(self.limite)} ({motivo}, {instante:.0f}s)"
+            )
+            if self._condicion is not None and int(self.limite) > anterior:
+                asyncio.ensure_future(self._despertar())
+
+    async def _despertar(self):
+        condicion = self._obtener_condicion()
+        async with condicion:
+            condicion.notify_all()
+
+    def registrar_exito(self, latencia: float):
+        self._resultados.append((True, latencia))
+        if self._sano():
+            self._actualizar_limite(
+                self.limite + 1 / max(self.limite, 1.0), "sin fallos"
+            )
+
+    def registrar_fallo(self, motivo: Optional[URLFailReason]):
+        self._resultados.append((False, 0.0))
+        clave = motivo.value if motivo else "DESCONOCIDO"
+        self.fallos_por_motivo[clave] += 1
+        ahora = time.monotonic()
+        if (
+            clave in MOTIVOS_REDUCCION
+            and ahora - self._ultima_reduccion >= INTERVALO_REDUCCION
+        ):
+            self._ultima_reduccion = ahora
+            self._actualizar_limite(self.limite * FACTOR_REDUCCION, clave)
+
+    def estadisticas(self) -> List[str]:
+        trayectoria = " -> ".join(
+            f"{limite} ({instante:.0f}s)" for instante, limite in self.trayectoria
+        )
+        return [
+            f"\nConcurrencia final: {int(self.limite)}",
+            f"\nTrayectoria de concurrencia: {trayectoria}",
+            f"\nFallos por motivo: {dict(self.fallos_por_motivo)}",
+        ]
@@ -0,0 +1,72 @@
+from typing import List, Optional
+import aiohttp
+
+CABECERAS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+    "Accept-Language": "es-ES,es;q=0.9",
+}
+TIMEOUT_HTTP = 60
+MAX_CONEXIONES = 50
+KEEPALIVE = 30
+
+
+class RespuestaHTTP:
+    def __init__(self, status: int, url: str, cabeceras: dict, contenido: str):
+        self.status = status
+        self.url = url
+        self.headers = cabeceras
+        self.contenido = contenido
+
+
+class ClienteHTTP:
+    def __init__(self):
+        self.peticiones = 0
+        self.fallbacks = 0
+        self._sesion: Optional[aiohttp.ClientSession] = None
+
+    def _obtener_sesion(self) -> aiohttp.ClientSession:
+        if self._sesion is None or self._sesion.closed:
+            self._sesion = aiohttp.ClientSession(
+                headers=CABECERAS,
+                connector=aiohttp.TCPConnector(
+                    limit=MAX_CONEXIONES, keepalive_timeout=KEEPALIVE
+                ),
+                timeout=aiohttp.ClientTimeout(total=TIMEOUT_HTTP),
+            )
+        return self._sesion
+
+    async def obtener(self, url: str, salida=None) -> RespuestaHTTP:
+        self.peticiones += 1
+        proxy, proxy_auth = None, None
+        if salida is not None:
+            proxy = salida.servidor
+            proxy_auth = (
+                aiohttp.BasicAuth(salida.usuario, salida.password or "")
+                if salida.usuario is not None
+                else None
+            )
+        async with self._obtener_sesion().get(
+            url, proxy=proxy, proxy_auth=proxy_auth
+        ) as respuesta:
+            contenido = await respuesta.text()
+            return RespuestaHTTP(
+                status=respuesta.status,
+                url=str(respuesta.url),
+                cabeceras={
+                    clave.lower(): valor for clave, valor in respuesta.headers.items()
+                },
+                contenido=contenido,
+            )
+
+    async def cerrar(self):
+        if self._sesion is not None and not self._sesion.closed:
+            await self._sesion.close()
+        self._sesion = None
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nPeticiones HTTP directas: {self.peticiones}",
+            f"\nReintentos derivados al navegador: {self.fallbacks}",
+        ]
+
@@ -0,0 +1,258 @@
+import logging
+import os
+import re
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
+
+from utiles.utiles_modelos import (
+    Agente,
+    Campo,
+    Club_Equipo,
+    HistoricoFichajes,
+    Incidencia,
+    Jugador,
+    JugadorValorMercado,
+    Liga,
+    PartidoCalendario,
+    PartidoJugado,
+    PartidoPrevia,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+DIRECTORIO_INSTANTANEAS = (
+    Path(__file__).resolve().parent.parent / "instantaneas" / "resultados"
+)
+PYARROW_DISPONIBLE = pa is not None
+INSTANTANEAS_ACTIVAS = PYARROW_DISPONIBLE and os.getenv("INSTANTANEAS", "1") != "0"
+FILAS_POR_LOTE = 10000
+SUFIJO_PARCIAL = ".parcial"
+CAMPO_PARTICION = "fecha_ejecucion"
+PATRON_FECHA_EJECUCION = re.compile(r"^(\d{2}-\d{2}-\d{2}_\d{2}-\d{2})")
+
+MODELOS_POR_ETAPA = {
+    "campos": Campo,
+    "equipos": Club_Equipo,
+    "historico_jugadores": HistoricoFichajes,
+    "horarios_jornada": PartidoPrevia,
+    "incidencias_jugadores": Incidencia,
+    "jugadores": Jugador,
+    "ligas": Liga,
+    "partidos_calendario": PartidoCalendario,
+    "partidos_jornada": PartidoJugado,
+    "representantes": Agente,
+    "valores_mercado_jugadores": JugadorValorMercado,
+}
+
+
+def etapa_de_ruta(ruta: Union[str, Path]) -> str:
+    nombre = Path(ruta).name.split(".")[0]
+    return PATRON_FECHA_EJECUCION.sub("", nombre).removeprefix("datos_")
+
+
+def fecha_de_ruta(ruta: Union[str, Path]) -> Optional[datetime]:
+    coincidencia = PATRON_FECHA_EJECUCION.match(Path(ruta).name)
+    if not coincidencia:
+        return None
+    return datetime.strptime(coincidencia.group(1), "%d-%m-%y_%H-%M")
+
+
+@lru_cache(maxsize=None)
+def tipo_arrow(anotacion: Any):
+    if isinstance(anotacion, type) and issubclass(anotacion, Enum):
+        return pa.string()
+    if isinstance(anotacion, type) and is_dataclass(anotacion):
+        anotaciones = get_type_hints(anotacion)
+        return pa.struct(
+            [
+                pa.field(campo.name, tipo_arrow(anotaciones.get(campo.name, Any)))
+                for campo in fields(anotacion)
+            ]
+        )
+    origen = get_origin(anotacion)
+    argumentos = [
+        argumento for argumento in get_args(anotacion) if argumento is not Ellipsis
+    ]
+    if origen is Union:
+        opciones = [
+            argumento for argumento in argumentos if argumento is not type(None)
+        ]
+        return tipo_arrow(opciones[0]) if len(opciones) == 1 else pa.string()
+    if origen in (list, tuple, set, frozenset):
+        return pa.list_(tipo_arrow(argumentos[0]) if argumentos else pa.string())
+    if anotacion is bool:
+        return pa.bool_()
+    if anotacion is int:
+        return pa.int64()
+    if anotacion is float:
+        return pa.float64()
+    return pa.string()
+
+
+def esquema_instantanea(modelo: type):
+    return pa.schema(
+        [pa.field("ejecucion", pa.timestamp("s"))] + list(tipo_arrow(modelo))
+    )
+
+
+def entero(valor: Any) -> Optional[int]:
+    if isinstance(valor, (bool, int)):
+        return int(valor)
+    try:
+        return int(str(valor).strip())
+    except ValueError:
+        return None
+
+
+def normalizar(valor: Any, tipo) -> Any:
+    if valor is None:
+        return None
+    if pa.types.is_struct(tipo):
+        if isinstance(valor, dict):
+            return {
+                campo.name: normalizar(valor.get(campo.name), campo.type)
+                for campo in tipo
+            }
+        return {
+            campo.name: normalizar(getattr(valor, campo.name, None), campo.type)
+            for campo in tipo
+        }
+    if pa.types.is_list(tipo):
+        return [normalizar(elemento, tipo.value_type) for elemento in valor]
+    if pa.types.is_boolean(tipo):
+        return bool(valor)
+    if pa.types.is_integer(tipo):
+        return entero(valor)
+    if pa.types.is_floating(tipo):
+        try:
+            return float(valor)
+        except ValueError:
+            return None
+    return valor.value if isinstance(valor, Enum) else str(valor)
+
+
+class EscritorInstantanea:
+    def __init__(
+        self, etapa: str, modelo: type, ejecucion: Optional[datetime] = None
+    ):
+        self.etapa = etapa
+        self.ejecucion = (ejecucion or datetime.now()).replace(microsecond=0)
+        self.esquema = esquema_instantanea(modelo)
+        self._filas = tipo_arrow(modelo)
+        self.ruta = (
+            DIRECTORIO_INSTANTANEAS
+            / f"etapa={etapa}"
+            / f"{CAMPO_PARTICION}={self.ejecucion.date().isoformat()}"
+            / f"{self.ejecucion.strftime('%H-%M-%S')}.parquet"
+        )
+        self.registros = 0
+        self._pendientes: List[Dict[str, Any]] = []
+        self._escritor = None
+
+    def escribir(self, registro: Any):
+        fila = normalizar(registro, self._filas)
+        fila["ejecucion"] = self.ejecucion
+        self._pendientes.append(fila)
+        self.registros += 1
+        if len(self._pendientes) >= FILAS_POR_LOTE:
+            self._volcar()
+
+    def _volcar(self):
+        if self._escritor is None:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            self._escritor = pq.ParquetWriter(
+                f"{self.ruta}{SUFIJO_PARCIAL}", self.esquema, compression="zstd"
+            )
+        if self._pendientes:
+            self._escritor.write_table(
+                pa.Table.from_pylist(self._pendientes, schema=self.esquema)
+            )
+            self._pendientes = []
+
+    def cerrar(self):
+        if not self.registros:
+            return
+        self._volcar()
+        self._escritor.close()
+        os.replace(f"{self.ruta}{SUFIJO_PARCIAL}", self.ruta)
+        logging.info(
+            f"Instantánea creada: {self.ruta.resolve()} ({self.registros} registros)"
+        )
+
+    def abandonar(self):
+        self._pendientes = []
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
+        try:
+            os.remove(f"{self.ruta}{SUFIJO_PARCIAL}")
+        except OSError:
+            None
+
+
+def crear_instantanea(
+    ruta: Union[str, Path], registro: Any
+) -> Optional[EscritorInstantanea]:
+    if not INSTANTANEAS_ACTIVAS or not is_dataclass(registro):
+        return None
+    return EscritorInstantanea(etapa_de_ruta(ruta), type(registro))
+
+
+def etapas_disponibles() -> List[str]:
+    return sorted(
+        ruta.name.split("=", 1)[1] for ruta in DIRECTORIO_INSTANTANEAS.glob("etapa=*")
+    )
+
+
+def ficheros_etapa(
+    etapa: str, desde: Optional[date] = None, hasta: Optional[date] = None
+) -> List[str]:
+    ficheros = []
+    directorio = DIRECTORIO_INSTANTANEAS / f"etapa={etapa}"
+    for ruta in sorted(directorio.glob("*/*.parquet")):
+        dia = date.fromisoformat(ruta.parent.name.split("=", 1)[1])
+        if (desde is None or dia >= desde) and (hasta is None or dia <= hasta):
+            ficheros.append(str(ruta))
+    return ficheros
+
+
+def consultar(
+    etapa: str,
+    columnas: Optional[List[str]] = None,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    filtro=None,
+):
+    ficheros = ficheros_etapa(etapa, desde, hasta)
+    if not ficheros:
+        logging.warning(f"No hay instantáneas de la etapa {etapa}.")
+        return pa.table({})
+    particion = pa.schema([(CAMPO_PARTICION, pa.date32())])
+    conjunto = ds.dataset(
+        ficheros,
+        schema=pa.unify_schemas(
+            [pq.read_schema(fichero) for fichero in ficheros] + [particion]
+        ),
+        format="parquet",
+        partitioning=ds.partitioning(particion, flavor="hive"),
+        partition_base_dir=str(DIRECTORIO_INSTANTANEAS / f"etapa={etapa}"),
+    )
+    return conjunto.to_table(columns=columnas, filter=filtro)
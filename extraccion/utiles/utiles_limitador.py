@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+PETICIONES_POR_SEGUNDO = 4.0
+RAFAGA = 10
+ENFRIAMIENTO_INICIAL = 30.0
+ENFRIAMIENTO_MAXIMO = 300.0
+
+CODIGOS_LIMITACION = {429, 503}
+PATRONES_BLOQUEO = ("consent", "captcha", "blocked", "denied", "challenge")
+
+
+class CuboTokens:
+    def __init__(self, tasa: float, rafaga: int):
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self.tokens = float(rafaga)
+        self.ultimo = time.monotonic()
+        self.enfriamiento_hasta = 0.0
+        self.enfriamiento_actual = 0.0
+        self.enfriamientos = 0
+        self.espera_total = 0.0
+
+    def _rellenar(self, ahora: float):
+        self.tokens = min(
+            float(self.rafaga), self.tokens + (ahora - self.ultimo) * self.tasa
+        )
+        self.ultimo = ahora
+
+    async def esperar(self):
+        inicio = time.monotonic()
+        while True:
+            ahora = time.monotonic()
+            if ahora < self.enfriamiento_hasta:
+                await asyncio.sleep(self.enfriamiento_hasta - ahora)
+                continue
+            self._rellenar(ahora)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.espera_total += time.monotonic() - inicio
+                return
+            await asyncio.sleep((1 - self.tokens) / self.tasa)
+
+    def enfriar(self, segundos: Optional[float] = None) -> float:
+        if segundos is None:
+            self.enfriamiento_actual = min(
+                ENFRIAMIENTO_MAXIMO,
+                (
+                    self.enfriamiento_actual * 2
+                    if self.enfriamiento_actual
+                    else ENFRIAMIENTO_INICIAL
+                ),
+            )
+            segundos = self.enfriamiento_actual
+        ahora = time.monotonic()
+        if ahora + segundos > self.enfriamiento_hasta:
+            self.enfriamiento_hasta = ahora + segundos
+            self.enfriamientos += 1
+        self.tokens = 0.0
+        return segundos
+
+    def restablecer(self):
+        self.enfriamiento_actual = 0.0
+
+
+class LimitadorHosts:
+    def __init__(
+        self, tasa: float = PETICIONES_POR_SEGUNDO, rafaga: int = RAFAGA
+    ):
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self._cubos: Dict[str, CuboTokens] = {}
+
+    def _cubo(self, url: str) -> CuboTokens:
+        host = urlparse(url).netloc
+        if host not in self._cubos:
+            self._cubos[host] = CuboTokens(self.tasa, self.rafaga)
+        return self._cubos[host]
+
+    async def esperar(self, url: str):
+        await self._cubo(url).esperar()
+
+    def en_enfriamiento(self, url: str) -> bool:
+        return time.monotonic() < self._cubo(url).enfriamiento_hasta
+
+    def enfriar(self, url: str, motivo: str, segundos: Optional[float] = None):
+        segundos = self._cubo(url).enfriar(segundos)
+        logging.info(
+            f"Limitación detectada en {urlparse(url).netloc} ({motivo}). Pausa de {segundos:.0f}s para todo el host"
+        )
+
+    def registrar_exito(self, url: str):
+        self._cubo(url).restablecer()
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nLimitador {host}: {cubo.enfriamientos} pausas, {cubo.espera_total:.0f}s de espera acumulada"
+            for host, cubo in self._cubos.items()
+        ]
+
+
+def es_pagina_bloqueo(url: str) -> bool:
+    return any(patron in url.lower() for patron in PATRONES_BLOQUEO)
+
+
+def segundos_retry_after(cabeceras: dict) -> Optional[float]:
+    try:
+        return float(cabeceras.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
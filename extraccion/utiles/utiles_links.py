@@ -4,19 +4,17 @@ import sys
 
 from typing import Dict, List
 from pathlib import Path
-from bs4 import BeautifulSoup
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from utiles.utiles_modelos import TargetURL
+from utiles.utiles_parser import crear_soup, seleccionar
 from utiles.utiles_salida import print_cabecera
 from utiles.utiles_scraping import (
-    CHUNK_SIZE,
     ScrapedURL,
-    chunked_iterable,
-    scrape_urls,
+    scrape_urls_stream,
     URLFailReason,
     URLFail,
-    MAX_REINTENTOS,
+    reintentables,
 )
 
 
@@ -42,12 +40,6 @@ async def scrapear_links_equipos(
         ligas_a_scrapear = list(LinksLigas.values())
 
     global paginas_fallidas, paginas_scrapeadas
-    if intentos > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para la liga."
-        )
-        logging.info(f"Ligas fallidas: {[liga for liga in ligas_a_scrapear]}")
-        return []
     TargetURLs: List[TargetURL] = []
     links_equipos: List[str] = []
     equipos_a_reintentar: List[str] = []
@@ -60,73 +52,54 @@ async def scrapear_links_equipos(
     )
 
     for liga_url in ligas_a_scrapear:
-        TargetURLs.append(TargetURL(url=liga_url))
-
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(TargetURLs, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scrapedURLs: List[ScrapedURL] = await scrape_urls(target_url_batch)
-        if not scrapedURLs:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        TargetURLs.append(TargetURL(url=liga_url, selector="td.hauptlink"))
+
+    async for scrapedURL in scrape_urls_stream(TargetURLs):
+        url = scrapedURL.url
+        html = scrapedURL.content
+        paginas_fallidas.extend(scrapedURL.paginas_fallidas)
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            equipos_a_reintentar.extend(
-                ligas_a_scrapear[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
+            equipos_a_reintentar.append(url)
+            logging.info(f"Fallida {url}. A reintentar...")
             continue
-        for index_scraped, scrapedURL in enumerate(scrapedURLs):
-            url = scrapedURL.url
-            html = scrapedURL.content
-            paginas_fallidas.extend(scrapedURL.paginas_fallidas)
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
-                )
-                equipos_a_reintentar.append(url)
-                logging.info(f"Fallida {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            equipos = soup.select("td.hauptlink a")
-            if not equipos:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener el equipo.",
-                    )
+
+        soup = crear_soup(html, "liga")
+        equipos = seleccionar(soup, "liga", "enlaces")
+        if not equipos:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener el equipo.",
                 )
-                equipos_a_reintentar.append(url)
-                logging.info(f"Fallida {url}. A reintentar...")
-                continue
-            for equipo in equipos:
-                href = equipo["href"]
-                if "/startseite/verein/" in href:
-                    links_equipos.append(
-                        "https://www.transfermarkt.es" + href.rsplit("/", 2)[0]
-                    )
-            links_equipos = list(dict.fromkeys(links_equipos))
-            logging.info(
-                f"Scrapeados {len(links_equipos)-num_equipos} enlaces de equipos de la liga {next((liga for liga,url in LinksLigas.items() if url==scrapedURL.url),scrapedURL.url)}."
             )
-            num_equipos = len(links_equipos)
-            num_ligas += 1
-            paginas_scrapeadas.add(url)
-    if len(equipos_a_reintentar) > 0 and intentos < MAX_REINTENTOS:
+            equipos_a_reintentar.append(url)
+            logging.info(f"Fallida {url}. A reintentar...")
+            continue
+        for equipo in equipos:
+            href = equipo["href"]
+            if "/startseite/verein/" in href:
+                links_equipos.append(
+                    "https://www.transfermarkt.es" + href.rsplit("/", 2)[0]
+                )
+        links_equipos = list(dict.fromkeys(links_equipos))
+        logging.info(
+            f"Scrapeados {len(links_equipos)-num_equipos} enlaces de equipos de la liga {next((liga for liga,url in LinksLigas.items() if url==scrapedURL.url),scrapedURL.url)}."
+        )
+        num_equipos = len(links_equipos)
+        num_ligas += 1
+        paginas_scrapeadas.add(url)
+    equipos_a_reintentar = reintentables(equipos_a_reintentar)
+    if len(equipos_a_reintentar) > 0:
         links_equipos_reintentados, num_equipos_reintentados, num_ligas_reintentadas = (
             await scrapear_links_equipos(equipos_a_reintentar, intentos + 1)
         )
@@ -142,12 +115,6 @@ async def scrapear_links_jugadores(
     links_equipos: List[str], intentos=1
 ) -> tuple[List[str], int, int]:
     global paginas_fallidas, paginas_scrapeadas
-    if intentos > MAX_REINTENTOS:
-        logging.error(
-            f"Se ha alcanzado el número máximo de reintentos ({MAX_REINTENTOS}) para los jugadores."
-        )
-        logging.info(f"Jugadores fallidos: {[link for link in links_equipos]}")
-        return []
     target_urls: List[TargetURL] = []
     paginas_a_reintentar: List[str] = []
     links_jugadores: List[str] = []
@@ -160,75 +127,56 @@ async def scrapear_links_jugadores(
     )
 
     for link in links_equipos:
-        target_urls.append(TargetURL(url=link.replace("startseite", "kader")))
-
-    for index_chunk, target_url_batch in enumerate(
-        chunked_iterable(target_urls, CHUNK_SIZE), start=0
-    ):
-        logging.info(f"\nProcesando batch {index_chunk} de URLs")
-        scraped_urls: List[ScrapedURL] = await scrape_urls(target_url_batch)
-        if not scraped_urls:
-            for target_url in target_url_batch:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=target_url.url,
-                        reason=URLFailReason.EMPTY.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        target_urls.append(
+            TargetURL(url=link.replace("startseite", "kader"), selector="td.hauptlink")
+        )
+
+    async for scraped_url in scrape_urls_stream(target_urls):
+        url = scraped_url.url
+        html = scraped_url.content
+        paginas_fallidas.extend(scraped_url.paginas_fallidas)
+
+        if not html:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NO_HTML.value,
+                    message="No se pudo obtener el HTML.",
                 )
-            paginas_a_reintentar.extend(
-                links_equipos[index_chunk * CHUNK_SIZE + i]
-                for i in range(len(target_url_batch))
             )
-            logging.info(f"Batch {index_chunk} fallido")
+            paginas_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
             continue
 
-        for index_scraped, scraped_url in enumerate(scraped_urls):
-            url = scraped_url.url
-            html = scraped_url.content
-            paginas_fallidas.extend(scraped_url.paginas_fallidas)
-
-            if not html:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NO_HTML.value,
-                        message="No se pudo obtener el HTML.",
-                    )
+        soup = crear_soup(html, "plantilla")
+        jugadores = seleccionar(soup, "plantilla", "enlaces")
+        if not jugadores:
+            paginas_fallidas.append(
+                URLFail(
+                    attempt=intentos,
+                    url=url,
+                    reason=URLFailReason.NOT_FOUND.value,
+                    message="No se pudo obtener los enlaces de los jugadores.",
                 )
-                paginas_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
-
-            soup = BeautifulSoup(html, "html.parser")
-            jugadores = soup.select("td.hauptlink a")
-            if not jugadores:
-                paginas_fallidas.append(
-                    URLFail(
-                        attempt=intentos,
-                        url=url,
-                        reason=URLFailReason.NOT_FOUND.value,
-                        message="No se pudo obtener los enlaces de los jugadores.",
-                    )
-                )
-                paginas_a_reintentar.append(url)
-                logging.info(f"Fallido {url}. A reintentar...")
-                continue
+            )
+            paginas_a_reintentar.append(url)
+            logging.info(f"Fallido {url}. A reintentar...")
+            continue
 
-            for jugador in jugadores:
-                href = jugador["href"]
-                if "/profil/spieler/" in href:
-                    links_jugadores.append("https://www.transfermarkt.es" + href)
+        for jugador in jugadores:
+            href = jugador["href"]
+            if "/profil/spieler/" in href:
+                links_jugadores.append("https://www.transfermarkt.es" + href)
 
-            logging.info(
-                f"Scrapeados {len(links_jugadores)-num_jugadores} enlaces de jugadores del equipo {scraped_url.url}."
-            )
-            num_jugadores = len(links_jugadores)
-            num_equipos += 1
-            paginas_scrapeadas.add(url)
-    if len(paginas_a_reintentar) > 0 and intentos < MAX_REINTENTOS:
+        logging.info(
+            f"Scrapeados {len(links_jugadores)-num_jugadores} enlaces de jugadores del equipo {scraped_url.url}."
+        )
+        num_jugadores = len(links_jugadores)
+        num_equipos += 1
+        paginas_scrapeadas.add(url)
+    paginas_a_reintentar = reintentables(paginas_a_reintentar)
+    if len(paginas_a_reintentar) > 0:
         (
             links_jugadores_reintentados,
             num_jugadores_reintentados,
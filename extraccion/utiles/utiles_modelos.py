@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import List
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 @dataclass
@@ -10,9 +10,24 @@ class URLFailReason(Enum):
     EMPTY = "EMPTY"
     NO_HTML = "NO_HTML"
     CLICK_FAILED = "CLICK_FAILED"
+    TIMEOUT = "TIMEOUT"
+    THROTTLED = "THROTTLED"
 
 
-@dataclass
+class EsperaPagina(Enum):
+    SELECTOR = "SELECTOR"
+    DOMCONTENTLOADED = "DOMCONTENTLOADED"
+    NETWORKIDLE = "NETWORKIDLE"
+    JSON = "JSON"
+
+
+class Prioridad(IntEnum):
+    ALTA = 0
+    NORMAL = 1
+    BAJA = 2
+
+
+@dataclass(slots=True)
 class URLClickDetails:
     selector: str = None
     wait_for_selector: str = None
@@ -20,7 +35,7 @@ class URLClickDetails:
     reject_cookies: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class TargetURL:
     url: str
     clicks: List[URLClickDetails] = None
@@ -28,9 +43,16 @@ class TargetURL:
     selector: str = None
     sleep: int = 0
     json: bool = False
+    espera: EsperaPagina = None
+    navegador: bool = False
+    bloqueo: str = None
+    prioridad: Prioridad = Prioridad.NORMAL
+    plazo: float = None
+    fragmentos: List[str] = None
+    script: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class URLFail:
     attempt: int
     url: str
@@ -38,27 +60,27 @@ class URLFail:
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapedURL:
     url: str
     content: str
     paginas_fallidas: List[URLFail]
 
 
-@dataclass
+@dataclass(slots=True)
 class ValorMercado:
     valor: str = None
     fecha: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class JugadorValorMercado:
     cod_jugador: str = None
     valor_mercado_actual: ValorMercado = None
     valor_mercado_maximo: ValorMercado = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Jugador:
     cod_jugador: str = None
     dorsal: str = None
@@ -84,7 +106,7 @@ class Jugador:
     opcion_cedente: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Liga:
     cod_grupo: str = None
     temporada: str = None
@@ -92,7 +114,7 @@ class Liga:
     grupo: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Campo:
     nombre: str = None
     localidad: str = None
@@ -103,7 +125,7 @@ class Campo:
     cod_equipo: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Club_Equipo:
     nombre: str = None
     cod_club: str = None
@@ -113,7 +135,7 @@ class Club_Equipo:
     liga: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Agente:
     nombre: str = None
     telefono: str = None
@@ -122,7 +144,7 @@ class Agente:
     direccion: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PartidoCalendario:
     cod_local: str = None
     cod_visitante: str = None
@@ -134,13 +156,13 @@ class PartidoCalendario:
     temporada: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PartidoPrevia:
     cod_partido: str = None
     horario: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Cambio:
     cod_entra: str = None
     cod_fuera: str = None
@@ -148,7 +170,7 @@ class Cambio:
     desc: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Amonestacion:
     cod_amonestado: str = None
     amarilla: bool = None
@@ -156,7 +178,7 @@ class Amonestacion:
     minuto: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Gol:
     cod_goleador: str = None
     resultado_gol: str = None
@@ -166,14 +188,14 @@ class Gol:
     desc_asist: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PenaltiFallado:
     cod_portero: str = None
     minuto: int = None
     parado: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PartidoJugado:
     cod_partido: str = None
     goles_local: int = None
@@ -192,7 +214,7 @@ class PartidoJugado:
     penaltis_fallados: List[PenaltiFallado] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Fichaje:
     temporada: str = None
     fecha: str = None
@@ -202,13 +224,61 @@ class Fichaje:
     coste: str = None
 
 
-@dataclass
+@dataclass(slots=True)
 class HistoricoFichajes:
     cod_jugador: str = None
     fichajes: List[Fichaje] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Incidencia:
     cod_jugador: str = None
     incidencia: str = None
+
+
+CAMPOS_INTERNADOS = frozenset(
+    {
+        "agente",
+        "campo",
+        "club_anterior",
+        "club_cedente",
+        "club_nuevo",
+        "cod_amonestado",
+        "cod_asistente",
+        "cod_club",
+        "cod_club_actual",
+        "cod_entra",
+        "cod_equipo",
+        "cod_fuera",
+        "cod_goleador",
+        "cod_grupo",
+        "cod_local",
+        "cod_portero",
+        "cod_suplentes_local",
+        "cod_suplentes_visitante",
+        "cod_titulares_local",
+        "cod_titulares_visitante",
+        "cod_visitante",
+        "contrato_hasta",
+        "contrato_hasta_cedente",
+        "coste",
+        "desc",
+        "desc_asist",
+        "division",
+        "fecha_fichado",
+        "grupo",
+        "jornada",
+        "liga",
+        "liga_club_actual",
+        "localidad",
+        "nacionalidad",
+        "opcion_cedente",
+        "pie",
+        "posicion",
+        "posiciones_secundarias",
+        "superficie",
+        "temporada",
+        "ultima_renovacion",
+        "valor",
+    }
+)
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from playwright.async_api import async_playwright
+
+MAX_PAGINAS_CONTEXTO = 200
+NUM_CONTEXTOS = 2
+CONTEXTOS_POR_SALIDA = 1
+MAX_PESTANAS_LIBRES = 15
+
+CABECERAS_NAVEGADOR = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+SCRIPT_INICIO = (
+    "Object.defineProperty(navigator, 'webdriver', { get: () => undefined });"
+)
+
+
+class ContextoPool:
+    def __init__(
+        self,
+        context,
+        id_contexto: int,
+        clave: Optional[str] = None,
+        proxy: Optional[dict] = None,
+    ):
+        self.context = context
+        self.id_contexto = id_contexto
+        self.clave = clave
+        self.proxy = proxy
+        self.paginas = 0
+        self.activas = 0
+        self.retirado = False
+        self.caido = False
+        self.pestanas_libres: List = []
+
+    def marcar_caido(self, *_):
+        self.caido = True
+
+    def agotado(self, max_paginas: int) -> bool:
+        return self.paginas >= max_paginas
+
+
+class PoolNavegador:
+    def __init__(
+        self,
+        num_contextos: int = NUM_CONTEXTOS,
+        max_paginas_contexto: int = MAX_PAGINAS_CONTEXTO,
+        manejador_rutas=None,
+    ):
+        self.manejador_rutas = manejador_rutas
+        self.num_contextos = num_contextos
+        self.max_paginas_contexto = max_paginas_contexto
+        self.lanzamientos = 0
+        self.reciclajes = 0
+        self.pestanas_creadas = 0
+        self.pestanas_reutilizadas = 0
+        self._playwright = None
+        self._navegador = None
+        self._contextos: Dict[Optional[str], List[ContextoPool]] = {}
+        self._siguiente: Dict[Optional[str], int] = {}
+        self._ids = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _obtener_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    def _navegador_activo(self) -> bool:
+        return self._navegador is not None and self._navegador.is_connected()
+
+    async def _lanzar(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        if self._navegador is not None:
+            try:
+                await self._navegador.close()
+            except Exception:
+                None
+        self._contextos = {}
+        self._navegador = await self._playwright.chromium.launch(headless=True)
+        self.lanzamientos += 1
+        logging.info(f"Navegador lanzado (lanzamiento {self.lanzamientos})")
+
+    async def _crear_contexto(
+        self, clave: Optional[str] = None, proxy: Optional[dict] = None
+    ) -> ContextoPool:
+        if proxy is not None:
+            context = await self._navegador.new_context(proxy=proxy)
+        else:
+            context = await self._navegador.new_context()
+        await context.add_init_script(SCRIPT_INICIO)
+        await context.set_extra_http_headers(CABECERAS_NAVEGADOR)
+        if self.manejador_rutas is not None:
+            await context.route("**/*", self.manejador_rutas)
+        self._ids += 1
+        return ContextoPool(context, self._ids, clave, proxy)
+
+    async def _cerrar_contexto(self, contexto: ContextoPool):
+        try:
+            await contexto.context.close()
+        except Exception:
+            None
+
+    async def _retirar(self, contexto: ContextoPool, motivo: str):
+        if contexto.retirado:
+            return
+        contexto.retirado = True
+        self.reciclajes += 1
+        logging.info(
+            f"Reciclando contexto {contexto.id_contexto} ({motivo}, {contexto.paginas} páginas)"
+        )
+        contextos = self._contextos.get(contexto.clave, [])
+        if contexto in contextos:
+            indice = contextos.index(contexto)
+            if self._navegador_activo():
+                contextos[indice] = await self._crear_contexto(
+                    contexto.clave, contexto.proxy
+                )
+            else:
+                contextos.pop(indice)
+        if contexto.activas == 0:
+            await self._cerrar_contexto(contexto)
+
+    async def adquirir(
+        self, clave: Optional[str] = None, proxy: Optional[dict] = None
+    ) -> ContextoPool:
+        async with self._obtener_lock():
+            if not self._navegador_activo():
+                await self._lanzar()
+            contextos = self._contextos.setdefault(clave, [])
+            limite = self.num_contextos if proxy is None else CONTEXTOS_POR_SALIDA
+            while len(contextos) < limite:
+                contextos.append(await self._crear_contexto(clave, proxy))
+            indice = self._siguiente.get(clave, 0) % len(contextos)
+            self._siguiente[clave] = indice + 1
+            contexto = contextos[indice]
+            if contexto.agotado(self.max_paginas_contexto):
+                await self._retirar(contexto, "límite de páginas")
+                contexto = contextos[indice]
+            contexto.paginas += 1
+            contexto.activas += 1
+            return contexto
+
+    async def obtener_pestana(self, contexto: ContextoPool):
+        while contexto.pestanas_libres:
+            page = contexto.pestanas_libres.pop()
+            if not page.is_closed():
+                self.pestanas_reutilizadas += 1
+                return page
+        page = await contexto.context.new_page()
+        page.on("crash", contexto.marcar_caido)
+        self.pestanas_creadas += 1
+        return page
+
+    async def devolver_pestana(self, contexto: ContextoPool, page, reutilizable: bool):
+        if (
+            reutilizable
+            and not contexto.retirado
+            and not contexto.caido
+            and len(contexto.pestanas_libres) < MAX_PESTANAS_LIBRES
+        ):
+            try:
+                await page.goto("about:blank")
+                contexto.pestanas_libres.append(page)
+                return
+            except Exception:
+                None
+        try:
+            await page.close()
+        except Exception:
+            None
+
+    async def liberar(self, contexto: ContextoPool):
+        contexto.activas -= 1
+        if contexto.caido and not contexto.retirado:
+            async with self._obtener_lock():
+                await self._retirar(contexto, "caída")
+        elif contexto.retirado and contexto.activas == 0:
+            await self._cerrar_contexto(contexto)
+
+    async def cerrar(self):
+        for contextos in self._contextos.values():
+            for contexto in contextos:
+                await self._cerrar_contexto(contexto)
+        self._contextos = {}
+        if self._navegador is not None:
+            try:
+                await self._navegador.close()
+            except Exception:
+                None
+            self._navegador = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._lock = None
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nLanzamientos de navegador: {self.lanzamientos}",
+            f"\nContextos reciclados: {self.reciclajes}",
+            f"\nPestañas creadas: {self.pestanas_creadas}, reutilizadas: {self.pestanas_reutilizadas}",
+        ]
+
@@ -0,0 +1,105 @@
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Type
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utiles.utiles_codec import cargar, codificar, decodificador
+from utiles.utiles_instantaneas import crear_instantanea
+
+EXTENSION_NDJSON = ".ndjson"
+SUFIJO_PARCIAL = ".parcial"
+
+
+def ruta_ndjson(ruta: str) -> Path:
+    ruta = Path(ruta)
+    return ruta if ruta.suffix == EXTENSION_NDJSON else Path(f"{ruta}{EXTENSION_NDJSON}")
+
+
+class EscritorNDJSON:
+    def __init__(self, *rutas: str, instantanea: bool = False):
+        self.rutas: List[Path] = [ruta_ndjson(ruta) for ruta in rutas]
+        self.instantanea = instantanea
+        self.registros = 0
+        self._ficheros = None
+        self._instantanea = None
+
+    def _abrir(self):
+        self._ficheros = []
+        for ruta in self.rutas:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            self._ficheros.append(open(f"{ruta}{SUFIJO_PARCIAL}", "wb"))
+
+    def escribir(self, registro: Any):
+        if self._ficheros is None:
+            self._abrir()
+        linea = codificar(registro) + b"\n"
+        for fichero in self._ficheros:
+            fichero.write(linea)
+        if self.instantanea and not self.registros:
+            self._instantanea = crear_instantanea(self.rutas[0], registro)
+        if self._instantanea is not None:
+            self._escribir_instantanea(registro)
+        self.registros += 1
+
+    def _escribir_instantanea(self, registro: Any):
+        try:
+            self._instantanea.escribir(registro)
+        except Exception as e:
+            logging.error(f"Instantánea de {self._instantanea.etapa} descartada: {e}")
+            self._instantanea.abandonar()
+            self._instantanea = None
+
+    def escribir_todos(self, registros: Iterable[Any]):
+        for registro in registros:
+            self.escribir(registro)
+
+    def cerrar(self):
+        if self._ficheros is None:
+            self._abrir()
+        for ruta, fichero in zip(self.rutas, self._ficheros):
+            fichero.close()
+            os.replace(f"{ruta}{SUFIJO_PARCIAL}", ruta)
+            logging.info(f"Fichero creado: {ruta.resolve()} ({self.registros} registros)")
+        self._ficheros = []
+        if self._instantanea is not None:
+            try:
+                self._instantanea.cerrar()
+            except Exception as e:
+                logging.error(f"Instantánea de {self._instantanea.etapa} descartada: {e}")
+                self._instantanea.abandonar()
+            self._instantanea = None
+
+    def __enter__(self) -> "EscritorNDJSON":
+        return self
+
+    def abandonar(self):
+        for fichero in self._ficheros or []:
+            fichero.close()
+        self._ficheros = []
+        if self._instantanea is not None:
+            self._instantanea.abandonar()
+            self._instantanea = None
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.abandonar()
+
+
+def leer_registros(ruta: str, tipo: Optional[Type] = None) -> Iterator[Any]:
+    convertir = decodificador(tipo) if tipo is not None else None
+    ruta = Path(ruta)
+    legado = ruta.with_suffix(".json")
+    if not ruta.exists() and legado.exists():
+        with open(legado, "rb") as f:
+            registros = cargar(f.read())
+        yield from map(convertir, registros) if convertir else registros
+        return
+    with open(ruta, "rb") as f:
+        for linea in f:
+            if linea.strip():
+                registro = cargar(linea)
+                yield convertir(registro) if convertir else registro
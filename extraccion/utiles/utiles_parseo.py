@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+from utiles.utiles_argumentos import argumentos
+from utiles.utiles_modelos import ScrapedURL
+
+NUM_PROCESOS_PARSEO = max(1, ((os.cpu_count() or 2) - 1) // max(1, argumentos.shards))
+TRABAJOS_POR_PROCESO = 2
+
+
+class PoolParseo:
+    def __init__(self, num_procesos: int = NUM_PROCESOS_PARSEO):
+        self.num_procesos = num_procesos
+        self.trabajos = 0
+        self.errores = 0
+        self.en_cola = 0
+        self.cola_maxima = 0
+        self.tiempo_espera = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _obtener_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_procesos,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def parsear(self, funcion: Callable, *args) -> Any:
+        self.trabajos += 1
+        self.en_cola += 1
+        self.cola_maxima = max(self.cola_maxima, self.en_cola)
+        inicio = time.monotonic()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._obtener_executor(), funcion, *args
+            )
+        finally:
+            self.en_cola -= 1
+            self.tiempo_espera += time.monotonic() - inicio
+
+    def cerrar(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def estadisticas(self) -> List[str]:
+        if self.trabajos == 0:
+            return []
+        return [
+            f"\nPool de parseo: {self.num_procesos} procesos, {self.trabajos} páginas, {self.errores} errores",
+            f"\nCola de parseo máxima: {self.cola_maxima}, tiempo medio por página {self.tiempo_espera / self.trabajos:.2f}s",
+        ]
+
+
+pool_parseo = PoolParseo()
+
+
+async def parsear_en_pool(
+    resultados: AsyncIterator[ScrapedURL],
+    trabajo: Callable[[ScrapedURL], tuple],
+) -> AsyncIterator[tuple[ScrapedURL, Any]]:
+    salida: asyncio.Queue = asyncio.Queue()
+    huecos = asyncio.Semaphore(pool_parseo.num_procesos * TRABAJOS_POR_PROCESO)
+    pendientes = set()
+
+    async def parsear(scraped_url: ScrapedURL):
+        try:
+            funcion, *args = trabajo(scraped_url)
+            resultado = await pool_parseo.parsear(funcion, *args)
+        except Exception as e:
+            pool_parseo.errores += 1
+            logging.error(f"Error parseando {scraped_url.url}: {e}")
+            resultado = None
+        finally:
+            huecos.release()
+        await salida.put((scraped_url, resultado))
+
+    async def alimentar():
+        try:
+            async for scraped_url in resultados:
+                if not scraped_url.content:
+                    await salida.put((scraped_url, None))
+                    continue
+                await huecos.acquire()
+                tarea = asyncio.create_task(parsear(scraped_url))
+                pendientes.add(tarea)
+                tarea.add_done_callback(pendientes.discard)
+        finally:
+            await asyncio.gather(*list(pendientes), return_exceptions=True)
+            await salida.put(None)
+
+    alimentador = asyncio.create_task(alimentar())
+    try:
+        while True:
+            elemento = await salida.get()
+            if elemento is None:
+                break
+            yield elemento
+        await alimentador
+    finally:
+        if not alimentador.done():
+            alimentador.cancel()
+        for tarea in list(pendientes):
+            tarea.cancel()
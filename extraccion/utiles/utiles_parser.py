@@ -0,0 +1,105 @@
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
+
+BACKEND_HTML = os.getenv("PARSER_HTML", "html.parser")
+FILTRAR_PARSEO = BACKEND_HTML != "html5lib" and os.getenv("PARSER_FILTRADO", "1") != "0"
+
+SELECTORES_POR_TIPO: Dict[str, Dict[str, str]] = {
+    "liga": {
+        "celdas_enlace": "td.hauptlink",
+        "enlaces": "td.hauptlink a",
+    },
+    "plantilla": {
+        "celdas_enlace": "td.hauptlink",
+        "enlaces": "td.hauptlink a",
+    },
+    "perfil": {
+        "dorsal": "span.data-header__shirt-number",
+        "titulo": "h1.data-header__headline-wrapper",
+        "apodo": "h1.data-header__headline-wrapper strong",
+        "capitan": "img[alt='Capitán'], img[title='Capitán']",
+        "valor_mercado": "a.data-header__market-value-wrapper",
+    },
+}
+
+
+@lru_cache(maxsize=None)
+def compilar(selector: str) -> soupsieve.SoupSieve:
+    return soupsieve.compile(selector)
+
+
+SELECTORES_COMPILADOS: Dict[str, Dict[str, soupsieve.SoupSieve]] = {
+    tipo: {nombre: compilar(selector) for nombre, selector in selectores.items()}
+    for tipo, selectores in SELECTORES_POR_TIPO.items()
+}
+
+
+def selector_compilado(tipo: str, nombre: str) -> soupsieve.SoupSieve:
+    return SELECTORES_COMPILADOS[tipo][nombre]
+
+
+def seleccionar(soup, tipo: str, nombre: str) -> List:
+    return selector_compilado(tipo, nombre).select(soup)
+
+
+def seleccionar_uno(soup, tipo: str, nombre: str):
+    return selector_compilado(tipo, nombre).select_one(soup)
+
+
+FILTROS_POR_TIPO: Dict[str, Dict[str, List[str]]] = {
+    "liga": {"clases": ["hauptlink"]},
+    "plantilla": {"clases": ["hauptlink"]},
+    "plantilla_con_liga": {"clases": ["hauptlink", "data-header__club-info"]},
+    "perfil": {"clases": ["data-header", "info-table", "detail-position"]},
+    "enlace_calendario": {"etiquetas": ["a"]},
+    "calendario": {"clases": ["hauptlink", "chzn-single"]},
+    "partido_calendario": {
+        "clases": [
+            "sb-team",
+            "sb-zusatzinfos",
+            "sb-spieldaten",
+            "direct-headline__header",
+        ]
+    },
+    "previa": {"etiquetas": ["div"], "clases": ["sb-spieldaten"]},
+}
+
+
+def patron_clases(clases: List[str]) -> re.Pattern:
+    return re.compile(
+        r"(?:^|\s)(?:" + "|".join(map(re.escape, clases)) + r")(?:\s|$|__)"
+    )
+
+
+def crear_filtro(etiquetas: List[str] = None, clases: List[str] = None) -> SoupStrainer:
+    if clases:
+        return SoupStrainer(etiquetas, class_=patron_clases(clases))
+    return SoupStrainer(etiquetas)
+
+
+FILTROS_COMPILADOS: Dict[str, SoupStrainer] = {
+    tipo: crear_filtro(**filtro) for tipo, filtro in FILTROS_POR_TIPO.items()
+}
+
+
+def crear_soup(html: str, filtro: Optional[str] = None) -> BeautifulSoup:
+    if filtro and FILTRAR_PARSEO:
+        return BeautifulSoup(html, BACKEND_HTML, parse_only=FILTROS_COMPILADOS[filtro])
+    return BeautifulSoup(html, BACKEND_HTML)
+
+
+def extraer_fragmentos(html: str, selectores: tuple) -> Optional[str]:
+    elementos = compilar(",".join(selectores)).select(crear_soup(html))
+    seleccionados = {id(elemento) for elemento in elementos}
+    fragmentos = [
+        str(elemento)
+        for elemento in elementos
+        if not any(id(padre) in seleccionados for padre in elemento.parents)
+    ]
+    if not fragmentos:
+        return None
+    return "<html><body>" + "\n".join(fragmentos) + "</body></html>"
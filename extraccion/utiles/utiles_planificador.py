@@ -0,0 +1,115 @@
+import heapq
+import itertools
+import time
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, Optional
+
+from utiles.utiles_modelos import Prioridad, TargetURL
+
+ENVEJECIMIENTO = 120.0
+MARGEN_PLAZO = 30.0
+TURNO_ANTIGUEDAD = 10
+
+
+class ColaPrioridad:
+    def __init__(self):
+        self._por_prioridad: Dict[int, deque] = defaultdict(deque)
+        self._por_plazo: List[tuple] = []
+        self._por_llegada: deque = deque()
+        self._extracciones = 0
+        self._servidas: set = set()
+        self._orden = itertools.count()
+        self._encoladas: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._encoladas)
+
+    def poner(self, target_url: TargetURL):
+        orden = next(self._orden)
+        ahora = time.monotonic()
+        self._encoladas[orden] = ahora
+        self._por_prioridad[int(target_url.prioridad)].append(
+            (ahora, orden, target_url)
+        )
+        self._por_llegada.append((ahora, orden, target_url))
+        if target_url.plazo is not None:
+            heapq.heappush(self._por_plazo, (target_url.plazo, orden, target_url))
+
+    def _extraer(self, monticulo: List[tuple]) -> Optional[tuple]:
+        while monticulo:
+            entrada = heapq.heappop(monticulo)
+            if entrada[1] not in self._servidas:
+                return entrada
+        return None
+
+    def _extraer_por_prioridad(self) -> Optional[tuple]:
+        ahora = time.monotonic()
+        mejor = None
+        for prioridad, cola in self._por_prioridad.items():
+            while cola and cola[0][1] in self._servidas:
+                cola.popleft()
+            if cola:
+                clave = prioridad - (ahora - cola[0][0]) / ENVEJECIMIENTO
+                if mejor is None or clave < mejor[0]:
+                    mejor = (clave, cola)
+        return mejor[1].popleft() if mejor else None
+
+    def _extraer_mas_antigua(self) -> Optional[tuple]:
+        while self._por_llegada:
+            entrada = self._por_llegada.popleft()
+            if entrada[1] not in self._servidas:
+                return entrada
+        return None
+
+    def obtener(self) -> Optional[tuple[TargetURL, float]]:
+        while self._por_plazo and self._por_plazo[0][1] in self._servidas:
+            heapq.heappop(self._por_plazo)
+        self._extracciones += 1
+        if self._por_plazo and self._por_plazo[0][0] - time.time() < MARGEN_PLAZO:
+            entrada = self._extraer(self._por_plazo)
+        elif self._extracciones % TURNO_ANTIGUEDAD == 0:
+            entrada = self._extraer_mas_antigua()
+        else:
+            entrada = self._extraer_por_prioridad()
+        if entrada is None:
+            return None
+        _, orden, target_url = entrada
+        self._servidas.add(orden)
+        return target_url, time.monotonic() - self._encoladas.pop(orden)
+
+
+class MetricasPrioridad:
+    def __init__(self):
+        self.completadas: Counter = Counter()
+        self.fallidas: Counter = Counter()
+        self.plazos_incumplidos: Counter = Counter()
+        self.espera_total: Dict[str, float] = defaultdict(float)
+        self._inicio: Optional[float] = None
+
+    def registrar(self, target_url: TargetURL, espera: float, ok: bool):
+        if self._inicio is None:
+            self._inicio = time.monotonic() - espera
+        nombre = Prioridad(target_url.prioridad).name
+        if ok:
+            self.completadas[nombre] += 1
+        else:
+            self.fallidas[nombre] += 1
+        self.espera_total[nombre] += espera
+        if target_url.plazo is not None and time.time() > target_url.plazo:
+            self.plazos_incumplidos[nombre] += 1
+
+    def estadisticas(self) -> List[str]:
+        duracion = max(time.monotonic() - (self._inicio or time.monotonic()), 1e-9)
+        lineas = []
+        for prioridad in Prioridad:
+            nombre = prioridad.name
+            total = self.completadas[nombre] + self.fallidas[nombre]
+            if total == 0:
+                continue
+            lineas.append(
+                f"\nPrioridad {nombre}: {self.completadas[nombre]} completadas, {self.fallidas[nombre]} fallidas, "
+                f"{60 * self.completadas[nombre] / duracion:.1f} páginas/min, "
+                f"espera media en cola {self.espera_total[nombre] / total:.1f}s, "
+                f"{self.plazos_incumplidos[nombre]} plazos incumplidos"
+            )
+        return lineas
@@ -0,0 +1,173 @@
+import logging
+import random
+import time
+from collections import deque
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from utiles.utiles_modelos import URLFailReason
+
+VENTANA_SALIDA = 30
+MIN_RESULTADOS_EXPULSION = 10
+TASA_EXITO_MINIMA = 0.6
+LATENCIA_REFERENCIA = 10.0
+ENFRIAMIENTO_SALIDA = 120.0
+ENFRIAMIENTO_SALIDA_MAXIMO = 1800.0
+
+MOTIVOS_AJENOS_PROXY = {
+    URLFailReason.NOT_FOUND.value,
+    URLFailReason.CLICK_FAILED.value,
+}
+
+
+class SalidaProxy:
+    def __init__(
+        self,
+        id_salida: str,
+        servidor: str,
+        usuario: Optional[str] = None,
+        password: Optional[str] = None,
+    ):
+        self.id_salida = id_salida
+        self.servidor = servidor
+        self.usuario = usuario
+        self.password = password
+        self.exitos = 0
+        self.fallos = 0
+        self.latencia_acumulada = 0.0
+        self.expulsiones = 0
+        self.enfriamiento_hasta = 0.0
+        self.enfriamiento_actual = 0.0
+        self.resultados: deque = deque(maxlen=VENTANA_SALIDA)
+
+    def configuracion_navegador(self) -> dict:
+        proxy = {"server": self.servidor}
+        if self.usuario is not None:
+            proxy["username"] = self.usuario
+            proxy["password"] = self.password or ""
+        return proxy
+
+    def disponible(self, ahora: float) -> bool:
+        return ahora >= self.enfriamiento_hasta
+
+    def tasa_exito(self) -> float:
+        exitos = sum(1 for ok, _ in self.resultados if ok)
+        return (exitos + 1) / (len(self.resultados) + 2)
+
+    def latencia_media(self) -> float:
+        latencias = [latencia for ok, latencia in self.resultados if ok]
+        return sum(latencias) / len(latencias) if latencias else LATENCIA_REFERENCIA
+
+    def puntuacion(self) -> float:
+        return self.tasa_exito() / (1 + self.latencia_media() / LATENCIA_REFERENCIA)
+
+    def registrar(self, ok: bool, latencia: float):
+        self.resultados.append((ok, latencia))
+        if ok:
+            self.exitos += 1
+            self.latencia_acumulada += latencia
+        else:
+            self.fallos += 1
+
+    def expulsar(self, motivo: str):
+        self.enfriamiento_actual = min(
+            ENFRIAMIENTO_SALIDA_MAXIMO,
+            self.enfriamiento_actual * 2
+            if self.enfriamiento_actual
+            else ENFRIAMIENTO_SALIDA,
+        )
+        self.enfriamiento_hasta = time.monotonic() + self.enfriamiento_actual
+        self.expulsiones += 1
+        self.resultados.clear()
+        logging.info(
+            f"Proxy {self.id_salida} expulsado {self.enfriamiento_actual:.0f}s ({motivo})"
+        )
+
+
+class PoolProxies:
+    def __init__(self):
+        self.salidas: List[SalidaProxy] = []
+
+    def configurado(self) -> bool:
+        return len(self.salidas) > 0
+
+    def configurar(self, salidas: List[SalidaProxy]):
+        self.salidas = salidas
+        logging.info(
+            f"Pool de proxies: {[salida.id_salida for salida in self.salidas]}"
+        )
+
+    def elegir(self) -> Optional[SalidaProxy]:
+        if not self.salidas:
+            return None
+        ahora = time.monotonic()
+        disponibles = [salida for salida in self.salidas if salida.disponible(ahora)]
+        if not disponibles:
+            return min(self.salidas, key=lambda salida: salida.enfriamiento_hasta)
+        return random.choices(
+            disponibles, weights=[salida.puntuacion() for salida in disponibles]
+        )[0]
+
+    def registrar_exito(self, salida: Optional[SalidaProxy], latencia: float):
+        if salida is None:
+            return
+        salida.registrar(True, latencia)
+        salida.enfriamiento_actual = 0.0
+
+    def registrar_fallo(
+        self, salida: Optional[SalidaProxy], motivo: Optional[URLFailReason]
+    ):
+        if salida is None:
+            return
+        clave = motivo.value if motivo else "DESCONOCIDO"
+        if clave in MOTIVOS_AJENOS_PROXY:
+            return
+        salida.registrar(False, 0.0)
+        if len(self.salidas) == 1:
+            return
+        if clave == URLFailReason.THROTTLED.value:
+            salida.expulsar(clave)
+        elif (
+            len(salida.resultados) >= MIN_RESULTADOS_EXPULSION
+            and salida.tasa_exito() < TASA_EXITO_MINIMA
+        ):
+            salida.expulsar(f"tasa de éxito {salida.tasa_exito():.0%}")
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nProxy {salida.id_salida}: {salida.exitos} éxitos, {salida.fallos} fallos, "
+            f"{salida.latencia_acumulada / max(salida.exitos, 1):.1f}s de latencia media, {salida.expulsiones} expulsiones, "
+            f"puntuación {salida.puntuacion():.2f}"
+            for salida in self.salidas
+        ]
+
+
+def salidas_desde_urls(urls: List[str]) -> List[SalidaProxy]:
+    salidas = []
+    for i, url in enumerate(urls):
+        partes = urlparse(url if "://" in url else f"http://{url}")
+        salidas.append(
+            SalidaProxy(
+                id_salida=f"{partes.hostname}:{partes.port}#{i}",
+                servidor=f"{partes.scheme}://{partes.hostname}:{partes.port}",
+                usuario=partes.username,
+                password=partes.password,
+            )
+        )
+    return salidas
+
+
+def salidas_con_sesiones(
+    servidor: str, usuario: str, password: str, num_sesiones: int
+) -> List[SalidaProxy]:
+    if num_sesiones <= 1:
+        return [SalidaProxy(servidor, servidor, usuario, password)]
+    return [
+        SalidaProxy(
+            f"{servidor}#sesion{i}",
+            servidor,
+            f"{usuario}-sessid-{random.randrange(10**9)}",
+            password,
+        )
+        for i in range(num_sesiones)
+    ]
@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utiles.utiles_modelos import URLFail
+
+INTENTOS_POR_LLAMADA = 3
+INTENTOS_POR_URL = 8
+PRESUPUESTO_REINTENTOS_RUN = 5000
+ESPERA_BASE = 2.0
+ESPERA_MAXIMA = 60.0
+
+DIRECTORIO_DEAD_LETTER = Path(__file__).resolve().parent.parent / "dead_letter"
+
+
+class PoliticaReintentos:
+    def __init__(
+        self,
+        intentos_por_llamada: int = INTENTOS_POR_LLAMADA,
+        intentos_por_url: int = INTENTOS_POR_URL,
+        presupuesto_run: int = PRESUPUESTO_REINTENTOS_RUN,
+    ):
+        self.intentos_por_llamada = intentos_por_llamada
+        self.intentos_por_url = intentos_por_url
+        self.presupuesto_run = presupuesto_run
+        self.reintentos_consumidos = 0
+        self.agotadas = 0
+        self._intentos: Counter = Counter()
+        self._agotadas: set = set()
+
+    def intentos(self, url: str) -> int:
+        return self._intentos[url]
+
+    def puede_intentar(self, url: str, intentos_llamada: int) -> bool:
+        if intentos_llamada >= self.intentos_por_llamada:
+            return False
+        if self._intentos[url] >= self.intentos_por_url:
+            return False
+        return (
+            self._intentos[url] == 0
+            or self.reintentos_consumidos < self.presupuesto_run
+        )
+
+    def registrar_intento(self, url: str):
+        if self._intentos[url] > 0:
+            self.reintentos_consumidos += 1
+        self._intentos[url] += 1
+
+    def agotada(self, url: str) -> bool:
+        return (
+            self._intentos[url] >= self.intentos_por_url
+            or self.reintentos_consumidos >= self.presupuesto_run
+        )
+
+    def puede_reintentar(self, url: str) -> bool:
+        return self._intentos[url] > 0 and not self.agotada(url)
+
+    def marcar_agotada(self, url: str) -> bool:
+        if url in self._agotadas:
+            return False
+        self._agotadas.add(url)
+        self.agotadas += 1
+        return True
+
+    def espera(self, intento: int) -> float:
+        return random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * 2**intento))
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nReintentos consumidos: {self.reintentos_consumidos} de {self.presupuesto_run}",
+            f"\nURLs con el presupuesto agotado: {self.agotadas}",
+        ]
+
+
+class AlmacenDeadLetter:
+    def __init__(self, nombre: Optional[str] = None):
+        nombre = nombre or Path(sys.argv[0]).stem or "interactivo"
+        self.ruta = DIRECTORIO_DEAD_LETTER / f"{nombre}.json"
+        self.nuevas = 0
+        self.recuperadas = 0
+        self._entradas: Optional[Dict[str, dict]] = None
+        self._cambios: Dict[str, Optional[dict]] = {}
+
+    def _leer(self) -> Dict[str, dict]:
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _cargar(self) -> Dict[str, dict]:
+        if self._entradas is None:
+            self._entradas = self._leer()
+        return self._entradas
+
+    def contiene(self, url: str) -> bool:
+        return url in self._cargar()
+
+    def urls(self) -> List[str]:
+        return list(self._cargar())
+
+    def registrar(self, url: str, intentos: int, fallos: List[URLFail]):
+        entradas = self._cargar()
+        if url not in entradas:
+            self.nuevas += 1
+        ultimo = fallos[-1] if fallos else None
+        entradas[url] = self._cambios[url] = {
+            "url": url,
+            "intentos": entradas.get(url, {}).get("intentos", 0) + intentos,
+            "motivo": (
+                getattr(ultimo.reason, "value", ultimo.reason) if ultimo else None
+            ),
+            "mensaje": ultimo.message if ultimo else None,
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+    def eliminar(self, url: str):
+        if self._cargar().pop(url, None) is not None:
+            self._cambios[url] = None
+            self.recuperadas += 1
+
+    def guardar(self):
+        if not self._cambios:
+            return
+        entradas = self._leer()
+        for url, entrada in self._cambios.items():
+            if entrada is None:
+                entradas.pop(url, None)
+            else:
+                entradas[url] = entrada
+        try:
+            os.makedirs(self.ruta.parent, exist_ok=True)
+            temporal = self.ruta.with_suffix(f".{os.getpid()}.tmp")
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(entradas, f, ensure_ascii=False, indent=4)
+            os.replace(temporal, self.ruta)
+            self._entradas = entradas
+            self._cambios = {}
+        except OSError as e:
+            logging.error(f"No se pudo guardar el dead-letter {self.ruta}: {e}")
+
+    def estadisticas(self) -> List[str]:
+        return [
+            f"\nDead-letter {self.ruta.name}: {len(self._cargar())} URLs pendientes, {self.nuevas} nuevas, {self.recuperadas} recuperadas"
+        ]
@@ -1,239 +1,709 @@
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import sys
-from dataclasses import asdict, is_dataclass
-from itertools import islice
+import time
+from dataclasses import replace
 from pathlib import Path
-from typing import Any, List
-from playwright.async_api import async_playwright
+from typing import Any, AsyncIterator, Callable, List, Optional
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 sys.path.append(str(Path(__file__).resolve().parent))
 from utiles.utiles_modelos import (
+    EsperaPagina,
+    Prioridad,
     URLFail,
     URLFailReason,
     ScrapedURL,
     TargetURL,
 )
+from utiles.utiles_concurrencia import CONCURRENCIA_MAXIMA, ControladorConcurrencia
+from utiles.utiles_limitador import (
+    CODIGOS_LIMITACION,
+    LimitadorHosts,
+    es_pagina_bloqueo,
+    segundos_retry_after,
+)
+from utiles.utiles_archivo import ArchivoPaginas
+from utiles.utiles_argumentos import argumentos
+from utiles.utiles_bloqueo import BloqueadorRecursos
+from utiles.utiles_cache import CacheRespuestas
+from utiles.utiles_http import ClienteHTTP
+from utiles.utiles_navegador import PoolNavegador
+from utiles.utiles_ndjson import EscritorNDJSON
+from utiles.utiles_parseo import pool_parseo
+from utiles.utiles_parser import extraer_fragmentos
+from utiles.utiles_planificador import ColaPrioridad, MetricasPrioridad
+from utiles.utiles_proxies import (
+    PoolProxies,
+    SalidaProxy,
+    salidas_con_sesiones,
+    salidas_desde_urls,
+)
+from utiles.utiles_reintentos import (
+    INTENTOS_POR_URL,
+    AlmacenDeadLetter,
+    PoliticaReintentos,
+)
 from utiles.utiles_salida import print_cabecera
 
 SEMAPHORE_VALUE = 10
-MAX_REINTENTOS = 7
-CHUNK_SIZE = 10
+MAX_REINTENTOS = INTENTOS_POR_URL
+NUM_WORKERS = CONCURRENCIA_MAXIMA
+TAMANO_COLA_RESULTADOS = 2 * NUM_WORKERS
 
 
 PROXY_IP = "dc.oxylabs.io"
 PROXY_PORT = "8000"
 USERNAME = os.getenv("PROXY_USERNAME")
 PASSWORD = os.getenv("PROXY_PASSWORD")
+PROXY_URLS = os.getenv("PROXY_URLS")
+NUM_SESIONES_PROXY = int(os.getenv("PROXY_SESIONES", "1"))
 
 
-semaphore = asyncio.Semaphore(SEMAPHORE_VALUE)
+controlador_concurrencia = ControladorConcurrencia(inicial=SEMAPHORE_VALUE)
+bloqueador_recursos = BloqueadorRecursos()
+pool_navegador = PoolNavegador(manejador_rutas=bloqueador_recursos.manejar)
+limitador_hosts = LimitadorHosts()
+cliente_http = ClienteHTTP()
+pool_proxies = PoolProxies()
+cache_respuestas = CacheRespuestas(replay=argumentos.replay)
+archivo_paginas = ArchivoPaginas()
+politica_reintentos = PoliticaReintentos()
+dead_letter = AlmacenDeadLetter()
+metricas_prioridad = MetricasPrioridad()
 
 
-async def obtener_contenido_url(
+SCRIPT_FRAGMENTOS = """(selectores) => {
+    const union = selectores.join(",");
+    return Array.from(document.querySelectorAll(union))
+        .filter((el) => !(el.parentElement && el.parentElement.closest(union)))
+        .map((el) => el.outerHTML)
+        .join("\\n");
+}"""
+
+
+def tiene_extraccion(target_url: TargetURL) -> bool:
+    return bool(target_url.fragmentos) or bool(target_url.script)
+
+
+def hash_texto(texto: str) -> str:
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:12]
+
+
+def clave_cache(target_url: TargetURL) -> str:
+    if target_url.script:
+        return f"{target_url.url}#script={hash_texto(target_url.script)}"
+    if target_url.fragmentos:
+        firma = hash_texto(",".join(target_url.fragmentos))
+        return f"{target_url.url}#fragmentos={firma}"
+    return target_url.url
+
+
+def estrategia_espera(target_url: TargetURL) -> EsperaPagina:
+    if target_url.espera is not None:
+        return target_url.espera
+    if target_url.json:
+        return EsperaPagina.JSON
+    if target_url.selector:
+        return EsperaPagina.SELECTOR
+    return EsperaPagina.DOMCONTENTLOADED
+
+
+def prioridad_por_novedad(url: str) -> Prioridad:
+    return Prioridad.NORMAL if cache_respuestas.contiene(url) else Prioridad.ALTA
+
+
+def requiere_navegador(target_url: TargetURL) -> bool:
+    return (
+        bool(target_url.clicks)
+        or target_url.scroll
+        or target_url.navegador
+        or bool(target_url.script)
+        or target_url.espera == EsperaPagina.NETWORKIDLE
+    )
+
+
+def perfil_bloqueo(target_url: TargetURL) -> str:
+    if target_url.bloqueo is not None:
+        return target_url.bloqueo
+    if estrategia_espera(target_url) == EsperaPagina.JSON:
+        return "json"
+    if requiere_navegador(target_url):
+        return "interactivo"
+    return "estatico"
+
+
+def registrar_fallo_pagina(
+    paginas_fallidas: List[URLFail],
+    target_url: TargetURL,
+    attempt: int,
+    reason: URLFailReason,
+    message: str,
+):
+    paginas_fallidas.append(
+        URLFail(
+            attempt=attempt,
+            url=target_url.url,
+            reason=reason,
+            message=message,
+        )
+    )
+    raise Exception()
+
+
+def comprobar_respuesta(
+    target_url: TargetURL,
+    attempt: int,
+    paginas_fallidas: List[URLFail],
+    status: Optional[int],
+    url_final: str,
+    cabeceras: dict,
+):
+    if status in CODIGOS_LIMITACION:
+        limitador_hosts.enfriar(
+            target_url.url, f"HTTP {status}", segundos_retry_after(cabeceras)
+        )
+        registrar_fallo_pagina(
+            paginas_fallidas,
+            target_url,
+            attempt,
+            URLFailReason.THROTTLED,
+            f"HTTP {status}",
+        )
+
+    if url_final != target_url.url and es_pagina_bloqueo(url_final):
+        limitador_hosts.enfriar(target_url.url, f"redirección a {url_final}")
+        registrar_fallo_pagina(
+            paginas_fallidas,
+            target_url,
+            attempt,
+            URLFailReason.THROTTLED,
+            f"Destino: {url_final}",
+        )
+
+    if url_final != target_url.url:
+        registrar_fallo_pagina(
+            paginas_fallidas,
+            target_url,
+            attempt,
+            URLFailReason.REDIRECTED,
+            f"Destino: {url_final}",
+        )
+
+    if status is not None and status >= 400:
+        registrar_fallo_pagina(
+            paginas_fallidas,
+            target_url,
+            attempt,
+            URLFailReason.NOT_FOUND if status == 404 else URLFailReason.NO_HTML,
+            f"HTTP {status}",
+        )
+
+
+def comprobar_contenido(
+    target_url: TargetURL,
+    attempt: int,
+    paginas_fallidas: List[URLFail],
+    content: Optional[str],
+):
+    if content is None or content == "":
+        registrar_fallo_pagina(
+            paginas_fallidas,
+            target_url,
+            attempt,
+            URLFailReason.NO_HTML,
+            "No se pudo obtener el contenido HTML",
+        )
+    if estrategia_espera(target_url) == EsperaPagina.JSON:
+        try:
+            json.loads(content)
+        except ValueError:
+            registrar_fallo_pagina(
+                paginas_fallidas,
+                target_url,
+                attempt,
+                URLFailReason.NO_HTML,
+                "Cuerpo JSON incompleto o inválido",
+            )
+    elif len(content) < 1000:
+        registrar_fallo_pagina(
+            paginas_fallidas,
+            target_url,
+            attempt,
+            URLFailReason.EMPTY,
+            "Contenido vacío (<1000 caracteres)",
+        )
+
+
+async def cargar_pagina(
+    page,
     target_url: TargetURL,
-    context,
     reject_cookies: bool,
-    retries=MAX_REINTENTOS,
-    delay=5,
-) -> ScrapedURL:
-    paginas_fallidas = []
-    for attempt in range(retries):
+    attempt: int,
+    paginas_fallidas: List[URLFail],
+) -> str:
+    espera = estrategia_espera(target_url)
+    respuesta = await page.goto(
+        target_url.url,
+        timeout=60000,
+        wait_until=(
+            "networkidle" if espera == EsperaPagina.NETWORKIDLE else "domcontentloaded"
+        ),
+    )
+    comprobar_respuesta(
+        target_url,
+        attempt,
+        paginas_fallidas,
+        respuesta.status if respuesta is not None else None,
+        page.url,
+        respuesta.headers if respuesta is not None else {},
+    )
+
+    if espera == EsperaPagina.JSON:
+        content = await respuesta.text() if respuesta is not None else None
+        comprobar_contenido(target_url, attempt, paginas_fallidas, content)
+        return content
+
+    if reject_cookies:
         try:
-            async with semaphore:
-                page = await context.new_page()
-                await page.route(
-                    "**/*",
-                    lambda route: (
-                        route.abort()
-                        if route.request.resource_type in ["stylesheet", "font"]
-                        else route.continue_()
-                    ),
+            await page.click("text=NO CONSENTIR", timeout=3000)
+        except Exception:
+            None
+
+    if target_url.clicks and len(target_url.clicks) > 0:
+        for click in target_url.clicks:
+            try:
+                await page.wait_for_selector(click.selector, timeout=click.timeout)
+                await page.focus(click.selector)
+                await page.keyboard.press("Enter")
+                if click.wait_for_selector:
+                    await page.wait_for_selector(
+                        click.wait_for_selector, timeout=click.timeout
+                    )
+            except Exception:
+                logging.error(
+                    f"Error al hacer clic en {click.selector} o esperar a {click.wait_for_selector}"
                 )
-                await page.set_extra_http_headers(
-                    {
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/135.0.0.0 Safari/537.36",
-                        "Accept-Encoding": "gzip, deflate",
-                    }
+                registrar_fallo_pagina(
+                    paginas_fallidas,
+                    target_url,
+                    attempt,
+                    URLFailReason.CLICK_FAILED,
+                    f"Selector: {click.selector}, Wait for: {click.wait_for_selector}",
                 )
 
-                await page.goto(target_url.url, timeout=60000)
-                await page.wait_for_timeout(2000)
+    if target_url.sleep > 0:
+        await asyncio.sleep(target_url.sleep)
 
-                if page.url != target_url.url:
-                    paginas_fallidas.append(
-                        URLFail(
-                            attempt=attempt,
-                            url=target_url.url,
-                            reason=URLFailReason.REDIRECTED,
-                            message=f"Destino: {page.url}",
-                        )
-                    )
-                    await page.close()
-                    raise Exception()
-
-                if reject_cookies:
-                    try:
-                        await page.click("text=NO CONSENTIR", timeout=3000)
-                    except Exception:
-                        None
-
-                if target_url.clicks and len(target_url.clicks) > 0:
-                    for click in target_url.clicks:
-                        try:
-                            await page.wait_for_selector(
-                                click.selector, timeout=click.timeout
-                            )
-                            await page.focus(click.selector)
-                            await page.keyboard.press("Enter")
-                            if click.wait_for_selector:
-                                await page.wait_for_selector(
-                                    click.wait_for_selector, timeout=click.timeout
-                                )
-                        except Exception:
-                            logging.error(
-                                f"Error al hacer clic en {click.selector} o esperar a {click.wait_for_selector}"
-                            )
-                            paginas_fallidas.append(
-                                URLFail(
-                                    attempt=attempt,
-                                    url=target_url.url,
-                                    reason=URLFailReason.CLICK_FAILED,
-                                    message=f"Selector: {click.selector}, Wait for: {click.wait_for_selector}",
-                                )
-                            )
-                            await page.close()
-                            raise Exception()
-
-                if target_url.sleep > 0:
-                    await asyncio.sleep(target_url.sleep)
-
-                if target_url.selector is not None and target_url.selector != "":
-                    try:
-                        await page.wait_for_selector(target_url.selector, timeout=5000)
-                    except Exception:
-                        logging.error(
-                            f"Selector {target_url.selector} no encontrado en {target_url.url}"
-                        )
-                        paginas_fallidas.append(
-                            URLFail(
-                                attempt=attempt,
-                                url=target_url.url,
-                                reason=URLFailReason.NO_HTML,
-                                message=f"No se pudo encontrar el selector {target_url.selector}",
-                            )
+    if target_url.selector is not None and target_url.selector != "":
+        try:
+            await page.wait_for_selector(target_url.selector, timeout=5000)
+        except Exception:
+            logging.error(
+                f"Selector {target_url.selector} no encontrado en {target_url.url}"
+            )
+            registrar_fallo_pagina(
+                paginas_fallidas,
+                target_url,
+                attempt,
+                URLFailReason.NO_HTML,
+                f"No se pudo encontrar el selector {target_url.selector}",
+            )
+
+    if target_url.scroll == True:
+        previous_height = await page.evaluate("document.body.scrollHeight")
+        scroll_attempts = 5
+        for _ in range(scroll_attempts):
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await asyncio.sleep(1)
+            new_height = await page.evaluate("document.body.scrollHeight")
+            if new_height == previous_height:
+                break
+            previous_height = new_height
+
+    if tiene_extraccion(target_url):
+        content = await extraer_en_navegador(page, target_url)
+        if not content:
+            registrar_fallo_pagina(
+                paginas_fallidas,
+                target_url,
+                attempt,
+                URLFailReason.NO_HTML,
+                "La extracción en el navegador no devolvió ningún fragmento",
+            )
+        return content
+
+    content = await page.content()
+    comprobar_contenido(target_url, attempt, paginas_fallidas, content)
+    return content
+
+
+async def extraer_en_navegador(page, target_url: TargetURL) -> Optional[str]:
+    if target_url.script:
+        resultado = await page.evaluate(target_url.script)
+        if resultado is None or isinstance(resultado, str):
+            return resultado
+        return json.dumps(resultado, ensure_ascii=False)
+    fragmentos = await page.evaluate(SCRIPT_FRAGMENTOS, target_url.fragmentos)
+    if not fragmentos:
+        return None
+    return f"<html><body>{fragmentos}</body></html>"
+
+
+async def obtener_con_navegador(
+    target_url: TargetURL,
+    reject_cookies: bool,
+    attempt: int,
+    paginas_fallidas: List[URLFail],
+    salida: Optional[SalidaProxy] = None,
+) -> str:
+    if salida is not None:
+        contexto = await pool_navegador.adquirir(
+            salida.id_salida, salida.configuracion_navegador()
+        )
+    else:
+        contexto = await pool_navegador.adquirir()
+    page = None
+    reutilizable = False
+    try:
+        page = await pool_navegador.obtener_pestana(contexto)
+        bloqueador_recursos.asignar(page, perfil_bloqueo(target_url))
+        content = await cargar_pagina(
+            page, target_url, reject_cookies, attempt, paginas_fallidas
+        )
+        reutilizable = True
+        return content
+    finally:
+        if page is None:
+            contexto.marcar_caido()
+        else:
+            await pool_navegador.devolver_pestana(contexto, page, reutilizable)
+        await pool_navegador.liberar(contexto)
+
+
+async def obtener_con_http(
+    target_url: TargetURL,
+    attempt: int,
+    paginas_fallidas: List[URLFail],
+    salida: Optional[SalidaProxy] = None,
+) -> str:
+    respuesta = await cliente_http.obtener(target_url.url, salida)
+    comprobar_respuesta(
+        target_url,
+        attempt,
+        paginas_fallidas,
+        respuesta.status,
+        respuesta.url,
+        respuesta.headers,
+    )
+    comprobar_contenido(target_url, attempt, paginas_fallidas, respuesta.contenido)
+    return respuesta.contenido
+
+
+async def reducir_a_fragmentos(
+    target_url: TargetURL,
+    attempt: int,
+    paginas_fallidas: List[URLFail],
+    content: str,
+) -> str:
+    if not target_url.fragmentos:
+        return content
+    fragmentos = await pool_parseo.parsear(
+        extraer_fragmentos, content, tuple(target_url.fragmentos)
+    )
+    if not fragmentos:
+        registrar_fallo_pagina(
+            paginas_fallidas,
+            target_url,
+            attempt,
+            URLFailReason.NO_HTML,
+            "La respuesta HTTP no contiene ninguno de los fragmentos pedidos",
+        )
+    return fragmentos
+
+
+def motivo_fallo(
+    error: Exception,
+    target_url: TargetURL,
+    attempt: int,
+    paginas_fallidas: List[URLFail],
+    fallos_previos: int,
+) -> Optional[URLFailReason]:
+    if len(paginas_fallidas) > fallos_previos:
+        return paginas_fallidas[-1].reason
+    if isinstance(error, (PlaywrightTimeoutError, asyncio.TimeoutError)):
+        paginas_fallidas.append(
+            URLFail(
+                attempt=attempt,
+                url=target_url.url,
+                reason=URLFailReason.TIMEOUT,
+                message=str(error).split("\n")[0],
+            )
+        )
+        return URLFailReason.TIMEOUT
+    return None
+
+
+async def obtener_contenido_url(
+    target_url: TargetURL,
+    reject_cookies: bool,
+) -> ScrapedURL:
+    paginas_fallidas = []
+    content = None
+    if (
+        cache_respuestas.replay
+        or politica_reintentos.intentos(target_url.url) == 0
+    ):
+        content = cache_respuestas.obtener(clave_cache(target_url))
+    if content is not None:
+        politica_reintentos.registrar_intento(target_url.url)
+        return ScrapedURL(
+            url=target_url.url, content=content, paginas_fallidas=paginas_fallidas
+        )
+    if cache_respuestas.replay:
+        paginas_fallidas.append(
+            URLFail(
+                attempt=0,
+                url=target_url.url,
+                reason=URLFailReason.NOT_FOUND,
+                message="No está en caché (modo replay)",
+            )
+        )
+        return ScrapedURL(
+            url=target_url.url, content=None, paginas_fallidas=paginas_fallidas
+        )
+
+    usar_navegador = requiere_navegador(target_url)
+    attempt = 0
+    while politica_reintentos.puede_intentar(target_url.url, attempt):
+        if attempt > 0 and not limitador_hosts.en_enfriamiento(target_url.url):
+            await asyncio.sleep(politica_reintentos.espera(attempt))
+        await limitador_hosts.esperar(target_url.url)
+        politica_reintentos.registrar_intento(target_url.url)
+        salida = pool_proxies.elegir()
+        try:
+            async with controlador_concurrencia:
+                inicio = time.monotonic()
+                fallos_previos = len(paginas_fallidas)
+                try:
+                    if usar_navegador:
+                        content = await obtener_con_navegador(
+                            target_url,
+                            reject_cookies,
+                            attempt,
+                            paginas_fallidas,
+                            salida,
                         )
-                        await page.close()
-                        raise Exception()
-
-                if target_url.scroll == True:
-                    previous_height = await page.evaluate("document.body.scrollHeight")
-                    scroll_attempts = 5
-                    for _ in range(scroll_attempts):
-                        print(_)
-                        await page.evaluate(
-                            "window.scrollTo(0, document.body.scrollHeight)"
+                        completo = None if tiene_extraccion(target_url) else content
+                    else:
+                        completo = await obtener_con_http(
+                            target_url, attempt, paginas_fallidas, salida
                         )
-                        await asyncio.sleep(1)
-                        new_height = await page.evaluate("document.body.scrollHeight")
-                        if new_height == previous_height:
-                            break
-                        previous_height = new_height
-
-                if (await page.content() == None) or (await page.content() == ""):
-                    paginas_fallidas.append(
-                        URLFail(
-                            attempt=attempt,
-                            url=target_url.url,
-                            reason=URLFailReason.NO_HTML,
-                            message="No se pudo obtener el contenido HTML",
+                    controlador_concurrencia.registrar_exito(time.monotonic() - inicio)
+                    pool_proxies.registrar_exito(salida, time.monotonic() - inicio)
+                    limitador_hosts.registrar_exito(target_url.url)
+                    if not usar_navegador:
+                        content = await reducir_a_fragmentos(
+                            target_url, attempt, paginas_fallidas, completo
                         )
+                    cache_respuestas.guardar(clave_cache(target_url), content)
+                    if completo is not None:
+                        archivo_paginas.archivar(target_url.url, completo)
+                    dead_letter.eliminar(target_url.url)
+                    return ScrapedURL(
+                        url=target_url.url,
+                        content=content,
+                        paginas_fallidas=paginas_fallidas,
                     )
-                    await page.close()
-                    raise Exception()
-                content = await page.content()
-                if len(content) < 1000 and target_url.json is False:
-                    paginas_fallidas.append(
-                        URLFail(
-                            attempt=attempt,
-                            url=target_url.url,
-                            reason=URLFailReason.EMPTY,
-                            message="Contenido vacío (<1000 caracteres)",
-                        )
+                except Exception as e:
+                    motivo = motivo_fallo(
+                        e, target_url, attempt, paginas_fallidas, fallos_previos
                     )
-                    await page.close()
-                    raise Exception()
-
-                await page.close()
-                return ScrapedURL(
-                    url=target_url.url,
-                    content=content,
-                    paginas_fallidas=paginas_fallidas,
-                )
+                    controlador_concurrencia.registrar_fallo(motivo)
+                    pool_proxies.registrar_fallo(salida, motivo)
+                    if not usar_navegador and (
+                        motivo is None
+                        or motivo.value != URLFailReason.THROTTLED.value
+                    ):
+                        usar_navegador = True
+                        cliente_http.fallbacks += 1
+                    raise
         except Exception:
             None
+        attempt += 1
 
-        await asyncio.sleep(delay * (2**attempt))
-
+    if politica_reintentos.agotada(
+        target_url.url
+    ) and politica_reintentos.marcar_agotada(target_url.url):
+        dead_letter.registrar(
+            target_url.url,
+            politica_reintentos.intentos(target_url.url),
+            paginas_fallidas,
+        )
     return ScrapedURL(
         url=target_url.url, content=None, paginas_fallidas=paginas_fallidas
     )
 
 
-def chunked_iterable(iterable, size):
-    it = iter(iterable)
-    return iter(lambda: list(islice(it, size)), [])
+def reintentables(
+    pendientes: List[Any], url_de: Callable[[Any], str] = lambda pendiente: pendiente
+) -> List[Any]:
+    seleccionados = []
+    for pendiente in pendientes:
+        url = url_de(pendiente)
+        if not cache_respuestas.replay and politica_reintentos.puede_reintentar(url):
+            seleccionados.append(pendiente)
+        else:
+            logging.info(f"Sin reintentos disponibles para {url}.")
+    return seleccionados
 
 
-async def scrape_urls(
-    target_urls: List[TargetURL], reject_cookies: bool = False
-) -> List[ScrapedURL]:
+def ordenar_dead_letter(target_urls: List[TargetURL]) -> List[TargetURL]:
+    if argumentos.dead_letter == "drenar":
+        return [
+            (
+                replace(target_url, prioridad=Prioridad.ALTA)
+                if dead_letter.contiene(target_url.url)
+                else target_url
+            )
+            for target_url in target_urls
+        ]
+    if argumentos.dead_letter == "omitir":
+        return [
+            target_url
+            for target_url in target_urls
+            if not dead_letter.contiene(target_url.url)
+        ]
+    return target_urls
+
+
+def preparar_motores():
+    if cache_respuestas.replay or pool_proxies.configurado():
+        return
+    if PROXY_URLS:
+        pool_proxies.configurar(salidas_desde_urls(PROXY_URLS.split(",")))
+        return
     if USERNAME is None or PASSWORD is None:
         raise Exception(
-            "Credenciales de proxy no encontradas. Asegura que las variables de entorno PROXY_USERNAME y PROXY_PASSWORD están configuradas."
+            "Credenciales de proxy no encontradas. Asegura que las variables de entorno PROXY_USERNAME y PROXY_PASSWORD (o PROXY_URLS) están configuradas."
         )
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=True,
-            proxy={
-                "server": f"http://{PROXY_IP}:{PROXY_PORT}",
-                "username": USERNAME,
-                "password": PASSWORD,
-            },
+    pool_proxies.configurar(
+        salidas_con_sesiones(
+            f"http://{PROXY_IP}:{PROXY_PORT}", USERNAME, PASSWORD, NUM_SESIONES_PROXY
         )
-        context = await browser.new_context()
-        await context.add_init_script(
-            f"Object.defineProperty(navigator, 'webdriver', {{ get: () => undefined }});"
+    )
+
+
+async def scrape_urls_stream(
+    target_urls: List[TargetURL],
+    reject_cookies: bool = False,
+    num_workers: int = NUM_WORKERS,
+) -> AsyncIterator[ScrapedURL]:
+    preparar_motores()
+    omitidas = [
+        target_url
+        for target_url in target_urls
+        if argumentos.dead_letter == "omitir" and dead_letter.contiene(target_url.url)
+    ]
+    for target_url in omitidas:
+        yield ScrapedURL(
+            url=target_url.url,
+            content=None,
+            paginas_fallidas=[
+                URLFail(
+                    attempt=0,
+                    url=target_url.url,
+                    reason=URLFailReason.NOT_FOUND,
+                    message="Omitida por estar en el dead-letter",
+                )
+            ],
         )
-        tasks = [
-            obtener_contenido_url(target_url, context, reject_cookies)
-            for target_url in target_urls
-        ]
-        results = await asyncio.gather(*tasks)
+    target_urls = ordenar_dead_letter(target_urls)
+    if not target_urls:
+        return
 
-        await browser.close()
-        return results
+    cola_urls = ColaPrioridad()
+    for target_url in target_urls:
+        cola_urls.poner(target_url)
+    cola_resultados: asyncio.Queue = asyncio.Queue(maxsize=TAMANO_COLA_RESULTADOS)
 
+    async def worker_descarga():
+        while True:
+            entrada = cola_urls.obtener()
+            if entrada is None:
+                return
+            target_url, espera = entrada
+            try:
+                scraped_url = await obtener_contenido_url(target_url, reject_cookies)
+            except Exception as e:
+                logging.error(f"Error inesperado descargando {target_url.url}: {e}")
+                scraped_url = ScrapedURL(
+                    url=target_url.url, content=None, paginas_fallidas=[]
+                )
+            metricas_prioridad.registrar(
+                target_url, espera, scraped_url.content is not None
+            )
+            await cola_resultados.put(scraped_url)
 
-def convertir_a_serializable(obj: Any) -> Any:
-    if is_dataclass(obj):
-        return {k: convertir_a_serializable(v) for k, v in asdict(obj).items()}
-    elif isinstance(obj, dict):
-        return {k: convertir_a_serializable(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [convertir_a_serializable(v) for v in obj]
-    else:
-        return obj
+    workers = [
+        asyncio.create_task(worker_descarga())
+        for _ in range(min(num_workers, len(target_urls)))
+    ]
+    try:
+        for _ in range(len(target_urls)):
+            yield await cola_resultados.get()
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def scrape_urls(
+    target_urls: List[TargetURL], reject_cookies: bool = False
+) -> List[ScrapedURL]:
+    resultados = {}
+    async for scraped_url in scrape_urls_stream(target_urls, reject_cookies):
+        resultados[scraped_url.url] = scraped_url
+    return [resultados[target_url.url] for target_url in target_urls]
 
 
-def guardar_datos_json(datos, ruta_archivo):
-    nuevos_datos_json = [convertir_a_serializable(entrada) for entrada in datos]
+async def finalizar_scraping():
+    dead_letter.guardar()
+    for linea in metricas_prioridad.estadisticas():
+        logging.info(linea)
+    for linea in politica_reintentos.estadisticas():
+        logging.info(linea)
+    for linea in dead_letter.estadisticas():
+        logging.info(linea)
+    for linea in cache_respuestas.estadisticas():
+        logging.info(linea)
+    archivo_paginas.cerrar()
+    for linea in archivo_paginas.estadisticas():
+        logging.info(linea)
+    for linea in controlador_concurrencia.estadisticas():
+        logging.info(linea)
+    for linea in limitador_hosts.estadisticas():
+        logging.info(linea)
+    for linea in pool_proxies.estadisticas():
+        logging.info(linea)
+    for linea in cliente_http.estadisticas():
+        logging.info(linea)
+    for linea in pool_navegador.estadisticas():
+        logging.info(linea)
+    for linea in bloqueador_recursos.estadisticas():
+        logging.info(linea)
+    for linea in pool_parseo.estadisticas():
+        logging.info(linea)
+    pool_parseo.cerrar()
+    await cliente_http.cerrar()
+    await pool_navegador.cerrar()
 
-    with open(f"{ruta_archivo}.json", "w", encoding="utf-8") as f:
-        json.dump(nuevos_datos_json, f, ensure_ascii=False, indent=4)
 
-    logging.info(print_cabecera("Fichero JSON"))
-    logging.info(f"Fichero creado: {os.path.abspath(f'{ruta_archivo}.json')}")
+def guardar_datos_json(datos, *rutas_archivo, instantanea: bool = False):
+    logging.info(print_cabecera("Fichero NDJSON"))
+    with EscritorNDJSON(*rutas_archivo, instantanea=instantanea) as escritor:
+        escritor.escribir_todos(datos)
@@ -0,0 +1,37 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, List, TypeVar
+
+T = TypeVar("T")
+
+
+def repartir_en_shards(elementos: List[T], num_shards: int) -> List[List[T]]:
+    num_shards = max(1, min(num_shards, len(elementos)))
+    return [elementos[i::num_shards] for i in range(num_shards)]
+
+
+def ejecutar_shard(funcion: Callable[[List[T]], Awaitable[Any]], shard: List[T]):
+    return asyncio.run(funcion(shard))
+
+
+async def ejecutar_en_shards(
+    funcion: Callable[[List[T]], Awaitable[Any]],
+    elementos: List[T],
+    num_shards: int,
+) -> List[Any]:
+    shards = repartir_en_shards(elementos, num_shards)
+    logging.info(
+        f"Repartiendo {len(elementos)} elementos en {len(shards)} procesos: {[len(shard) for shard in shards]}"
+    )
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=len(shards), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return await asyncio.gather(
+            *[
+                loop.run_in_executor(executor, ejecutar_shard, funcion, shard)
+                for shard in shards
+            ]
+        )
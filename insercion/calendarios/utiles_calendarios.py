@@ -1,4 +1,3 @@
-import json
 import logging
 from dataclasses import dataclass
 from insercion.utiles.utiles_db import (
@@ -8,9 +7,10 @@ from insercion.utiles.utiles_db import (
     obtener_id_liga,
 )
 from extraccion.utiles.utiles_modelos import PartidoCalendario
+from extraccion.utiles.utiles_ndjson import leer_registros
 
 
-@dataclass
+@dataclass(slots=True)
 class PartidoCalendario_BD:
     id_liga: int
     id_local: int
@@ -22,15 +22,14 @@ class PartidoCalendario_BD:
 
 
 def cargar_partidos_calendario(
-    ruta="extraccion/calendarios/resultados/datos_partidos_calendario.json",
+    ruta="extraccion/calendarios/resultados/datos_partidos_calendario.ndjson",
 ) -> list[PartidoCalendario]:
     try:
-        with open(ruta, "r", encoding="utf-8") as file:
-            partidos = [PartidoCalendario(**p) for p in json.load(file)]
-            logging.info(f"Se han cargado {len(partidos)} partidos.")
-            return partidos
+        partidos = list(leer_registros(ruta, PartidoCalendario))
+        logging.info(f"Se han cargado {len(partidos)} partidos.")
+        return partidos
     except FileNotFoundError:
-        logging.error("El archivo datos_partidos_calendario.json no se encuentra.")
+        logging.error("El archivo datos_partidos_calendario.ndjson no se encuentra.")
         return []
 
 
@@ -1,8 +1,8 @@
 from dataclasses import dataclass
-import json
 import logging
 from typing import Optional
 from extraccion.utiles.utiles_modelos import Campo
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import ejecutar_con_reintentos
 from insercion.utiles.utiles_localidad import (
     limpiar_localidad,
@@ -10,7 +10,7 @@ from insercion.utiles.utiles_localidad import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Campo_BD:
     nombre: str
     id_localidad: int
@@ -21,15 +21,14 @@ class Campo_BD:
 
 
 def cargar_campos_json(
-    ruta="extraccion/equipos/resultados/datos_campos.json",
+    ruta="extraccion/equipos/resultados/datos_campos.ndjson",
 ) -> list[Campo]:
     try:
-        with open(ruta, "r", encoding="utf-8") as file:
-            campos = [Campo(**c) for c in json.load(file)]
-            logging.info(f"Se han cargado {len(campos)} campos.")
-            return campos
+        campos = list(leer_registros(ruta, Campo))
+        logging.info(f"Se han cargado {len(campos)} campos.")
+        return campos
     except FileNotFoundError:
-        logging.error("El archivo datos_campos.json no se encuentra.")
+        logging.error("El archivo datos_campos.ndjson no se encuentra.")
         return []
 
 
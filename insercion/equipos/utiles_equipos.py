@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-import json
 import logging
 from typing import Optional
 
 from extraccion.utiles.utiles_modelos import Club_Equipo
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import ejecutar_con_reintentos, obtener_id_liga
 from insercion.utiles.utiles_localidad import (
     limpiar_localidad,
@@ -11,14 +11,14 @@ from insercion.utiles.utiles_localidad import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class Equipo_BD:
     id_club: int
     nombre: str
     cod_equipo: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Club_BD:
     nombre: str
     cod_club: int
@@ -26,16 +26,14 @@ class Club_BD:
 
 
 def cargar_equipos_json(
-    ruta="extraccion/equipos/resultados/datos_equipos.json",
+    ruta="extraccion/equipos/resultados/datos_equipos.ndjson",
 ) -> list[Club_Equipo]:
     try:
-        with open(ruta, "r", encoding="utf-8") as file:
-            equipos_raw = json.load(file)
-            equipos = [Club_Equipo(**e) for e in equipos_raw]
-            logging.info(f"Se han cargado {len(equipos)} equipos.")
-            return equipos
+        equipos = list(leer_registros(ruta, Club_Equipo))
+        logging.info(f"Se han cargado {len(equipos)} equipos.")
+        return equipos
     except FileNotFoundError:
-        logging.error("El archivo datos_equipos.json no se encuentra.")
+        logging.error("El archivo datos_equipos.ndjson no se encuentra.")
         return []
 
 
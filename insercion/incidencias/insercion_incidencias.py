@@ -22,7 +22,7 @@ from insercion.incidencias.utiles_incidencias import (
     cargar_incidencias_desde_json,
     insertar_incidencia,
 )
-from insercion.utiles.utiles_db import crear_pool_bd_async
+from insercion.utiles.utiles_db import crear_pool_bd_async, procesar_en_flujo
 
 
 USER = os.getenv("MYSQL_USER")
@@ -42,12 +42,10 @@ logging.basicConfig(
 
 
 async def procesar_incidencias():
-    incidencias = cargar_incidencias_desde_json()
-    if not incidencias:
+    if next(cargar_incidencias_desde_json(), None) is None:
         logging.warning("No hay incidencias para insertar.")
         return
-    jugadores_valor = cargar_valores_mercado_json()
-    if not jugadores_valor:
+    if next(cargar_valores_mercado_json(), None) is None:
         logging.warning("No hay valores de mercado para insertar.")
         return
     pool = await crear_pool_bd_async(USER, PASSWORD, "federacion")
@@ -62,19 +60,18 @@ async def procesar_incidencias():
         logging.error(f"Error borrando incidencias con id_usuario NULL: {e}")
 
     fallidos = []
-    tareas = [insertar_incidencia(pool, inc) for inc in incidencias]
-    resultados = await asyncio.gather(*tareas)
-
-    for idx, resultado in enumerate(resultados):
+    async for incidencia, resultado in procesar_en_flujo(
+        cargar_incidencias_desde_json(), lambda inc: insertar_incidencia(pool, inc)
+    ):
         if not resultado:
-            fallidos.append(incidencias[idx])
-
-    tareas = [actualizar_valores_mercado(pool, jvm) for jvm in jugadores_valor]
-    resultados = await asyncio.gather(*tareas)
+            fallidos.append(incidencia.cod_jugador)
 
-    for idx, resultado in enumerate(resultados):
+    async for jugador_valor, resultado in procesar_en_flujo(
+        cargar_valores_mercado_json(),
+        lambda jvm: actualizar_valores_mercado(pool, jvm),
+    ):
         if not resultado:
-            fallidos.append(jugadores_valor[idx])
+            fallidos.append(jugador_valor.cod_jugador)
 
     pool.close()
     await pool.wait_closed()
@@ -1,13 +1,14 @@
 from dataclasses import dataclass
 from datetime import datetime
-import json
 import logging
+from typing import Iterator
 
 from extraccion.utiles.utiles_modelos import Incidencia
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import ejecutar_con_reintentos, obtener_id_jugador
 
 
-@dataclass
+@dataclass(slots=True)
 class Incidencia_BD:
     id_jugador: int
     fecha: str
@@ -15,17 +16,16 @@ class Incidencia_BD:
 
 
 def cargar_incidencias_desde_json(
-    ruta="extraccion/incidencias/resultados/datos_incidencias_jugadores.json",
-) -> list[Incidencia]:
+    ruta="extraccion/incidencias/resultados/datos_incidencias_jugadores.ndjson",
+) -> Iterator[Incidencia]:
+    incidencias = 0
     try:
-        with open(ruta, "r", encoding="utf-8") as f:
-            datos = json.load(f)
-            incidencias = [Incidencia(**item) for item in datos]
-            logging.info(f"Cargadas {len(incidencias)} incidencias desde JSON.")
-            return incidencias
+        for incidencia in leer_registros(ruta, Incidencia):
+            yield incidencia
+            incidencias += 1
+        logging.info(f"Cargadas {incidencias} incidencias desde NDJSON.")
     except Exception as e:
-        logging.error(f"Error cargando incidencias JSON: {e}")
-        return []
+        logging.error(f"Error cargando incidencias NDJSON: {e}")
 
 
 async def _borrar_incidencias_usuario_null(pool):
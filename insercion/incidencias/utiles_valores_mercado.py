@@ -1,8 +1,9 @@
-import json
 import logging
+from typing import Iterator
 
 
-from extraccion.utiles.utiles_modelos import JugadorValorMercado, ValorMercado
+from extraccion.utiles.utiles_modelos import JugadorValorMercado
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import (
     ejecutar_con_reintentos,
     normalizar_fecha,
@@ -11,35 +12,18 @@ from insercion.utiles.utiles_db import (
 
 
 def cargar_valores_mercado_json(
-    ruta="extraccion/incidencias/resultados/datos_valores_mercado_jugadores.json",
-) -> list[JugadorValorMercado]:
+    ruta="extraccion/incidencias/resultados/datos_valores_mercado_jugadores.ndjson",
+) -> Iterator[JugadorValorMercado]:
+    jugadores_valor = 0
     try:
-        with open(ruta, "r", encoding="utf-8") as file:
-            datos = json.load(file)
-            jugadores_valor = []
-            for jvm in datos:
-                actual = jvm.get("valor_mercado_actual", {})
-                maximo = jvm.get("valor_mercado_maximo", {})
-                jugador_valor = JugadorValorMercado(
-                    cod_jugador=jvm.get("cod_jugador"),
-                    valor_mercado_actual=ValorMercado(
-                        valor=actual.get("valor"),
-                        fecha=actual.get("fecha"),
-                    ),
-                    valor_mercado_maximo=ValorMercado(
-                        valor=maximo.get("valor"),
-                        fecha=maximo.get("fecha"),
-                    ),
-                )
-                jugadores_valor.append(jugador_valor)
-            logging.info(f"Cargados {len(jugadores_valor)} valores de mercado.")
-            return jugadores_valor
+        for jugador_valor in leer_registros(ruta, JugadorValorMercado):
+            yield jugador_valor
+            jugadores_valor += 1
+        logging.info(f"Cargados {jugadores_valor} valores de mercado.")
     except FileNotFoundError:
-        logging.error("Archivo datos_valores_mercado_jugadores.json no encontrado.")
-        return []
+        logging.error("Archivo datos_valores_mercado_jugadores.ndjson no encontrado.")
     except Exception as e:
         logging.error(f"Error cargando valores de mercado: {e}")
-        return []
 
 
 async def _actualizar_valor_mercado(
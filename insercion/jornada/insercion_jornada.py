@@ -46,6 +46,7 @@ from insercion.jornada.utiles_jornada import (
 )
 from insercion.utiles.utiles_db import (
     crear_pool_bd_async,
+    procesar_en_flujo,
     ejecutar_con_reintentos,
     obtener_cod_equipo,
     obtener_id_jugador,
@@ -53,6 +54,7 @@ from insercion.utiles.utiles_db import (
     obtener_str_liga,
 )
 from extraccion.utiles.utiles_salida import print_cabecera
+from utiles.utiles_scraping import finalizar_scraping
 
 
 USER = os.getenv("MYSQL_USER")
@@ -484,28 +486,22 @@ async def procesar_partido(pool, partido):
 
 async def procesar_partidos():
     try:
-        partidos = await cargar_partidos_desde_json()
         pool = await crear_pool_bd_async(USER, PASSWORD, "federacion")
 
         fallidos = []
-
-        tareas_partidos = [procesar_partido(pool, partido) for partido in partidos]
-
-        resultados_partidos = await asyncio.gather(*tareas_partidos)
-        jornadas_ligas: list[tuple[int, int]] = []
         jugadores = []
+        jornadas_max = defaultdict(int)
 
-        for idx, resultado in enumerate(resultados_partidos):
+        async for partido, resultado in procesar_en_flujo(
+            cargar_partidos_desde_json(),
+            lambda partido: procesar_partido(pool, partido),
+        ):
             if not resultado:
-                fallidos.append(partidos[idx])
+                fallidos.append(partido.cod_partido)
             else:
-                enlaces, jornada = resultado
+                enlaces, (id_liga, jornada) = resultado
                 jugadores.extend(enlaces)
-                jornadas_ligas.append(jornada)
-
-        jornadas_max = defaultdict(int)
-        for id_liga, jornada in jornadas_ligas:
-            jornadas_max[id_liga] = max(jornadas_max[id_liga], jornada)
+                jornadas_max[id_liga] = max(jornadas_max[id_liga], jornada)
 
         for id_liga, jornada in jornadas_max.items():
             await actualizar_jornada_liga(pool, int(id_liga), int(jornada))
@@ -523,10 +519,14 @@ async def procesar_partidos():
                 )
             )
             logging.info(f"Scrapeandolos y insertandolos en la base de datos...")
-            jugadores_bd, links_represenantes, _ = await scrapear_jugadores(jugadores)
+            jugadores_bd = []
+            links_represenantes, _ = await scrapear_jugadores(
+                jugadores, jugadores_bd.append
+            )
             representantes, _ = await scrapear_agentes(links_represenantes)
             enlaces = [enlace for enlace, _, _ in jugadores]
-            historicos, _ = await scrapear_historico_jugadores(enlaces)
+            historicos = []
+            await scrapear_historico_jugadores(enlaces, historicos.append)
             valores_mercado, _ = await scrapear_valores_mercado_jugadores(enlaces)
 
             if representantes:
@@ -574,6 +574,7 @@ async def main():
     except Exception as e:
         logging.error(f"Error en la ejecución: {e}")
     finally:
+        await finalizar_scraping()
         end_time = time.time()
         minutes, seconds = divmod(end_time - start_time, 60)
         logging.info(
@@ -1,21 +1,15 @@
 from dataclasses import dataclass
 from datetime import datetime
-import json
 import logging
-from typing import List, Optional
-from extraccion.utiles.utiles_modelos import (
-    PartidoJugado,
-    Cambio,
-    Amonestacion,
-    Gol,
-    PenaltiFallado,
-)
+from typing import Iterator, List, Optional
+from extraccion.utiles.utiles_modelos import PartidoJugado
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import (
     ejecutar_con_reintentos,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class JugadorPartido:
     id_jugador: int
     id_partido: int
@@ -38,7 +32,7 @@ class JugadorPartido:
     razon_sustituido: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class JugadorLiga:
     id_jugador: int
     id_equipo: int
@@ -65,7 +59,7 @@ class JugadorLiga:
     desc_asist: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class equipoLiga:
     id_equipo: int = None
     id_liga: int = None
@@ -78,55 +72,13 @@ class equipoLiga:
     goles_contra: int = None
 
 
-async def cargar_partidos_desde_json(
-    ruta="extraccion/jornada/resultados/datos_partidos_jornada.json",
-) -> List[PartidoJugado]:
+def cargar_partidos_desde_json(
+    ruta="extraccion/jornada/resultados/datos_partidos_jornada.ndjson",
+) -> Iterator[PartidoJugado]:
     try:
-        with open(ruta, "r", encoding="utf-8") as f:
-            datos = json.load(f)
-
-        partidos = []
-        for p in datos:
-            cambios_local = [Cambio(**c) for c in p.get("cambios_local", [])]
-            cambios_visitante = [Cambio(**c) for c in p.get("cambios_visitante", [])]
-            amonestaciones_local = [
-                Amonestacion(**a) for a in p.get("amonestaciones_local", [])
-            ]
-            amonestaciones_visitante = [
-                Amonestacion(**a) for a in p.get("amonestaciones_visitante", [])
-            ]
-            goles_local_desc = [Gol(**g) for g in p.get("goles_local_desc", [])]
-            goles_visitante_desc = [Gol(**g) for g in p.get("goles_visitante_desc", [])]
-
-            penaltis_fallados = [
-                PenaltiFallado(**pf) for pf in p.get("penaltis_fallados", [])
-            ]
-
-            partido = PartidoJugado(
-                cod_partido=p.get("cod_partido"),
-                goles_local=p.get("goles_local"),
-                goles_visitante=p.get("goles_visitante"),
-                cod_titulares_local=p.get("cod_titulares_local", []),
-                cod_titulares_visitante=p.get("cod_titulares_visitante", []),
-                cod_suplentes_local=p.get("cod_suplentes_local", []),
-                cod_suplentes_visitante=p.get("cod_suplentes_visitante", []),
-                cambios_local=cambios_local,
-                cambios_visitante=cambios_visitante,
-                amonestaciones_local=amonestaciones_local,
-                amonestaciones_visitante=amonestaciones_visitante,
-                goles_local_desc=goles_local_desc,
-                goles_visitante_desc=goles_visitante_desc,
-                fecha=p.get("fecha"),
-                penaltis_fallados=penaltis_fallados,
-            )
-            partidos.append(partido)
-        return partidos
-
+        yield from leer_registros(ruta, PartidoJugado)
     except Exception as e:
-        import logging
-
-        logging.error(f"Error cargando partidos JSON: {e}")
-        return []
+        logging.error(f"Error cargando partidos NDJSON: {e}")
 
 
 def suma_null(actual, nuevo):
@@ -22,6 +22,7 @@ from insercion.utiles.utiles_localidad import (
 from extraccion.utiles.utiles_salida import print_cabecera
 from insercion.utiles.utiles_db import (
     crear_pool_bd_async,
+    procesar_en_flujo,
 )
 from insercion.jugadores.utiles_jugadores import (
     cargar_jugadores_desde_json,
@@ -73,9 +74,10 @@ async def obtener_unicos_j(cur, jugadores):
 async def procesar_jugadores(
     jugadores: list[Jugador] = None, historicos: list[HistoricoFichajes] = None
 ):
-    if jugadores is None:
-        jugadores = await cargar_jugadores_desde_json()
-    if not jugadores:
+    origen_jugadores = (
+        (lambda: jugadores) if jugadores is not None else cargar_jugadores_desde_json
+    )
+    if next(iter(origen_jugadores()), None) is None:
         logging.warning("No hay jugadores para insertar.")
         return
 
@@ -85,7 +87,7 @@ async def procesar_jugadores(
         try:
             async with conn.cursor() as cur:
                 localidades, paises, posiciones, representantes = (
-                    await obtener_unicos_j(cur, jugadores)
+                    await obtener_unicos_j(cur, origen_jugadores())
                 )
                 localidades_ids, paises_ids = await insertar_localidades_y_paises(
                     cur, localidades, paises
@@ -98,28 +100,27 @@ async def procesar_jugadores(
             return
 
     fallidos = []
-    tareas = [
-        procesar_jugador(
+    async for jugador, resultado in procesar_en_flujo(
+        origen_jugadores(),
+        lambda j: procesar_jugador(
             pool, j, localidades_ids, paises_ids, posiciones_ids, representantes_ids
-        )
-        for j in jugadores
-    ]
-    resultados = await asyncio.gather(*tareas)
-
-    for idx, resultado in enumerate(resultados):
+        ),
+    ):
         if not resultado:
-            fallidos.append(jugadores[idx])
+            fallidos.append(jugador.cod_jugador)
     if historicos is None:
-        historicos = await cargar_historico_fichajes_desde_json()
-    if not historicos:
-        logging.warning("No hay historicos para insertar")
-        return
+        historicos = cargar_historico_fichajes_desde_json()
 
-    tareas = [insertar_historico_fichajes(pool, h) for h in historicos]
-    resultados = await asyncio.gather(*tareas)
-    for idx, resultado in enumerate(resultados):
+    historicos_insertados = 0
+    async for historico, resultado in procesar_en_flujo(
+        historicos, lambda h: insertar_historico_fichajes(pool, h)
+    ):
+        historicos_insertados += 1
         if not resultado:
-            fallidos.append(historicos[idx])
+            fallidos.append(historico.cod_jugador)
+    if not historicos_insertados:
+        logging.warning("No hay historicos para insertar")
+        return
 
     if fallidos:
         logging.info(
@@ -1,5 +1,7 @@
 import logging
+from typing import Iterator
 from extraccion.utiles.utiles_modelos import Fichaje, HistoricoFichajes
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import (
     ejecutar_con_reintentos,
     normalizar_fecha,
@@ -7,37 +9,13 @@ from insercion.utiles.utiles_db import (
 )
 
 
-async def cargar_historico_fichajes_desde_json(
-    ruta="extraccion/historico/resultados/datos_historico_jugadores.json",
-):
-    import json
-
+def cargar_historico_fichajes_desde_json(
+    ruta="extraccion/historico/resultados/datos_historico_jugadores.ndjson",
+) -> Iterator[HistoricoFichajes]:
     try:
-        with open(ruta, "r", encoding="utf-8") as f:
-            datos = json.load(f)
-            historicos = []
-            for item in datos:
-                fichajes = []
-                for f in item.get("fichajes", []):
-                    fichajes.append(
-                        Fichaje(
-                            temporada=f.get("temporada"),
-                            fecha=f.get("fecha"),
-                            club_anterior=tuple(f.get("club_anterior", (None, None))),
-                            club_nuevo=tuple(f.get("club_nuevo", (None, None))),
-                            valor=f.get("valor"),
-                            coste=f.get("coste"),
-                        )
-                    )
-                historicos.append(
-                    HistoricoFichajes(
-                        cod_jugador=item.get("cod_jugador"), fichajes=fichajes
-                    )
-                )
-            return historicos
+        yield from leer_registros(ruta, HistoricoFichajes)
     except Exception as e:
-        logging.error(f"Error cargando histórico fichajes JSON: {e}")
-        return []
+        logging.error(f"Error cargando histórico fichajes NDJSON: {e}")
 
 
 async def _insertar_fichaje(cur, id_jugador: int, fichaje: Fichaje):
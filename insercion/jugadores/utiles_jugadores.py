@@ -1,9 +1,9 @@
 from dataclasses import dataclass
-import json
 from typing import Optional
 import logging
-from typing import List
+from typing import Iterator, List
 from extraccion.utiles.utiles_modelos import Jugador
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import (
     ejecutar_con_reintentos,
     normalizar_fecha,
@@ -18,7 +18,7 @@ from insercion.utiles.utiles_localidad import (
 from insercion.utiles.utiles_paises import obtener_o_insertar_pais
 
 
-@dataclass
+@dataclass(slots=True)
 class Jugador_BD:
     cod_jugador: int
     nombre: str
@@ -35,14 +35,14 @@ class Jugador_BD:
     valor_mercado_max: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Posicion_BD:
     id_posicion: Optional[int] = None
     categoria: Optional[str] = None
     nombre: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class JugadorLiga_BD:
     id_jugador: int = None
     id_equipo: int = None
@@ -51,7 +51,7 @@ class JugadorLiga_BD:
     dorsal: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Jugador_ContratoActual:
     id_jugador: int = None
     id_equipo: int = None
@@ -64,18 +64,17 @@ class Jugador_ContratoActual:
     contrato_cedente_hasta: str = None
 
 
-async def cargar_jugadores_desde_json(
-    ruta="extraccion/jugadores/resultados/datos_jugadores.json",
-) -> List[Jugador]:
+def cargar_jugadores_desde_json(
+    ruta="extraccion/jugadores/resultados/datos_jugadores.ndjson",
+) -> Iterator[Jugador]:
+    jugadores = 0
     try:
-        with open(ruta, "r", encoding="utf-8") as f:
-            datos = json.load(f)
-            jugadores = [Jugador(**j) for j in datos]
-            logging.info(f"Cargados {len(jugadores)} jugadores desde JSON.")
-            return jugadores
+        for jugador in leer_registros(ruta, Jugador):
+            yield jugador
+            jugadores += 1
+        logging.info(f"Cargados {jugadores} jugadores desde NDJSON.")
     except Exception as e:
-        logging.error(f"Error cargando jugadores JSON: {e}")
-        return []
+        logging.error(f"Error cargando jugadores NDJSON: {e}")
 
 
 def preprocesar_posicion(posicion_str: str) -> Posicion_BD:
@@ -1,11 +1,11 @@
 from dataclasses import dataclass
-import json
 import logging
 from extraccion.utiles.utiles_modelos import Liga
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import ejecutar_con_reintentos
 
 
-@dataclass
+@dataclass(slots=True)
 class Liga_BD:
     cod_grupo: str
     temporada: str
@@ -24,14 +24,13 @@ def procesar_liga_insertar(liga: Liga):
 
 def cargar_ligas() -> list[Liga]:
     try:
-        with open(
-            "extraccion/ligas/resultados/datos_ligas.json", "r", encoding="utf-8"
-        ) as file:
-            ligas = [Liga(**liga) for liga in json.load(file)]
-            logging.info(f"Se han cargado {len(ligas)} ligas.")
-            return ligas
+        ligas = list(
+            leer_registros("extraccion/ligas/resultados/datos_ligas.ndjson", Liga)
+        )
+        logging.info(f"Se han cargado {len(ligas)} ligas.")
+        return ligas
     except FileNotFoundError:
-        logging.error("El archivo ligas.json no se encuentra.")
+        logging.error("El archivo datos_ligas.ndjson no se encuentra.")
         return []
 
 
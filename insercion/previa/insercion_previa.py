@@ -23,7 +23,7 @@ logging.basicConfig(
 
 from extraccion.utiles.utiles_salida import print_cabecera
 from insercion.previa.utiles_previa import cargar_previas_json, insertar_horario
-from insercion.utiles.utiles_db import crear_pool_bd_async
+from insercion.utiles.utiles_db import crear_pool_bd_async, procesar_en_flujo
 
 
 USER = os.getenv("MYSQL_USER")
@@ -35,20 +35,19 @@ if PASSWORD is None:
 
 
 async def procesar_horarios():
-    previas = cargar_previas_json()
     pool = await crear_pool_bd_async(USER, PASSWORD, "federacion")
-    tareas = []
-    for previa in previas:
-        tareas.append(insertar_horario(pool, previa))
-    resultados = await asyncio.gather(*tareas, return_exceptions=True)
 
     fallidos = []
-    for idx, res in enumerate(resultados):
+    async for previa, res in procesar_en_flujo(
+        cargar_previas_json(),
+        lambda previa: insertar_horario(pool, previa),
+        devolver_excepciones=True,
+    ):
         if isinstance(res, Exception) or res is False:
             logging.error(
-                f"Error actualizando horario para partido {previas[idx].cod_partido}"
+                f"Error actualizando horario para partido {previa.cod_partido}"
             )
-            fallidos.append(previas[idx])
+            fallidos.append(previa.cod_partido)
 
     if fallidos:
         logging.info(f"Se produjeron {len(fallidos)} fallos en la inserción horarios.")
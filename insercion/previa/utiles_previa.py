@@ -1,23 +1,23 @@
-import json
 from datetime import datetime
 import logging
 
+from typing import Iterator
 from extraccion.utiles.utiles_modelos import PartidoPrevia
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import ejecutar_con_reintentos
 
 
 def cargar_previas_json(
-    ruta="extraccion/previa/resultados/datos_horarios_jornada.json",
-) -> list[PartidoPrevia]:
+    ruta="extraccion/previa/resultados/datos_horarios_jornada.ndjson",
+) -> Iterator[PartidoPrevia]:
+    previas = 0
     try:
-        with open(ruta, "r", encoding="utf-8") as file:
-            datos = json.load(file)
-            previas = [PartidoPrevia(**p) for p in datos]
-            logging.info(f"Se han cargado {len(previas)} previas de horarios.")
-            return previas
+        for previa in leer_registros(ruta, PartidoPrevia):
+            yield previa
+            previas += 1
+        logging.info(f"Se han cargado {previas} previas de horarios.")
     except Exception as e:
-        logging.error(f"Error cargando previas JSON: {e}")
-        return []
+        logging.error(f"Error cargando previas NDJSON: {e}")
 
 
 async def _insertar_horario(pool, previa: PartidoPrevia):
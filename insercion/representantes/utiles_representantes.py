@@ -1,7 +1,7 @@
-import json
 import logging
 from typing import List
 from extraccion.utiles.utiles_modelos import Agente
+from extraccion.utiles.utiles_ndjson import leer_registros
 from insercion.utiles.utiles_db import ejecutar_con_reintentos
 
 
@@ -61,17 +61,15 @@ async def insertar_representante(pool, agente: Agente):
 
 
 def cargar_representantes_json(
-    ruta="extraccion/representantes/resultados/datos_representantes.json",
+    ruta="extraccion/representantes/resultados/datos_representantes.ndjson",
 ) -> List[Agente]:
     try:
-        with open(ruta, "r", encoding="utf-8") as file:
-            agentes_raw = json.load(file)
-            agentes = [Agente(**a) for a in agentes_raw]
-            logging.info(f"Se han cargado {len(agentes)} representantes.")
-            return agentes
+        agentes = list(leer_registros(ruta, Agente))
+        logging.info(f"Se han cargado {len(agentes)} representantes.")
+        return agentes
     except FileNotFoundError:
-        logging.error("El archivo datos_representantes.json no se encuentra.")
+        logging.error("El archivo datos_representantes.ndjson no se encuentra.")
         return []
     except Exception as e:
-        logging.error(f"Error cargando representantes JSON: {e}")
+        logging.error(f"Error cargando representantes NDJSON: {e}")
         return []
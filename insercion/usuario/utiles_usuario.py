@@ -5,7 +5,7 @@ import bcrypt
 from insercion.utiles.utiles_db import ejecutar_con_reintentos
 
 
-@dataclass
+@dataclass(slots=True)
 class Usuario:
     usuario: str = None
     nombre: str = None
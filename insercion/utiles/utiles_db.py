@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Any, Callable
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
 import aiomysql
 
 from datetime import datetime
@@ -10,6 +10,7 @@ from typing import Optional
 MAX_INTENTOS = 5
 SEMAPHORE = 100
 semaphore_db = asyncio.Semaphore(SEMAPHORE)
+TAREAS_EN_VUELO = SEMAPHORE * 2
 TEMPORADA_ACTUAL = "2024/2025"
 
 
@@ -52,6 +53,38 @@ async def ejecutar_con_reintentos(
                 return False
 
 
+async def procesar_en_flujo(
+    registros: Iterable[Any],
+    funcion: Callable[[Any], Awaitable[Any]],
+    en_vuelo: int = TAREAS_EN_VUELO,
+    devolver_excepciones: bool = False,
+) -> AsyncIterator[tuple[Any, Any]]:
+    pendientes = {}
+
+    async def completar(pendientes_actuales):
+        hechas, _ = await asyncio.wait(
+            pendientes_actuales, return_when=asyncio.FIRST_COMPLETED
+        )
+        for tarea in hechas:
+            registro = pendientes.pop(tarea)
+            if tarea.exception() is not None and not devolver_excepciones:
+                raise tarea.exception()
+            yield registro, tarea.exception() or tarea.result()
+
+    try:
+        for registro in registros:
+            pendientes[asyncio.ensure_future(funcion(registro))] = registro
+            if len(pendientes) >= en_vuelo:
+                async for resultado in completar(list(pendientes)):
+                    yield resultado
+        while pendientes:
+            async for resultado in completar(list(pendientes)):
+                yield resultado
+    finally:
+        for tarea in pendientes:
+            tarea.cancel()
+
+
 def normalizar_fecha(fecha_str: Optional[str]) -> Optional[str]:
     if not fecha_str or "-" in fecha_str:
         return None
@@ -4,7 +4,7 @@ from insercion.utiles.utiles_db import ejecutar_con_reintentos
 from insercion.utiles.utiles_paises import obtener_o_insertar_pais
 
 
-@dataclass
+@dataclass(slots=True)
 class Localidad_BD:
     nombre: str
     provincia: Optional[str] = None
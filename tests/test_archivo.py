@@ -0,0 +1,40 @@
+import threading
+
+from utiles.utiles_archivo import ArchivoPaginas
+
+URL = "https://www.transfermarkt.es/jugador/profil/spieler/{}"
+
+
+def test_archivar_escribe_en_segundo_plano_y_se_lee_de_vuelta(tmp_path, monkeypatch):
+    archivo = ArchivoPaginas(tmp_path)
+    hilos = set()
+    guardar = archivo.guardar
+
+    def guardar_registrando_hilo(url, contenido):
+        hilos.add(threading.current_thread().name)
+        guardar(url, contenido)
+
+    monkeypatch.setattr(archivo, "guardar", guardar_registrando_hilo)
+    for numero in range(3):
+        archivo.archivar(URL.format(numero), f"<html>{numero}</html>")
+    archivo.archivar(URL.format(0), "<html>nueva</html>")
+    archivo.cerrar()
+
+    assert threading.current_thread().name not in hilos
+    assert archivo.paginas == 4
+    leidas = {entrada.url: html for entrada, html in archivo.leer(archivo.entradas())}
+    assert leidas == {
+        URL.format(0): "<html>nueva</html>",
+        URL.format(1): "<html>1</html>",
+        URL.format(2): "<html>2</html>",
+    }
+
+
+def test_sin_zstandard_no_se_archiva(tmp_path):
+    archivo = ArchivoPaginas(tmp_path)
+    archivo.activo = False
+    archivo.archivar(URL.format(1), "<html></html>")
+    archivo.cerrar()
+
+    assert archivo.paginas == 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from utiles.utiles_modelos import ScrapedURL
+from utiles.utiles_parseo import parsear_en_pool, pool_parseo
+
+
+def trabajo_longitud(scraped_url: ScrapedURL) -> tuple:
+    return len, scraped_url.content
+
+
+async def fuente_con_error():
+    yield ScrapedURL("https://ejemplo.com/1", "<html></html>", [])
+    yield ScrapedURL("https://ejemplo.com/2", None, [])
+    raise ConnectionError("red caída")
+
+
+def test_error_en_la_fuente_se_propaga_tras_vaciar_la_cola():
+    recibidos = []
+
+    async def ejecutar():
+        async for scraped_url, parseado in parsear_en_pool(
+            fuente_con_error(), trabajo_longitud
+        ):
+            recibidos.append((scraped_url.url, parseado))
+
+    try:
+        with pytest.raises(ConnectionError, match="red caída"):
+            asyncio.run(asyncio.wait_for(ejecutar(), timeout=60))
+    finally:
+        pool_parseo.cerrar()
+    assert sorted(recibidos) == [
+        ("https://ejemplo.com/1", 13),
+        ("https://ejemplo.com/2", None),
+    ]
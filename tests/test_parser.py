@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from jornada.utiles_jornada import (
+    SELECTORES_INFORME_PARTIDO,
+    SELECTORES_PREVIA,
+    cargar_diccionario_posicion_a_minuto,
+    parsear_partido_jugado,
+    parsear_partido_previa,
+)
+from utiles.utiles_parser import crear_soup, extraer_fragmentos
+
+URL_INFORME = "https://www.transfermarkt.es/spielbericht/index/spielbericht/4000000"
+INFORME = (Path(__file__).parent / "paginas" / "informe_partido.html").read_text(
+    encoding="utf-8"
+)
+
+
+def test_filtro_previa_solo_construye_los_datos_del_partido():
+    soup = crear_soup(INFORME, "previa")
+    assert [tag.get("class") for tag in soup.find_all(recursive=False)] == [
+        ["sb-spieldaten"]
+    ]
+    assert parsear_partido_previa(URL_INFORME, INFORME).horario == "16/08/2025 21:30"
+
+
+def test_previa_reducida_a_fragmentos_da_el_mismo_horario():
+    reducida = extraer_fragmentos(INFORME, tuple(SELECTORES_PREVIA))
+    assert len(reducida) < len(INFORME) / 50
+    assert parsear_partido_previa(URL_INFORME, reducida) == parsear_partido_previa(
+        URL_INFORME, INFORME
+    )
+
+
+def test_informe_reducido_a_fragmentos_da_el_mismo_partido():
+    reducido = extraer_fragmentos(INFORME, tuple(SELECTORES_INFORME_PARTIDO))
+    pos_a_minuto = cargar_diccionario_posicion_a_minuto()
+    assert len(reducido) < len(INFORME) / 2
+    assert "<script" not in reducido and "main-menu" not in reducido
+    assert parsear_partido_jugado(
+        URL_INFORME, reducido, pos_a_minuto
+    ) == parsear_partido_jugado(URL_INFORME, INFORME, pos_a_minuto)
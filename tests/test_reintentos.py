@@ -0,0 +1,87 @@
+import asyncio
+import math
+
+from utiles import utiles_scraping
+from utiles.utiles_modelos import TargetURL
+from utiles.utiles_reintentos import INTENTOS_POR_URL, PoliticaReintentos
+
+URL = "https://www.transfermarkt.es/spielbericht/index/spielbericht/1"
+
+
+def preparar(monkeypatch, obtener, cacheada=None):
+    politica = PoliticaReintentos()
+    registradas = []
+
+    async def esperar(url):
+        return None
+
+    monkeypatch.setattr(utiles_scraping, "politica_reintentos", politica)
+    monkeypatch.setattr(politica, "espera", lambda intento: 0)
+    monkeypatch.setattr(utiles_scraping.limitador_hosts, "esperar", esperar)
+    monkeypatch.setattr(utiles_scraping.cliente_http, "obtener", obtener)
+    monkeypatch.setattr(
+        utiles_scraping,
+        "obtener_con_navegador",
+        lambda target_url, *args: obtener(target_url.url, None),
+    )
+    monkeypatch.setattr(
+        utiles_scraping.cache_respuestas, "obtener", lambda clave: cacheada
+    )
+    monkeypatch.setattr(
+        utiles_scraping.cache_respuestas, "guardar", lambda clave, contenido: None
+    )
+    monkeypatch.setattr(
+        utiles_scraping.archivo_paginas, "archivar", lambda url, contenido: None
+    )
+    monkeypatch.setattr(
+        utiles_scraping.dead_letter,
+        "registrar",
+        lambda url, intentos, fallos: registradas.append((url, intentos)),
+    )
+    monkeypatch.setattr(utiles_scraping.dead_letter, "eliminar", lambda url: None)
+    return politica, registradas
+
+
+def pasadas_hasta_agotar(target_url: TargetURL) -> int:
+    pendientes = [target_url.url]
+    pasadas = 0
+    while pendientes:
+        pasadas += 1
+        scraped_url = asyncio.run(
+            utiles_scraping.obtener_contenido_url(target_url, False)
+        )
+        assert scraped_url.content is None
+        pendientes = utiles_scraping.reintentables(pendientes)
+    return pasadas
+
+
+def test_las_pasadas_de_la_etapa_respetan_el_limite_por_url(monkeypatch):
+    descargas = []
+
+    async def obtener(url, salida):
+        descargas.append(url)
+        raise ConnectionError("sin conexión")
+
+    politica, registradas = preparar(monkeypatch, obtener)
+    pasadas = pasadas_hasta_agotar(TargetURL(url=URL))
+
+    assert len(descargas) == INTENTOS_POR_URL
+    assert politica.intentos(URL) == INTENTOS_POR_URL
+    assert pasadas == math.ceil(INTENTOS_POR_URL / politica.intentos_por_llamada)
+    assert registradas == [(URL, INTENTOS_POR_URL)]
+
+
+def test_un_acierto_de_cache_cuenta_como_intento(monkeypatch):
+    async def obtener(url, salida):
+        raise AssertionError("no debería descargar")
+
+    politica, _ = preparar(monkeypatch, obtener, cacheada="<html></html>")
+    asyncio.run(utiles_scraping.obtener_contenido_url(TargetURL(url=URL), False))
+
+    assert politica.intentos(URL) == 1
+    assert utiles_scraping.reintentables([URL]) == [URL]
+
+
+def test_sin_intentos_registrados_no_se_reintenta(monkeypatch):
+    preparar(monkeypatch, None)
+    assert utiles_scraping.reintentables([(URL, "club")], lambda p: p[0]) == []
@@ -0,0 +1,58 @@
+import asyncio
+from pathlib import Path
+
+from jornada.utiles_jornada import (
+    SELECTORES_INFORME_PARTIDO,
+    cargar_diccionario_posicion_a_minuto,
+    parsear_partido_jugado,
+)
+from utiles import utiles_scraping
+from utiles.utiles_http import RespuestaHTTP
+from utiles.utiles_modelos import TargetURL
+from utiles.utiles_parseo import pool_parseo
+
+URL_INFORME = "https://www.transfermarkt.es/spielbericht/index/spielbericht/4000000"
+INFORME = (Path(__file__).parent / "paginas" / "informe_partido.html").read_text(
+    encoding="utf-8"
+)
+
+
+def test_script_requiere_navegador_y_fragmentos_no():
+    assert utiles_scraping.requiere_navegador(TargetURL(url=URL_INFORME, script="1"))
+    assert not utiles_scraping.requiere_navegador(
+        TargetURL(url=URL_INFORME, fragmentos=SELECTORES_INFORME_PARTIDO)
+    )
+
+
+def test_fragmentos_reducen_la_respuesta_http(monkeypatch):
+    cacheadas, archivadas = {}, {}
+
+    async def obtener(url, salida):
+        return RespuestaHTTP(200, url, {}, INFORME)
+
+    monkeypatch.setattr(utiles_scraping.cliente_http, "obtener", obtener)
+    monkeypatch.setattr(utiles_scraping.cache_respuestas, "obtener", lambda clave: None)
+    monkeypatch.setattr(
+        utiles_scraping.cache_respuestas, "guardar", cacheadas.__setitem__
+    )
+    monkeypatch.setattr(
+        utiles_scraping.archivo_paginas, "archivar", archivadas.__setitem__
+    )
+    target_url = TargetURL(url=URL_INFORME, fragmentos=SELECTORES_INFORME_PARTIDO)
+
+    try:
+        scraped_url = asyncio.run(
+            utiles_scraping.obtener_contenido_url(target_url, False)
+        )
+    finally:
+        pool_parseo.cerrar()
+
+    assert scraped_url.content.startswith("<html><body>")
+    assert len(scraped_url.content) < len(INFORME) / 2
+    assert "<script" not in scraped_url.content
+    assert cacheadas == {utiles_scraping.clave_cache(target_url): scraped_url.content}
+    assert archivadas == {URL_INFORME: INFORME}
+    pos_a_minuto = cargar_diccionario_posicion_a_minuto()
+    assert parsear_partido_jugado(
+        URL_INFORME, scraped_url.content, pos_a_minuto
+    ) == parsear_partido_jugado(URL_INFORME, INFORME, pos_a_minuto)